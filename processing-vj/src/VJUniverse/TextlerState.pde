@@ -44,6 +44,7 @@ class TextlerState {
   ArrayList<TextLine> lines = new ArrayList<TextLine>();
   int activeIndex = -1;
   int lastActiveIndex = -1;
+  String bulkSongId = "";
   
   // === FADE TIMING ===
   float lineChangeTime = 0;
@@ -79,6 +80,7 @@ class TextlerState {
     lines.clear();
     activeIndex = -1;
     lastActiveIndex = -1;
+    bulkSongId = "";
   }
   
   /**
@@ -142,6 +144,21 @@ class TextlerState {
       return true;
     }
     
+    // /textler/lyrics/bulk [chunk, chunks, songId, firstIndex, firstRefrain, (time, text, refrain, keywords)...]
+    if (addr.equals("/textler/lyrics/bulk")) {
+      if (msg.typetag().length() < 5) return false;
+      String songId = safeGetString(msg, 2, "");
+      if (!songId.equals(bulkSongId)) {
+        reset();
+        bulkSongId = songId;
+      }
+      int idx = safeGetInt(msg, 3, 0);
+      for (int arg = 5; arg + 4 <= msg.typetag().length(); arg += 4) {
+        setLine(idx++, safeGetFloat(msg, arg, 0), safeGetString(msg, arg + 1, ""));
+      }
+      return true;
+    }
+    
     // /textler/line/active [index]
     if (addr.equals("/textler/line/active")) {
       if (msg.typetag().length() < 1) return false;
@@ -198,6 +215,7 @@ class RefrainState {
   int activeIndex = -1;
   String currentText = "";
   String lastText = "";
+  String bulkSongId = "";
   
   // === FADE TIMING (faster than main lyrics) ===
   float textChangeTime = 0;
@@ -226,6 +244,7 @@ class RefrainState {
     currentText = "";
     lastText = "";
     activeIndex = -1;
+    bulkSongId = "";
   }
   
   void setLine(int index, float timeSec, String text) {
@@ -265,6 +284,23 @@ class RefrainState {
       return true;
     }
     
+    // /textler/lyrics/bulk - refrain lines are those with the refrain flag set
+    if (addr.equals("/textler/lyrics/bulk")) {
+      if (msg.typetag().length() < 5) return false;
+      String songId = safeGetString(msg, 2, "");
+      if (!songId.equals(bulkSongId)) {
+        reset();
+        bulkSongId = songId;
+      }
+      int idx = safeGetInt(msg, 4, 0);
+      for (int arg = 5; arg + 4 <= msg.typetag().length(); arg += 4) {
+        if (safeGetInt(msg, arg + 2, 0) == 1) {
+          setLine(idx++, safeGetFloat(msg, arg, 0), safeGetString(msg, arg + 1, ""));
+        }
+      }
+      return true;
+    }
+    
     // /textler/refrain/active [index, text]
     if (addr.equals("/textler/refrain/active")) {
       if (msg.typetag().length() < 1) return false;
@@ -620,6 +620,14 @@ class TextlerTile extends Tile {
       return true;
     }
     
+    // Bulk lyric chunks carry both the lyrics and the refrain lines
+    if (addr.equals("/textler/lyrics/bulk")) {
+      lyricsState.handleOSC(msg);
+      refrainState.handleOSC(msg);
+      markOSCReceived(addr);
+      return true;
+    }
+    
     // Delegate lyrics messages to lyricsState
     if (lyricsState.handleOSC(msg)) {
       markOSCReceived(addr);
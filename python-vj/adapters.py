@@ -11,13 +11,20 @@ import re
 import time
 import logging
 import subprocess
+import threading
 import requests
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Sequence, Tuple
 
 from domain import sanitize_cache_filename
 from infrastructure import ServiceHealth, Config
 from osc import osc
+from osc.codec import message_size
+from osc.patterns import PatternMatcher
+from osc.scheduler import RESET_SUFFIX
 
 logger = logging.getLogger('textler')
 
@@ -393,6 +400,154 @@ class AppleScriptSpotifyMonitor:
 # OSC SENDER - Consolidated send_textler pattern
 # =============================================================================
 
+LYRICS_BULK_ADDRESS = "/textler/lyrics/bulk"
+LYRICS_BULK_HEADER_ARGS = 5
+LYRICS_BULK_MAX_BYTES = 1024  # per chunk message; leaves room in a bundle datagram
+
+# (time_sec, text, is_refrain, keywords) - one lyric line as sent over OSC
+LyricEntry = Tuple[float, str, bool, str]
+
+
+def pack_lyric_chunks(song_id: str, entries: Sequence[LyricEntry],
+                      max_bytes: int = LYRICS_BULK_MAX_BYTES) -> List[List[Any]]:
+    """
+    Pack a lyric set into /textler/lyrics/bulk argument lists. Pure function.
+
+    Each chunk: [chunk, chunks, song_id, first_index, first_refrain,
+    time, text, refrain, keywords, ...] with four args per line. first_refrain
+    is the refrain-channel index of the chunk's first refrain line, so every
+    chunk can be applied on its own. A line bigger than max_bytes still gets
+    a chunk of its own.
+    """
+    chunks: List[List[Any]] = []
+    header_size = message_size(LYRICS_BULK_ADDRESS, [0, 0, song_id, 0, 0])
+    chunk: List[Any] = []
+    size = 0
+    refrain_index = 0
+    for index, (time_sec, text, is_refrain, keywords) in enumerate(entries):
+        line = [float(time_sec), text, 1 if is_refrain else 0, keywords]
+        # Four type tags add exactly four bytes, so the per-line cost is exact.
+        line_size = message_size("", line) - message_size("")
+        if not chunk or size + line_size > max_bytes:
+            chunk = [len(chunks), 0, song_id, index, refrain_index]
+            chunks.append(chunk)
+            size = header_size
+        chunk.extend(line)
+        size += line_size
+        if is_refrain:
+            refrain_index += 1
+    for chunk in chunks:
+        chunk[1] = len(chunks)
+    return chunks
+
+
+# (address, args) ready for osc.textler.send(address, *args)
+OSCMessage = Tuple[str, Tuple[Any, ...]]
+
+
+@dataclass(frozen=True)
+class CompiledLyrics:
+    """
+    A track's lyrics prepared once when they load. Immutable.
+    
+    Everything the per-line hot path needs is precomputed: sanitized text,
+    start times for bisection, each line's refrain-channel index and the
+    messages to send when the line becomes active.
+    """
+    song_id: str
+    entries: Tuple[LyricEntry, ...]
+    times: Tuple[float, ...]
+    refrain_index: Tuple[int, ...]  # refrain-channel index per line (-1 = none)
+    active_messages: Tuple[Tuple[OSCMessage, ...], ...]
+    bulk_chunks: Tuple[Tuple[Any, ...], ...]
+    sorted_times: bool = True
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def line_at(self, position: float) -> int:
+        """Active line index for position (-1 before the first line)."""
+        if self.sorted_times:
+            return bisect_right(self.times, position) - 1
+        active = -1
+        for i, time_sec in enumerate(self.times):
+            if time_sec > position:
+                break
+            active = i
+        return active
+
+
+def _ascii(text: str) -> str:
+    return text.encode('ascii', 'replace').decode('ascii') if text else ""
+
+
+def compile_lyrics(song_id: str, lines: Sequence[Any], ascii_only: bool = False) -> CompiledLyrics:
+    """
+    Build CompiledLyrics from LyricLine-like objects (time_sec, text,
+    is_refrain, keywords). ascii_only replaces non-ASCII characters with '?'.
+    """
+    clean = _ascii if ascii_only else (lambda text: text or "")
+    entries = tuple(
+        (float(line.time_sec), clean(line.text), bool(getattr(line, 'is_refrain', False)),
+         clean(getattr(line, 'keywords', '') or ""))
+        for line in lines
+    )
+    
+    # A refrain line activates the first refrain-channel line with the same text.
+    first_refrain: Dict[str, int] = {}
+    refrain_count = 0
+    refrain_index = []
+    for _, text, is_refrain, _ in entries:
+        if is_refrain:
+            first_refrain.setdefault(text, refrain_count)
+            refrain_count += 1
+            refrain_index.append(first_refrain[text])
+        else:
+            refrain_index.append(-1)
+    
+    active_messages = []
+    for i, (_, text, _, keywords) in enumerate(entries):
+        messages: List[OSCMessage] = [("/textler/line/active", (i,))]
+        if refrain_index[i] >= 0:
+            messages.append(("/textler/refrain/active", (refrain_index[i], text)))
+        if keywords:
+            messages.append(("/textler/keywords/active", (i, keywords)))
+        active_messages.append(tuple(messages))
+    
+    times = tuple(entry[0] for entry in entries)
+    return CompiledLyrics(
+        song_id=song_id,
+        entries=entries,
+        times=times,
+        refrain_index=tuple(refrain_index),
+        active_messages=tuple(active_messages),
+        bulk_chunks=tuple(tuple(chunk) for chunk in pack_lyric_chunks(song_id, entries)),
+        sorted_times=all(a <= b for a, b in zip(times, times[1:])),
+    )
+
+
+OSC_DEDUP_WINDOW = 5.0  # seconds an identical resend to the same address is suppressed
+# Event-like, collection and command addresses: every message matters, never
+# suppressed (re-sending /shader/load or /image/* is how a user reloads/refits).
+OSC_DEDUP_EXCLUDE = (
+    "/textler/*/reset",
+    "/textler/*/line",
+    "/textler/*/active",
+    LYRICS_BULK_ADDRESS,
+    "/pipeline/step",
+    "/shader/load",
+    "/image/*",
+)
+
+
+def _dedup_key(args: Sequence[Any]) -> tuple:
+    """Payload identity for dedup: each value with its type, so 1, 1.0 and True differ."""
+    return tuple(
+        (type(arg), arg if arg is None or isinstance(arg, (int, float, str, bytes)) else repr(arg))
+        for arg in args
+    )
+
+
 class OSCSender:
     """
     Consolidated OSC sender for textler messages.
@@ -405,23 +560,49 @@ class OSCSender:
     - /textler/refrain/reset: []
     - /textler/refrain/line: [index, time_sec, text]
     - /textler/refrain/active: [index, text]
+    - /textler/lyrics/bulk: [chunk, chunks, song_id, first_index, first_refrain,
+      (time_sec, text, refrain, keywords)...] - whole lyric set in a few chunks
     
     All values are primitives (int, float, string) - no dicts or nested arrays.
+    
+    Duplicate suppression: a message identical to the last one sent to the
+    same address within dedup_window seconds is skipped (force=True sends
+    anyway). A ".../reset" forgets the last payloads under its prefix, since
+    the receiver's state there is blank again. Event-like and command
+    addresses (OSC_DEDUP_EXCLUDE) are never suppressed; dedup_window=0 turns
+    it off.
     """
     
-    def __init__(self):
+    def __init__(self, lyrics_bulk: bool = True, dedup_window: float = OSC_DEDUP_WINDOW):
+        self.lyrics_bulk = lyrics_bulk  # False: one message per line (older receivers)
+        self.dedup_window = dedup_window
+        self._dedup_exclude = PatternMatcher(OSC_DEDUP_EXCLUDE)
+        self._dedup_lock = threading.Lock()
+        self._last_sent: Dict[str, tuple] = {}  # address -> (payload key, monotonic send time)
+        self._sent = 0
+        self._suppressed: Counter = Counter()
         self._current_track_active = False
         self._current_source = "unknown"
         self._current_track_info = {}
         osc.start()  # Ensure OSC hub is running
     
-    def send(self, address: str, *args):
+    def send(self, address: str, *args, force: bool = False):
         """Send a raw OSC message to textler channel and record for monitoring."""
         from osc import osc_monitor
-        osc.textler.send(address, *args)
-        osc_monitor.record_outgoing("txt", address, list(args))
+        if self._emit(address, args, force):
+            osc_monitor.record_outgoing("txt", address, args)
+    
+    def get_dedup_stats(self) -> Dict[str, Any]:
+        """Sent/suppressed counters (suppressed per address, most first)."""
+        with self._dedup_lock:
+            return {
+                "sent": self._sent,
+                "suppressed": sum(self._suppressed.values()),
+                "suppressed_by_address": dict(self._suppressed.most_common()),
+                "window": self.dedup_window,
+            }
     
-    def send_textler(self, channel: str, event: str, data: Any = None):
+    def send_textler(self, channel: str, event: str, data: Any = None, force: bool = False):
         """
         Send textler OSC message for VJUniverse.
         
@@ -438,81 +619,140 @@ class OSCSender:
             self._current_track_info = data
             
             # Send: /textler/track [active, source, artist, title, album, duration, has_lyrics]
-            osc.textler.send("/textler/track",
+            self._emit("/textler/track", (
                 1,  # active
                 self._current_source,
                 data.get("artist", ""),
                 data.get("title", ""),
                 data.get("album", ""),
                 data.get("duration", 0.0),
-                1  # has_lyrics (will be updated by lyrics/reset if false)
-            )
+                1,  # has_lyrics (will be updated by lyrics/reset if false)
+            ), force)
             return
         
         elif channel == "track" and event == "none":
             # Send inactive track
             self._current_track_active = False
-            osc.textler.send("/textler/track", 0, "", "", "", "", 0.0, 0)
+            self._emit("/textler/track", (0, "", "", "", "", 0.0, 0), force)
             return
         
         elif channel == "lyrics" and event == "reset":
             has_lyrics = data.get("has_lyrics", True) if isinstance(data, dict) else True
             # Update track message with has_lyrics flag
             if self._current_track_active and not has_lyrics:
-                osc.textler.send("/textler/track",
+                self._emit("/textler/track", (
                     1,
                     self._current_source,
                     self._current_track_info.get("artist", ""),
                     self._current_track_info.get("title", ""),
                     self._current_track_info.get("album", ""),
                     self._current_track_info.get("duration", 0.0),
-                    0  # has_lyrics = false
-                )
-            osc.textler.send("/textler/lyrics/reset")
+                    0,  # has_lyrics = false
+                ), force)
+            self._emit("/textler/lyrics/reset", (), force)
             return
         
         elif channel == "lyrics" and event == "line":
             # Send: [index, time, text]
-            osc.textler.send("/textler/lyrics/line",
+            self._emit("/textler/lyrics/line", (
                 data.get("index", 0),
                 data.get("time", 0.0),
-                data.get("text", "")
-            )
+                data.get("text", ""),
+            ), force)
             return
         
         elif channel == "lyrics" and event == "active":
             # Send: [index]
             index = data.get("index", -1) if isinstance(data, dict) else data
-            osc.textler.send("/textler/line/active", index)
+            self._emit("/textler/line/active", (index,), force)
             return
         
         elif channel == "refrain" and event == "reset":
-            osc.textler.send("/textler/refrain/reset")
+            self._emit("/textler/refrain/reset", (), force)
             return
         
         elif channel == "refrain" and event == "line":
             # Send: [index, time, text]
-            osc.textler.send("/textler/refrain/line",
+            self._emit("/textler/refrain/line", (
                 data.get("index", 0),
                 data.get("time", 0.0),
-                data.get("text", "")
-            )
+                data.get("text", ""),
+            ), force)
             return
         
         elif channel == "refrain" and event == "active":
             # Send: [index, text]
-            osc.textler.send("/textler/refrain/active",
+            self._emit("/textler/refrain/active", (
                 data.get("index", -1),
-                data.get("text", "")
-            )
+                data.get("text", ""),
+            ), force)
             return
         
         # Generic fallback for new-style messages
         address = f"/textler/{channel}/{event}"
         args = self._prepare_args(data)
-        osc.textler.send(address, *args)
+        self._emit(address, args, force)
     
-    def send_vj(self, subsystem: str, event: str, data: Any = None):
+    def send_lyrics(self, song_id: str, entries: Sequence[LyricEntry], bulk: Optional[bool] = None) -> int:
+        """
+        Send a lyric set after the lyrics/refrain/keywords resets.
+        
+        Bulk mode packs lines, refrain flags and keywords into a few
+        /textler/lyrics/bulk chunks. Otherwise sends /textler/lyrics/line,
+        /textler/refrain/line and /textler/keywords/line per line.
+        Returns the number of messages sent.
+        """
+        if self.lyrics_bulk if bulk is None else bulk:
+            chunks = pack_lyric_chunks(song_id, entries)
+            for args in chunks:
+                self._emit(LYRICS_BULK_ADDRESS, args)
+            return len(chunks)
+        
+        sent = 0
+        for i, (time_sec, text, _, _) in enumerate(entries):
+            self.send_textler("lyrics", "line", {"index": i, "time": time_sec, "text": text})
+            sent += 1
+        refrain_index = 0
+        for time_sec, text, is_refrain, _ in entries:
+            if is_refrain:
+                self.send_textler("refrain", "line", {"index": refrain_index, "time": time_sec, "text": text})
+                refrain_index += 1
+        sent += refrain_index
+        for i, (time_sec, _, _, keywords) in enumerate(entries):
+            if keywords:
+                self.send_textler("keywords", "line", {"index": i, "time": time_sec, "keywords": keywords})
+                sent += 1
+        return sent
+    
+    def send_compiled_lyrics(self, lyrics: CompiledLyrics, bulk: Optional[bool] = None) -> int:
+        """Send a compiled lyric set (prebuilt bulk chunks or per line). Returns messages sent."""
+        if self.lyrics_bulk if bulk is None else bulk:
+            for args in lyrics.bulk_chunks:
+                self._emit(LYRICS_BULK_ADDRESS, args)
+            return len(lyrics.bulk_chunks)
+        return self.send_lyrics(lyrics.song_id, lyrics.entries, bulk=False)
+    
+    def send_active_line(self, lyrics: CompiledLyrics, index: int, at: Optional[float] = None) -> None:
+        """
+        Send the prebuilt line/refrain/keywords active messages for a line.
+        
+        With at (Unix time), they go out as one bundle timetagged for that
+        moment so a timetag-aware receiver switches lines exactly on time.
+        """
+        if not 0 <= index < len(lyrics.active_messages):
+            return
+        from osc import osc_monitor
+        messages = lyrics.active_messages[index]
+        if at is None:
+            for address, args in messages:
+                if self._emit(address, args):
+                    osc_monitor.record_outgoing("txt", address, args)
+        elif osc.textler.send_bundle(messages, at):
+            self._count_sent(len(messages))
+            for address, args in messages:
+                osc_monitor.record_outgoing("txt", address, args)
+    
+    def send_vj(self, subsystem: str, event: str, data: Any = None, force: bool = False):
         """
         Send VJ app status messages.
         
@@ -527,9 +767,9 @@ class OSCSender:
         """
         address = f"/vj/{subsystem}/{event}"
         args = self._prepare_args(data)
-        osc.textler.send(address, *args)
+        self._emit(address, args, force)
     
-    def send_shader(self, shader_name: str, energy: float = 0.5, valence: float = 0.0):
+    def send_shader(self, shader_name: str, energy: float = 0.5, valence: float = 0.0, force: bool = False):
         """
         Send shader load command to Processing.
         
@@ -541,9 +781,9 @@ class OSCSender:
         OSC Message: /shader/load [name, energy, valence]
         """
         logger.info(f"OSC → /shader/load [{shader_name}, {energy:.2f}, {valence:.2f}]")
-        osc.textler.send("/shader/load", shader_name, float(energy), float(valence))
+        self._emit("/shader/load", (shader_name, float(energy), float(valence)), force)
     
-    def send_image_folder(self, folder_path: str, fit_mode: str = "cover"):
+    def send_image_folder(self, folder_path: str, fit_mode: str = "cover", force: bool = False):
         """
         Send image folder path to Processing ImageTile for beat-synced cycling.
         
@@ -556,8 +796,8 @@ class OSCSender:
             /image/folder <path>  - Load folder and cycle on beat
         """
         logger.info(f"OSC → /image/fit [{fit_mode}], /image/folder [{folder_path}]")
-        osc.textler.send("/image/fit", fit_mode)
-        osc.textler.send("/image/folder", str(folder_path))
+        self._emit("/image/fit", (fit_mode,), force)
+        self._emit("/image/folder", (str(folder_path),), force)
     
     def get_recent_messages(self, count: int = 20) -> List[tuple]:
         """Get recent OSC messages for debug display."""
@@ -566,17 +806,42 @@ class OSCSender:
     def send_master_status(self, textler_active: bool = False, 
                           synesthesia_running: bool = False,
                           milksyphon_running: bool = False,
-                          processing_apps: int = 0):
+                          processing_apps: int = 0,
+                          force: bool = False):
         """Send master VJ status (for vj_console.py compatibility)."""
         self.send_vj("master", "status", {
             "textler": textler_active,
             "synesthesia": synesthesia_running,
             "milksyphon": milksyphon_running,
             "processing_apps": processing_apps
-        })
+        }, force=force)
     
     # Private methods - implementation details
     
+    def _emit(self, address: str, args: Sequence[Any], force: bool = False) -> bool:
+        """Send unless identical to the address's last send within the window. Returns True if sent."""
+        if address.endswith(RESET_SUFFIX):
+            prefix = address[:-len(RESET_SUFFIX) + 1]
+            with self._dedup_lock:
+                for key in [key for key in self._last_sent if key.startswith(prefix)]:
+                    del self._last_sent[key]
+        elif self.dedup_window > 0 and not self._dedup_exclude.matches(address):
+            key = _dedup_key(args)
+            now = time.monotonic()
+            with self._dedup_lock:
+                last = self._last_sent.get(address)
+                if not force and last is not None and last[0] == key and now - last[1] < self.dedup_window:
+                    self._suppressed[address] += 1
+                    return False
+                self._last_sent[address] = (key, now)
+        osc.textler.send(address, *args)
+        self._count_sent(1)
+        return True
+    
+    def _count_sent(self, count: int) -> None:
+        with self._dedup_lock:
+            self._sent += count
+    
     def _prepare_args(self, data: Any) -> List:
         """Convert data to OSC argument list."""
         if data is None:
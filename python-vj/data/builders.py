@@ -34,9 +34,7 @@ def get_active_line_index(lines: List, position: float) -> int:
 
 def estimate_position(state: PlaybackState) -> float:
     """Estimate real-time playback position from cached state."""
-    if not state.is_playing:
-        return state.position
-    return state.position + max(0.0, time.time() - state.last_update)
+    return state.position_at(time.time())
 
 
 def build_track_data(snapshot: PlaybackSnapshot, source_available: bool) -> Dict[str, Any]:
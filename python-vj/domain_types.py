@@ -75,12 +75,19 @@ class PlaybackState:
     track: Optional[Track] = None
     position: float = 0.0
     is_playing: bool = False
-    last_update: float = 0.0
+    last_update: float = 0.0  # Wall time at which position was true
+    rate: float = 1.0         # Track seconds per wall second while playing
     
     def update(self, **kwargs) -> 'PlaybackState':
         """Create new instance with updated fields."""
         return replace(self, **kwargs)
     
+    def position_at(self, now: float) -> float:
+        """Extrapolated position at wall time now."""
+        if not self.is_playing:
+            return self.position
+        return self.position + self.rate * max(0.0, now - self.last_update)
+    
     @property
     def has_track(self) -> bool:
         return self.track is not None
@@ -7,6 +7,7 @@ and pipeline tracking for UI display.
 """
 
 import os
+import heapq
 import json
 import time
 import logging
@@ -274,6 +275,47 @@ class Settings:
         clamped = max(1000, min(10000, int(value)))
         self._data['playback_poll_interval_ms'] = clamped
         self._save()
+    
+    @property
+    def lyrics_bulk(self) -> bool:
+        """
+        Send lyrics as chunked /textler/lyrics/bulk messages.
+        Default: True (False = one message per line for older receivers)
+        """
+        return self._get_bool('lyrics_bulk', True)
+    
+    @lyrics_bulk.setter
+    def lyrics_bulk(self, value: bool) -> None:
+        self._set_bool('lyrics_bulk', value)
+    
+    @property
+    def lyrics_lead_ms(self) -> int:
+        """
+        Send each active line this early, timetagged for its start time.
+        Range: 0-2000ms. Default: 0 (send on time; receivers that ignore
+        OSC timetags would otherwise show lines early)
+        """
+        value = self._data.get('lyrics_lead_ms', 0)
+        return max(0, min(2000, int(value)))
+    
+    @lyrics_lead_ms.setter
+    def lyrics_lead_ms(self, value: int) -> None:
+        """Set lookahead lead time. Clamped to 0-2000ms."""
+        self._data['lyrics_lead_ms'] = max(0, min(2000, int(value)))
+        self._save()
+    
+    @property
+    def osc_shared_memory(self) -> bool:
+        """
+        Publish hub traffic to shared memory so other local processes
+        (Launchpad CLI) can read it while the console owns port 9999.
+        Default: False
+        """
+        return self._get_bool('osc_shared_memory', False)
+    
+    @osc_shared_memory.setter
+    def osc_shared_memory(self, value: bool) -> None:
+        self._set_bool('osc_shared_memory', value)
 
 
 # =============================================================================
@@ -590,3 +632,49 @@ class BackoffState:
             'retry_in': round(self.time_remaining(now), 1),
             'last_error': self.last_error,
         }
+
+
+# =============================================================================
+# TIMER HEAP - Named deadlines for event-driven loops
+# =============================================================================
+
+class TimerHeap:
+    """
+    Min-heap of named deadlines for one loop thread (not thread-safe).
+
+    Setting a name again replaces its deadline; replaced and cancelled
+    entries are dropped lazily when they reach the top of the heap.
+    """
+
+    def __init__(self):
+        self._heap: List[tuple] = []
+        self._deadlines: Dict[str, float] = {}
+
+    def set(self, name: str, deadline: float) -> None:
+        """Schedule (or reschedule) name at deadline."""
+        self._deadlines[name] = deadline
+        heapq.heappush(self._heap, (deadline, name))
+
+    def cancel(self, name: str) -> None:
+        self._deadlines.pop(name, None)
+
+    def deadline(self, name: str) -> Optional[float]:
+        return self._deadlines.get(name)
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest live deadline, or None when nothing is scheduled."""
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now: float) -> List[str]:
+        """Remove and return the names whose deadline is at or before now."""
+        due = []
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > now:
+                return due
+            _, name = heapq.heappop(self._heap)
+            del self._deadlines[name]
+            due.append(name)
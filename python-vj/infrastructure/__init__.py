@@ -9,6 +9,7 @@ Public API:
         PipelineTracker - Thread-safe pipeline step tracking for UI
         PipelineStep - Single pipeline step with status
         BackoffState - Exponential backoff state management
+        TimerHeap - Named deadlines for event-driven loops
         ProcessManager - Manage external processes (Processing apps)
         ProcessingApp - Definition of a Processing application
 
@@ -33,6 +34,7 @@ from infra import (
     PipelineTracker,
     PipelineStep,
     BackoffState,
+    TimerHeap,
 )
 from process_manager import ProcessManager, ProcessingApp
 
@@ -43,6 +45,7 @@ __all__ = [
     "PipelineTracker",
     "PipelineStep",
     "BackoffState",
+    "TimerHeap",
     "ProcessManager",
     "ProcessingApp",
 ]
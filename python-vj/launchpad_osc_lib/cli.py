@@ -31,10 +31,12 @@ from .config import save_config, load_config
 # Import central OSC hub from parent package
 try:
     from osc import osc
+    from osc.shm import OSCShmReader, open_inbound
 except ImportError:
     # Fallback for standalone execution (python -m launchpad_osc_lib)
     sys.path.insert(0, str(Path(__file__).parent.parent))
     from osc import osc
+    from osc.shm import OSCShmReader, open_inbound
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +54,7 @@ class LaunchpadApp:
     def __init__(self):
         self.launchpad = LaunchpadDevice()
         self._osc_running = False
+        self._inbound = None
         
         self.state = ControllerState()
         self._running = False
@@ -70,10 +73,13 @@ class LaunchpadApp:
             logger.error("Failed to connect Launchpad")
             return
         
-        # Start OSC via central hub
-        osc.start()
-        osc.subscribe("/", self._on_osc_raw)
-        self._osc_running = True
+        # Start OSC via central hub (or its shared-memory stream if already running)
+        self._inbound = open_inbound(osc)
+        if self._inbound is None:
+            logger.warning("No inbound OSC; pads and outgoing OSC still work")
+        else:
+            self._inbound.subscribe("/", self._on_osc_raw)
+            self._osc_running = True
         
         # Set up Launchpad callbacks
         self.launchpad.set_callbacks(
@@ -95,7 +101,10 @@ class LaunchpadApp:
         """Stop the application."""
         self._running = False
         if self._osc_running:
-            osc.unsubscribe("/", self._on_osc_raw)
+            self._inbound.unsubscribe("/", self._on_osc_raw)
+            if isinstance(self._inbound, OSCShmReader):
+                self._inbound.stop()
+            self._inbound = None
             self._osc_running = False
         self.launchpad.stop()
         logger.info("Stopped")
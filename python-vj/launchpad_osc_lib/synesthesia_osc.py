@@ -13,12 +13,14 @@ from typing import Callable, List
 # Works both when imported via vj_console.py and when run standalone
 try:
     from osc import osc
+    from osc.shm import OSCShmReader, open_inbound
 except ImportError:
     # Fallback for standalone execution (python -m launchpad_osc_lib)
     import sys
     from pathlib import Path
     sys.path.insert(0, str(Path(__file__).parent.parent))
     from osc import osc
+    from osc.shm import OSCShmReader, open_inbound
 
 from .model import OscCommand, OscEvent
 from .synesthesia_config import (
@@ -47,18 +49,26 @@ class SynesthesiaOscManager:
         self._all_listeners: List[Callable[[OscEvent], None]] = []
         self._beat_pulse: bool = False
         self._running = False
+        self._inbound = None
     
     def start(self) -> bool:
         if self._running:
             return True
-        osc.start()
-        osc.subscribe("/", self._on_osc_raw)
+        # Falls back to the shared-memory stream if another process owns the
+        # hub; with neither, only the outbound side runs
+        self._inbound = open_inbound(osc)
+        if self._inbound is not None:
+            self._inbound.subscribe("/", self._on_osc_raw)
         self._running = True
         return True
     
     def stop(self):
         if self._running:
-            osc.unsubscribe("/", self._on_osc_raw)
+            if self._inbound is not None:
+                self._inbound.unsubscribe("/", self._on_osc_raw)
+                if isinstance(self._inbound, OSCShmReader):
+                    self._inbound.stop()
+                self._inbound = None
             self._running = False
     
     def is_connected(self) -> bool:
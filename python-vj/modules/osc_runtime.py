@@ -37,6 +37,9 @@ class OSCConfig:
     vdj_port: int = 9009
     synesthesia_port: int = 7777
     textler_port: int = 10000
+    # Publish received messages for other local processes (Launchpad CLI,
+    # second consoles). Opt-in via the osc_shared_memory setting.
+    shared_memory: bool = False
 
 
 Handler = Callable[[str, List[Any]], None]
@@ -82,6 +85,8 @@ class OSCRuntime(Module):
             if not self._hub.start():
                 self._hub = None
                 return False
+        if self._config.shared_memory:
+            self._hub.set_shared_memory(True)
 
         # Apply any pending subscriptions
         for pattern, handler in self._pending_subscriptions:
@@ -158,9 +163,13 @@ def main():
         "--verbose", "-v", action="store_true",
         help="Print all received messages"
     )
+    parser.add_argument(
+        "--shared-memory", action="store_true",
+        help="Publish received messages for other local processes"
+    )
     args = parser.parse_args()
 
-    config = OSCConfig(receive_port=args.receive_port)
+    config = OSCConfig(receive_port=args.receive_port, shared_memory=args.shared_memory)
     runtime = OSCRuntime(config)
 
     message_count = [0]
@@ -767,22 +767,18 @@ class PipelineModule(Module):
         if not osc:
             return
 
+        from adapters import compile_lyrics
+
         try:
-            # Reset and send all lyrics lines
+            # Reset all channels, then send lines (bulk chunks or per line)
             osc.send_textler("lyrics", "reset")
-            for i, line in enumerate(result.lyrics_lines):
-                # Ensure text is ASCII-safe for OSC (replace non-ASCII with ?)
-                text = line.text.encode('ascii', 'replace').decode('ascii') if line.text else ""
-                keywords = getattr(line, 'keywords', '') or ""
-                keywords = keywords.encode('ascii', 'replace').decode('ascii')
-                osc.send_textler("lyrics", "line", {
-                    "index": i,
-                    "time": line.time_sec,
-                    "text": text,
-                })
-
-            # Reset and send refrain lines (as summary, not individual)
             osc.send_textler("refrain", "reset")
+            osc.send_textler("keywords", "reset")
+            # ASCII-safe text for OSC (non-ASCII replaced with ?), sanitized once
+            song_id = sanitize_cache_filename(result.artist, result.title)
+            osc.send_compiled_lyrics(compile_lyrics(song_id, result.lyrics_lines, ascii_only=True))
+
+            # Refrain lines as summary
             if result.refrain_lines:
                 # Send count and first few lines as joined text
                 refrain_text = " | ".join(
@@ -794,8 +790,7 @@ class PipelineModule(Module):
                     "text": refrain_text[:200],  # Limit length
                 })
 
-            # Reset and send keywords as single message
-            osc.send_textler("keywords", "reset")
+            # Keywords as single message
             if result.lyrics_keywords:
                 keywords_text = ",".join(result.lyrics_keywords[:30])
                 osc.send_textler("keywords", "summary", {
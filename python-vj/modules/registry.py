@@ -37,6 +37,7 @@ class ModuleRegistryConfig:
     # OSC
     osc_receive_port: int = 9999
     osc_vdj_port: int = 9009
+    osc_shared_memory: bool = False
 
     # Playback
     playback_source: str = "vdj_osc"
@@ -88,6 +89,7 @@ class ModuleRegistry:
             config = OSCConfig(
                 receive_port=self._config.osc_receive_port,
                 vdj_port=self._config.osc_vdj_port,
+                shared_memory=self._config.osc_shared_memory,
             )
             self._osc = OSCRuntime(config)
             self._modules["osc"] = self._osc
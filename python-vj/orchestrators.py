@@ -10,6 +10,7 @@ Splits the monolithic TextlerEngine into specialized coordinators:
 
 import time
 import logging
+from collections import deque
 from dataclasses import dataclass
 from queue import Queue, Full, Empty
 from threading import Thread, Event
@@ -24,6 +25,177 @@ from ai_services import LLMAnalyzer, SongCategorizer
 logger = logging.getLogger('textler')
 
 
+# =============================================================================
+# PLAYBACK CLOCK - Drift-corrected position between sparse polls
+# =============================================================================
+
+CLOCK_WINDOW = 8              # Samples kept for the rate/offset fit
+CLOCK_MIN_SPAN = 2.0          # Seconds of samples before the rate is fitted
+CLOCK_RATE_RANGE = (0.5, 2.0) # Plausible playback rates (DJ pitch included)
+CLOCK_SEEK_THRESHOLD = 0.75   # Residual (s) treated as a seek, not jitter
+CLOCK_STALL_SECONDS = 0.75    # Sample gap needed before a frozen position counts as paused
+CLOCK_STALL_EPSILON = 0.05    # Max position change (s) of a frozen position
+CLOCK_AGE_ALPHA = 0.2         # EMA weight for the pushed-sample age
+
+
+class PlaybackClock:
+    """
+    Fuses sparse position samples into one playback clock.
+
+    Each sample is (track position, wall time the position was true). A
+    least-squares fit over the recent window estimates offset and rate, so
+    extrapolation between polls follows the real playback speed and poll
+    jitter averages out instead of moving the position on every poll.
+    Samples that disagree with the fit by more than CLOCK_SEEK_THRESHOLD
+    restart the window (seek); a position frozen across samples, or an
+    explicit not-playing flag, pauses the clock.
+
+    For pushed samples (sampled_at known) the clock also tracks their age on
+    arrival, received_at - sampled_at, for display. A polled source's own
+    delay cannot be seen from its positions, so it is not estimated.
+
+    Not thread-safe: fed by the polling thread, read via immutable
+    PlaybackState snapshots (position, last_update, rate).
+    """
+
+    def __init__(self):
+        self._samples: deque = deque(maxlen=CLOCK_WINDOW)
+        self._position = 0.0    # Fitted position at _anchor
+        self._anchor = 0.0      # Wall time of the newest sample
+        self._rate = 1.0
+        self._playing = False
+        self._sample_age: Optional[float] = None
+        self._seeks = 0
+
+    def reset(self, sample_age: bool = False) -> None:
+        """
+        Forget the current track's samples (track change, source lost).
+
+        sample_age=True also forgets the pushed-sample age (source switch).
+        """
+        if sample_age:
+            self._sample_age = None
+        self._samples.clear()
+        self._position = 0.0
+        self._anchor = 0.0
+        self._rate = 1.0
+        self._playing = False
+
+    def observe(self, position: float, sampled_at: float,
+                received_at: Optional[float] = None, playing: bool = True) -> str:
+        """
+        Add a position sample. Returns the event it caused:
+        "start", "seek", "pause", "resume" or "" for a regular sample.
+        """
+        if received_at is not None:
+            age = max(0.0, received_at - sampled_at)
+            if self._sample_age is None:
+                self._sample_age = age
+            else:
+                self._sample_age += CLOCK_AGE_ALPHA * (age - self._sample_age)
+        samples = self._samples
+        if not samples:
+            self._restart(position, sampled_at, playing)
+            return "start"
+        if not playing and self._playing:
+            # Explicit pause, even when the position report itself is not new
+            self._restart(position, max(sampled_at, samples[-1][0]), False)
+            return "pause"
+        if sampled_at <= samples[-1][0]:
+            return ""  # Same (or older) measurement reported again
+
+        last_time, last_position = samples[-1]
+        moved = abs(position - last_position) >= CLOCK_STALL_EPSILON
+        if not self._playing:
+            self._restart(position, sampled_at, playing and moved)
+            return "resume" if self._playing else ""
+        if not moved and sampled_at - last_time >= CLOCK_STALL_SECONDS:
+            self._restart(position, sampled_at, False)
+            return "pause"
+        if not moved:
+            return ""  # Too soon to call it a pause; keep it out of the fit
+        if abs(position - self.position_at(sampled_at)) > CLOCK_SEEK_THRESHOLD:
+            self._seeks += 1
+            self._restart(position, sampled_at, True)
+            return "seek"
+
+        samples.append((sampled_at, position))
+        self._fit()
+        return ""
+
+    def position_at(self, now: float) -> float:
+        """Estimated track position at wall time now."""
+        if not self._playing:
+            return self._position
+        return self._position + self._rate * max(0.0, now - self._anchor)
+
+    def now_position(self) -> float:
+        return self.position_at(time.time())
+
+    @property
+    def position(self) -> float:
+        """Fitted position at anchor_time."""
+        return self._position
+
+    @property
+    def anchor_time(self) -> float:
+        return self._anchor
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def is_playing(self) -> bool:
+        return self._playing
+
+    @property
+    def sample_age(self) -> Optional[float]:
+        """Smoothed age of pushed samples on arrival (None until one arrives)."""
+        return self._sample_age
+
+    @property
+    def locked(self) -> bool:
+        """True once the rate has been fitted from enough playing samples."""
+        samples = self._samples
+        return self._playing and len(samples) >= 3 and samples[-1][0] - samples[0][0] >= CLOCK_MIN_SPAN
+
+    def describe(self) -> Dict[str, Any]:
+        """Summarize clock model for UI display."""
+        return {
+            'rate': round(self._rate, 4),
+            'sample_age_ms': round((self._sample_age or 0.0) * 1000.0, 1),
+            'samples': len(self._samples),
+            'locked': self.locked,
+            'seeks': self._seeks,
+        }
+
+    def _restart(self, position: float, sampled_at: float, playing: bool) -> None:
+        # Keep the fitted rate: seeks and pauses do not change the pitch.
+        self._samples.clear()
+        self._samples.append((sampled_at, position))
+        self._position = position
+        self._anchor = sampled_at
+        self._playing = playing
+
+    def _fit(self) -> None:
+        samples = self._samples
+        count = len(samples)
+        t_last = samples[-1][0]
+        mean_t = sum(t for t, _ in samples) / count - t_last
+        mean_p = sum(p for _, p in samples) / count
+        rate = self._rate
+        if t_last - samples[0][0] >= CLOCK_MIN_SPAN:
+            var = sum((t - t_last - mean_t) ** 2 for t, _ in samples)
+            if var > 0:
+                cov = sum((t - t_last - mean_t) * (p - mean_p) for t, p in samples)
+                low, high = CLOCK_RATE_RANGE
+                rate = min(high, max(low, cov / var))
+        self._rate = rate
+        self._position = mean_p - rate * mean_t
+        self._anchor = t_last
+
+
 # =============================================================================
 # PLAYBACK COORDINATOR - Single source monitor with timing
 # =============================================================================
@@ -50,6 +222,7 @@ class PlaybackCoordinator:
     Interface:
         poll() -> PlaybackSample
         get_current_state() -> PlaybackState
+        now_position() -> float  # clock-corrected live position
         set_monitor(monitor) - hot-swap the active monitor
     
     Dependency Injection: Accepts single monitor instance.
@@ -62,10 +235,12 @@ class PlaybackCoordinator:
         self._last_lookup_ms = 0.0
         self._was_connected = False  # Track connection state for logging
         self._last_track_key = ""    # Track for change detection
+        self._clock = PlaybackClock()
     
     def set_monitor(self, monitor):
         """Hot-swap the active monitor for live source switching."""
         self._monitor = monitor
+        self._clock.reset(sample_age=True)
         self._current_source = self._monitor_key(monitor) if monitor else "none"
         self._was_connected = False  # Reset connection state for new monitor
         logger.info(f"Playback source: switching to {self._current_source}")
@@ -108,6 +283,13 @@ class PlaybackCoordinator:
                 duration=playback.get('duration_ms', 0) / 1000.0
             )
             position = playback.get('progress_ms', 0) / 1000.0
+            # When the position was true: pushed sources report it, polled
+            # ones are taken at the middle of the lookup.
+            received_at = start + self._last_lookup_ms / 1000.0
+            sampled_at = playback.get('position_time')
+            if not sampled_at:
+                sampled_at = start + self._last_lookup_ms / 2000.0
+                received_at = None
             
             # Log connection success on first successful poll
             if not self._was_connected:
@@ -118,15 +300,24 @@ class PlaybackCoordinator:
             track_key = track.key
             if track_key != self._last_track_key:
                 self._last_track_key = track_key
+                self._clock.reset()
                 if self._was_connected:  # Don't double-log initial connection
                     logger.info(f"♪ Now playing: {track.artist} - {track.title}")
             
+            event = self._clock.observe(
+                position, sampled_at, received_at, playing=playback.get('is_playing', True)
+            )
+            if event in ("seek", "pause", "resume"):
+                logger.debug(f"Playback clock: {event} at {position:.2f}s")
+            
             # Update state immutably
+            clock = self._clock
             self._state = self._state.update(
                 track=track,
-                position=position,
-                is_playing=True,
-                last_update=time.time()
+                position=clock.position,
+                is_playing=clock.is_playing,
+                last_update=clock.anchor_time,
+                rate=clock.rate,
             )
         else:
             # No playback detected - log disconnection
@@ -134,6 +325,7 @@ class PlaybackCoordinator:
                 self._was_connected = False
                 logger.info(f"○ {self._current_source}: no playback detected")
             
+            self._clock.reset()
             if self._state.has_track:
                 self._state = self._state.update(is_playing=False)
         
@@ -152,6 +344,14 @@ class PlaybackCoordinator:
         """Return last known playback state without polling."""
         return self._state
     
+    def now_position(self) -> float:
+        """Live track position from the playback clock."""
+        return self._state.position_at(time.time())
+    
+    @property
+    def clock(self) -> PlaybackClock:
+        return self._clock
+    
     @property
     def current_track(self) -> Optional[Track]:
         return self._state.track
@@ -8,6 +8,7 @@ Public API:
 
     Classes:
         OSCHub - Single receive hub (port 9999) with forwarding
+        AsyncOSCHub - asyncio-native hub with the same subscribe/send API
         Channel - Send-only OSC channel
         ChannelConfig - Config for a channel (send port, host, shared recv port)
         OSCMonitor - Aggregates OSC messages by address
@@ -41,6 +42,7 @@ from .hub import (
     TEXTLER,
     Handler,
 )
+from .aio import AsyncOSCHub
 from .monitor import (
     OSCMonitor,
     AggregatedMessage,
@@ -57,6 +59,7 @@ __all__ = [
     "SYNESTHESIA",
     "TEXTLER",
     "Handler",
+    "AsyncOSCHub",
     # Monitor
     "OSCMonitor",
     "AggregatedMessage",
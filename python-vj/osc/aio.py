@@ -0,0 +1,243 @@
+"""
+Async OSC Hub - asyncio-native alternative to OSCHub
+
+Same routing model as OSCHub (receive on 9999, forward to 10000/11111, send-only
+channels for vdj/synesthesia/textler) but built on an asyncio DatagramProtocol:
+no liblo server thread, no worker thread, no polling. Datagrams are forwarded
+unchanged and decoded only for subscribed addresses.
+
+Handlers are called with the usual (address, args) signature; when a call
+returns an awaitable (async def, functools.partial of one, async __call__)
+it is scheduled as a task on the hub loop.
+
+Usage:
+    hub = AsyncOSCHub()
+    await hub.start()
+    hub.subscribe("/audio/beat/onbeat", on_beat)       # sync handler
+    hub.subscribe("/vdj/*", on_vdj)                     # async def handler
+    hub.synesthesia.send("/scenes/next")
+    ...
+    hub.stop()
+"""
+
+import asyncio
+import inspect
+import logging
+import struct
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, List, Optional, Sequence, Set, Tuple
+
+from . import codec
+from .hub import FORWARD_TARGETS, RECEIVE_PORT, SYNESTHESIA, TEXTLER, VDJ, ChannelConfig
+from .patterns import Handler, ListenerRegistry, PatternEntry
+
+logger = logging.getLogger(__name__)
+
+MAX_PENDING_TASKS = 1024
+
+
+@dataclass
+class _AsyncHubStats:
+    received: int = 0
+    forwarded: int = 0
+    dispatched: int = 0
+    decode_errors: int = 0
+    handler_errors: int = 0
+    tasks_dropped: int = 0
+
+
+class AsyncChannel:
+    """Send-only OSC channel sharing the hub's datagram transport."""
+
+    def __init__(self, config: ChannelConfig, hub: "AsyncOSCHub"):
+        self._config = config
+        self._hub = hub
+
+    @property
+    def name(self) -> str:
+        return self._config.name
+
+    @property
+    def send_port(self) -> int:
+        return self._config.send_port
+
+    @property
+    def recv_port(self) -> Optional[int]:
+        return self._config.recv_port
+
+    def send(self, address: str, *args, priority: Optional[int] = None) -> bool:
+        """
+        Send OSC message (non-blocking). Returns True on success.
+
+        priority is accepted for Channel.send() compatibility; async channels
+        are not scheduled, so it is ignored.
+        """
+        transport = self._hub._transport
+        if transport is None:
+            return False
+        try:
+            transport.sendto(codec.encode_message(address, args), (self._config.host, self._config.send_port))
+            return True
+        except Exception as exc:
+            logger.error(f"[{self.name}] Send error: {exc}")
+            return False
+
+
+class _HubProtocol(asyncio.DatagramProtocol):
+    def __init__(self, hub: "AsyncOSCHub"):
+        self._hub = hub
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self._hub._on_datagram(data)
+
+    def error_received(self, exc: Exception) -> None:
+        logger.debug(f"AsyncOSCHub socket error: {exc}")
+
+
+class AsyncOSCHub:
+    """
+    asyncio OSC hub with the OSCHub subscribe/unsubscribe/send API.
+
+    All work happens on the event loop passed to (or running at) start().
+    """
+
+    def __init__(
+        self,
+        receive_port: int = RECEIVE_PORT,
+        forward_targets: Optional[List[Tuple[str, int]]] = None,
+    ):
+        self._receive_port = receive_port
+        self._forward_targets = list(FORWARD_TARGETS if forward_targets is None else forward_targets)
+        self._vdj = AsyncChannel(VDJ, self)
+        self._synesthesia = AsyncChannel(SYNESTHESIA, self)
+        self._textler = AsyncChannel(TEXTLER, self)
+        self._listeners = ListenerRegistry()
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._stats = _AsyncHubStats()
+
+    @property
+    def is_started(self) -> bool:
+        return self._transport is not None
+
+    @property
+    def receive_port(self) -> int:
+        return self._receive_port
+
+    @property
+    def vdj(self) -> AsyncChannel:
+        return self._vdj
+
+    @property
+    def synesthesia(self) -> AsyncChannel:
+        return self._synesthesia
+
+    @property
+    def textler(self) -> AsyncChannel:
+        return self._textler
+
+    @property
+    def processing(self) -> AsyncChannel:
+        """Alias for textler (VJUniverse port 10000)."""
+        return self._textler
+
+    async def start(self) -> bool:
+        """Bind the receive port on the running loop. Returns True on success."""
+        if self._transport is not None:
+            return True
+        self._loop = asyncio.get_running_loop()
+        try:
+            transport, _ = await self._loop.create_datagram_endpoint(
+                lambda: _HubProtocol(self),
+                local_addr=("0.0.0.0", self._receive_port),
+            )
+        except OSError as exc:
+            logger.error(f"AsyncOSCHub start failed: {exc}")
+            return False
+        self._transport = transport
+        logger.info(f"AsyncOSCHub ready on :{self._receive_port}")
+        return True
+
+    def stop(self) -> None:
+        """Close the transport and cancel in-flight handler tasks."""
+        if self._transport is None:
+            return
+        self._transport.close()
+        self._transport = None
+        for task in list(self._tasks):
+            task.cancel()
+        self._tasks.clear()
+        logger.info("AsyncOSCHub stopped")
+
+    def subscribe(self, path: str, handler: Handler) -> None:
+        """Subscribe a sync or async handler to incoming OSC messages."""
+        self._listeners.add(path, handler)
+
+    def unsubscribe(self, path: str, handler: Handler) -> None:
+        """Unsubscribe a handler from incoming OSC messages."""
+        self._listeners.remove(path, handler)
+
+    def get_hub_stats(self) -> Dict[str, Any]:
+        stats = self._stats
+        return {
+            "received": stats.received,
+            "forwarded": stats.forwarded,
+            "dispatched": stats.dispatched,
+            "decode_errors": stats.decode_errors,
+            "handler_errors": stats.handler_errors,
+            "tasks_pending": len(self._tasks),
+            "tasks_dropped": stats.tasks_dropped,
+        }
+
+    def _on_datagram(self, data: bytes) -> None:
+        self._stats.received += 1
+        transport = self._transport
+        if transport is None:
+            return
+        for target in self._forward_targets:
+            transport.sendto(data, target)
+            self._stats.forwarded += 1
+        if not self._listeners.count:
+            return
+        try:
+            for path, start, end in codec.iter_messages(data):
+                matches = self._listeners.match(path)
+                if matches:
+                    self._call_handlers(matches, path, codec.decode_args(data, start, end))
+        except (codec.OSCDecodeError, struct.error) as exc:
+            self._stats.decode_errors += 1
+            logger.debug(f"Dropping malformed OSC datagram: {exc}")
+
+    def _call_handlers(self, matches: Sequence[PatternEntry], path: str, args: List[Any]) -> None:
+        self._stats.dispatched += 1
+        for entry in matches:
+            for handler in entry.handlers:
+                try:
+                    result = handler(path, args)
+                except Exception as exc:
+                    self._stats.handler_errors += 1
+                    logger.error(f"OSC handler error for {entry.pattern}: {exc}")
+                    continue
+                if inspect.isawaitable(result):
+                    self._schedule(result, entry.pattern)
+
+    def _schedule(self, awaitable: Awaitable[Any], pattern: Optional[str]) -> None:
+        if len(self._tasks) >= MAX_PENDING_TASKS:
+            self._stats.tasks_dropped += 1
+            close = getattr(awaitable, "close", None)
+            if close is not None:
+                close()  # never awaited: close it instead of leaking a warning
+            return
+        task = self._loop.create_task(self._run_async_handler(awaitable, pattern))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_async_handler(self, awaitable: Awaitable[Any], pattern: Optional[str]) -> None:
+        try:
+            await awaitable
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._stats.handler_errors += 1
+            logger.error(f"OSC handler error for {pattern}: {exc}")
@@ -0,0 +1,163 @@
+"""
+OSC Arrays - Typed NumPy delivery of float payloads (FFT bands, levels)
+
+Array subscriptions receive homogeneous float payloads as read-only float32
+NumPy arrays instead of Python lists:
+
+- raw hub mode: a zero-copy big-endian view into the received datagram
+- liblo mode: one array built from the decoded args, shared by all
+  array subscribers of the message
+
+Payloads with any non-float argument are skipped for array subscribers.
+
+With history=N, a subscription also keeps a FrameRing of the last N frames
+per address in a preallocated (N, width) buffer, so meters and analysis
+code can work on whole batches without per-frame allocation.
+
+Usage:
+    fft = osc.subscribe_array("/audio/fft*", history=64)
+    ...
+    frames = fft.frames("/audio/fft")   # (n, bands), oldest first
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from .codec import decode_type_tags
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+ARRAY_HISTORY_MAX = 4096
+
+ArrayHandler = Callable[[str, Any], None]
+
+
+def array_from_packet(data: bytes, start: int = 0, end: Optional[int] = None) -> Optional[Any]:
+    """Read-only view of an all-float message in data[start:end] (None otherwise)."""
+    tags, offset = decode_type_tags(data, start, end)
+    if not tags or tags.count("f") != len(tags):
+        return None
+    return np.frombuffer(data, dtype=">f4", count=len(tags), offset=offset)
+
+
+def array_from_args(args: List[Any]) -> Optional[Any]:
+    """Read-only float32 array of decoded args (None unless all are floats)."""
+    if not args:
+        return None
+    for arg in args:
+        if type(arg) is not float:
+            return None
+    array = np.array(args, dtype=np.float32)
+    array.flags.writeable = False
+    return array
+
+
+class FrameRing:
+    """Last `capacity` frames of one address in a preallocated 2-D buffer."""
+
+    __slots__ = ("_capacity", "_data", "_count")
+
+    def __init__(self, capacity: int):
+        self._capacity = max(1, min(int(capacity), ARRAY_HISTORY_MAX))
+        self._data: Optional[Any] = None
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self._capacity)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def width(self) -> int:
+        return 0 if self._data is None else self._data.shape[1]
+
+    @property
+    def count(self) -> int:
+        """Frames pushed in total."""
+        return self._count
+
+    def push(self, frame: Any) -> None:
+        data = self._data
+        if data is None or data.shape[1] != frame.shape[0]:
+            # First frame or band count changed: start over at the new width.
+            data = self._data = np.zeros((self._capacity, frame.shape[0]), dtype=np.float32)
+            self._count = 0
+        data[self._count % self._capacity] = frame
+        self._count += 1
+
+    def last(self) -> Optional[Any]:
+        """Read-only view of the newest frame."""
+        if not self._count:
+            return None
+        row = self._data[(self._count - 1) % self._capacity]
+        row.flags.writeable = False
+        return row
+
+    def frames(self, n: Optional[int] = None) -> Any:
+        """Copy of the newest n frames (default all), oldest first."""
+        size = len(self)
+        n = size if n is None else max(0, min(int(n), size))
+        if not n:
+            return np.zeros((0, self.width), dtype=np.float32)
+        end = self._count % self._capacity
+        start = end - n
+        if start >= 0:
+            return self._data[start:end].copy()
+        return np.concatenate((self._data[start:], self._data[:end]))
+
+    def clear(self) -> None:
+        self._count = 0
+
+
+class ArraySubscription:
+    """
+    Callable wrapper registered with the hub for an array subscription.
+
+    Called on the hub worker with (path, array); rings are written there too,
+    so readers on other threads may see the newest row mid-update.
+    """
+
+    def __init__(self, handler: Optional[ArrayHandler] = None, history: int = 0):
+        self._handler = handler
+        self._history = max(0, int(history))
+        self._rings: Dict[str, FrameRing] = {}
+        self.frames_received = 0
+        name = getattr(handler, "__qualname__", None) or "frames"
+        self.handler_name = f"{name}[array]"  # read by handler_label()
+
+    @property
+    def handler(self) -> Optional[ArrayHandler]:
+        return self._handler
+
+    @property
+    def history(self) -> int:
+        return self._history
+
+    def __call__(self, path: str, array: Any) -> None:
+        self.frames_received += 1
+        if self._history:
+            ring = self._rings.get(path)
+            if ring is None:
+                ring = self._rings[path] = FrameRing(self._history)
+            ring.push(array)
+        if self._handler is not None:
+            self._handler(path, array)
+
+    def addresses(self) -> List[str]:
+        return list(self._rings)
+
+    def ring(self, path: str) -> Optional[FrameRing]:
+        return self._rings.get(path)
+
+    def frames(self, path: str, n: Optional[int] = None) -> Any:
+        """Newest n frames for path, oldest first (empty if none yet)."""
+        ring = self._rings.get(path)
+        if ring is None:
+            return np.zeros((0, 0), dtype=np.float32)
+        return ring.frames(n)
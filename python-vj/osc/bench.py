@@ -0,0 +1,379 @@
+"""
+OSC Bench - Synthetic load generator and hub benchmark suite
+
+Replays realistic traffic mixes into an OSCHub on localhost and reports
+throughput, drop rate, queue peak and latency percentiles as JSON:
+
+- audio:  Synesthesia-style audio analysis, 60 Hz across 40 addresses
+- vdj:    VirtualDJ deck polling replies (2 decks, 4 Hz)
+- lyrics: textler lyric bursts (a full song's lines every 2 s)
+
+Each scenario runs against a fresh hub (free port, local forward sink) with
+0, 1 or many subscribers and the OSCMonitor attached or not, so regressions in
+dispatch, forwarding or monitor recording show up as changed numbers.
+
+CLI:
+    python -m osc.bench --duration 5 --output bench.json
+    python -m osc.bench --scenario audio-many --scenario mixed-monitor
+    python -m osc.bench --baseline previous.json --tolerance 0.25   # exit 1 on regression
+"""
+
+import argparse
+import json
+import math
+import platform
+import socket
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import codec
+from .hub import OSCHub
+from .monitor import OSCMonitor
+
+AUDIO_RATE_HZ = 60.0
+VDJ_POLL_HZ = 4.0
+LYRIC_BURST_INTERVAL = 2.0
+LYRIC_BURST_LINES = 60
+MANY_SUBSCRIBERS = 25
+DRAIN_TIMEOUT = 2.0
+
+AUDIO_ADDRESSES: List[str] = (
+    ["/audio/level", "/audio/level/bass", "/audio/level/mid", "/audio/level/high",
+     "/audio/beat/onbeat", "/audio/beat/beattime", "/audio/bpm", "/audio/timecode"]
+    + [f"/audio/fft/{band}" for band in range(32)]
+)
+
+VDJ_FIELDS = ("get_title", "get_artist", "get_bpm", "get_position", "get_volume", "play", "is_audible", "get_time")
+
+SUBSCRIBER_PATTERNS = (
+    "/audio/*",
+    "/vdj/*",
+    "/textler/*",
+    "/audio/beat/onbeat",
+    "/vdj/deck/?/get_title",
+    "/audio/fft/{0,1,2,3}",
+    "/",
+)
+
+Schedule = List[Tuple[float, bytes]]
+
+
+def audio_traffic(duration: float) -> Schedule:
+    """One message per audio address per frame at AUDIO_RATE_HZ."""
+    schedule: Schedule = []
+    frames = int(duration * AUDIO_RATE_HZ)
+    for frame in range(frames):
+        offset = frame / AUDIO_RATE_HZ
+        for index, address in enumerate(AUDIO_ADDRESSES):
+            value = 0.5 + 0.5 * math.sin(offset * 2.0 + index)
+            schedule.append((offset, codec.encode_message(address, [value])))
+    return schedule
+
+
+def vdj_traffic(duration: float, decks: int = 2) -> Schedule:
+    """VDJ deck polling replies at VDJ_POLL_HZ."""
+    schedule: Schedule = []
+    polls = int(duration * VDJ_POLL_HZ)
+    for poll in range(polls):
+        offset = poll / VDJ_POLL_HZ
+        for deck in range(1, decks + 1):
+            for field in VDJ_FIELDS:
+                address = f"/vdj/deck/{deck}/{field}"
+                arg: Any = f"Track {deck}" if field in ("get_title", "get_artist") else offset
+                schedule.append((offset, codec.encode_message(address, [arg])))
+    return schedule
+
+
+def lyric_traffic(duration: float) -> Schedule:
+    """Bursts of /textler/lyrics/line messages (a full song resend)."""
+    schedule: Schedule = []
+    bursts = max(1, int(duration / LYRIC_BURST_INTERVAL))
+    for burst in range(bursts):
+        offset = burst * LYRIC_BURST_INTERVAL
+        schedule.append((offset, codec.encode_message("/textler/lyrics/reset", [])))
+        for line in range(LYRIC_BURST_LINES):
+            text = f"line {line} of a reasonably long lyric sentence"
+            schedule.append((offset, codec.encode_message("/textler/lyrics/line", [line, line * 2.5, text])))
+    return schedule
+
+
+TRAFFIC: Dict[str, Callable[[float], Schedule]] = {
+    "audio": audio_traffic,
+    "vdj": vdj_traffic,
+    "lyrics": lyric_traffic,
+}
+
+
+def build_schedule(traffic: Sequence[str], duration: float) -> Schedule:
+    """Merge the named traffic generators into one time-ordered schedule."""
+    schedule: Schedule = []
+    for name in traffic:
+        schedule.extend(TRAFFIC[name](duration))
+    schedule.sort(key=lambda item: item[0])
+    return schedule
+
+
+@dataclass(frozen=True)
+class BenchScenario:
+    name: str
+    traffic: Tuple[str, ...]
+    subscribers: int = 0
+    monitor: bool = False
+
+
+DEFAULT_SCENARIOS: Tuple[BenchScenario, ...] = (
+    BenchScenario("audio-0", ("audio",), 0),
+    BenchScenario("audio-1", ("audio",), 1),
+    BenchScenario("audio-many", ("audio",), MANY_SUBSCRIBERS),
+    BenchScenario("mixed-0", ("audio", "vdj", "lyrics"), 0),
+    BenchScenario("mixed-1", ("audio", "vdj", "lyrics"), 1),
+    BenchScenario("mixed-many", ("audio", "vdj", "lyrics"), MANY_SUBSCRIBERS),
+    BenchScenario("mixed-monitor", ("audio", "vdj", "lyrics"), 1, monitor=True),
+    BenchScenario("mixed-many-monitor", ("audio", "vdj", "lyrics"), MANY_SUBSCRIBERS, monitor=True),
+)
+
+
+def _free_udp_port() -> int:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+class _ForwardSink:
+    """Drains forwarded datagrams so forwarding cost is real but never blocks."""
+
+    def __init__(self) -> None:
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.settimeout(0.05)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self._stop = threading.Event()
+        self.datagrams = 0
+        self._thread = threading.Thread(target=self._run, daemon=True, name="OSCBenchSink")
+        self._thread.start()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._sock.getsockname()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._sock.recv(65536)
+                self.datagrams += 1
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self._sock.close()
+
+
+def _make_subscriber(counter: List[int]) -> Callable[[str, List[Any]], None]:
+    def handler(path: str, args: List[Any]) -> None:
+        counter[0] += 1
+    return handler
+
+
+def _send_schedule(schedule: Schedule, port: int, paced: bool) -> Tuple[int, float, float]:
+    """Send the schedule; returns (sent, elapsed seconds, max send lag seconds)."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    target = ("127.0.0.1", port)
+    lag_max = 0.0
+    sent = 0
+    begin = time.perf_counter()
+    try:
+        for offset, packet in schedule:
+            if paced:
+                delay = begin + offset - time.perf_counter()
+                if delay > 0.0:
+                    time.sleep(delay)
+                elif -delay > lag_max:
+                    lag_max = -delay
+            sock.sendto(packet, target)
+            sent += 1
+    finally:
+        sock.close()
+    return sent, time.perf_counter() - begin, lag_max
+
+
+def _wait_drained(hub: OSCHub, timeout: float = DRAIN_TIMEOUT) -> None:
+    deadline = time.monotonic() + timeout
+    last = -1
+    while time.monotonic() < deadline:
+        stats = hub.get_hub_stats()
+        processed = stats.get("processed", 0)
+        if stats.get("queue_depth", 0) == 0 and processed == last:
+            return
+        last = processed
+        time.sleep(0.05)
+
+
+def run_scenario(
+    scenario: BenchScenario,
+    duration: float = 5.0,
+    paced: bool = True,
+    configure: Optional[Callable[[OSCHub], None]] = None,
+) -> Dict[str, Any]:
+    """Run one scenario against a fresh hub and return its metrics."""
+    schedule = build_schedule(scenario.traffic, duration)
+    sink = _ForwardSink()
+    port = _free_udp_port()
+    hub = OSCHub(receive_port=port, forward_targets=[sink.address])
+    if configure is not None:
+        configure(hub)
+    monitor: Optional[OSCMonitor] = None
+    calls = [0]
+    try:
+        if not hub.start():
+            raise RuntimeError(f"hub failed to bind port {port}")
+        for index in range(scenario.subscribers):
+            hub.subscribe(SUBSCRIBER_PATTERNS[index % len(SUBSCRIBER_PATTERNS)], _make_subscriber(calls))
+        if scenario.monitor:
+            monitor = OSCMonitor(max_addresses=200, hub=hub)
+            monitor.start()
+        hub.set_stats_enabled(True)
+
+        sent, elapsed, lag_max = _send_schedule(schedule, port, paced)
+        _wait_drained(hub)
+        stats = hub.get_hub_stats()
+    finally:
+        if monitor is not None:
+            monitor.stop()
+        hub.stop()
+        sink.close()
+
+    processed = stats.get("processed", 0)
+    dropped = stats.get("dropped", 0)
+    return {
+        "scenario": asdict(scenario),
+        "paced": paced,
+        "duration_s": duration,
+        "sent": sent,
+        "send_elapsed_s": elapsed,
+        "send_lag_max_ms": lag_max * 1000.0,
+        "processed": processed,
+        "forwarded_datagrams": sink.datagrams,
+        "handler_calls": calls[0],
+        "dropped": dropped,
+        "conflated": stats.get("conflated", 0),
+        "drop_rate": dropped / sent if sent else 0.0,
+        "queue_peak": stats.get("queue_peak", 0),
+        "throughput_msg_s": processed / elapsed if elapsed > 0 else 0.0,
+        "queue_latency_ms": stats.get("queue_latency", {}),
+        "dispatch_latency_ms": stats.get("dispatch_latency", {}),
+    }
+
+
+def run_suite(
+    scenarios: Sequence[BenchScenario] = DEFAULT_SCENARIOS,
+    duration: float = 5.0,
+    paced: bool = True,
+) -> Dict[str, Any]:
+    """Run scenarios in order and wrap the results with environment info."""
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [run_scenario(scenario, duration, paced) for scenario in scenarios],
+    }
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    tolerance: float = 0.25,
+    latency_floor_ms: float = 0.5,
+) -> List[str]:
+    """
+    List regressions of current vs baseline (empty list = no regression).
+
+    Flags lower throughput, higher drop rate and higher p99 queue/dispatch
+    latency beyond tolerance (latency changes under latency_floor_ms are noise).
+    """
+    previous = {result["scenario"]["name"]: result for result in baseline.get("results", [])}
+    regressions: List[str] = []
+    for result in current.get("results", []):
+        name = result["scenario"]["name"]
+        old = previous.get(name)
+        if old is None:
+            continue
+        if result["throughput_msg_s"] < old["throughput_msg_s"] * (1.0 - tolerance):
+            regressions.append(
+                f"{name}: throughput {result['throughput_msg_s']:.0f} < {old['throughput_msg_s']:.0f} msg/s"
+            )
+        if result["drop_rate"] > old["drop_rate"] + 0.01:
+            regressions.append(f"{name}: drop rate {result['drop_rate']:.3f} > {old['drop_rate']:.3f}")
+        for key in ("queue_latency_ms", "dispatch_latency_ms"):
+            new_p99 = result.get(key, {}).get("p99", 0.0)
+            old_p99 = old.get(key, {}).get("p99", 0.0)
+            if new_p99 > old_p99 * (1.0 + tolerance) and new_p99 - old_p99 > latency_floor_ms:
+                regressions.append(f"{name}: {key} p99 {new_p99:.2f} > {old_p99:.2f} ms")
+    return regressions
+
+
+def _print_table(suite: Dict[str, Any]) -> None:
+    print(f"{'scenario':<20} {'sent':>7} {'msg/s':>8} {'drop%':>6} {'peak':>5} {'q p99':>7} {'disp p99':>8}")
+    for result in suite["results"]:
+        print(
+            f"{result['scenario']['name']:<20} {result['sent']:>7} "
+            f"{result['throughput_msg_s']:>8.0f} {result['drop_rate'] * 100:>6.2f} "
+            f"{result['queue_peak']:>5} {result['queue_latency_ms'].get('p99', 0.0):>7.2f} "
+            f"{result['dispatch_latency_ms'].get('p99', 0.0):>8.3f}",
+            file=sys.stderr,
+        )
+
+
+def main():
+    """CLI entry point for the hub benchmark suite."""
+    parser = argparse.ArgumentParser(
+        description="OSC Bench - synthetic load benchmarks for the OSC hub"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=5.0,
+        help="Seconds of traffic per scenario (default: 5)"
+    )
+    parser.add_argument(
+        "--scenario", action="append", default=[],
+        choices=[scenario.name for scenario in DEFAULT_SCENARIOS],
+        help="Scenario to run (repeatable, default: all)"
+    )
+    parser.add_argument("--unpaced", action="store_true", help="Send as fast as possible instead of real time")
+    parser.add_argument("--output", "-o", help="Write JSON results to this file (default: stdout)")
+    parser.add_argument("--baseline", help="Compare against a previous JSON result; exit 1 on regression")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25,
+        help="Allowed relative regression vs baseline (default: 0.25)"
+    )
+    args = parser.parse_args()
+
+    scenarios = [s for s in DEFAULT_SCENARIOS if not args.scenario or s.name in args.scenario]
+    suite = run_suite(scenarios, args.duration, paced=not args.unpaced)
+    _print_table(suite)
+
+    payload = json.dumps(suite, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(payload)
+    else:
+        print(payload)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = compare(json.load(handle), suite, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
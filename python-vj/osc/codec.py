@@ -0,0 +1,257 @@
+"""
+OSC Codec - Minimal OSC 1.0 packet encoding/decoding on raw bytes
+
+Used where the hub works with datagrams directly instead of liblo objects
+(raw forwarding, recording, relays). Decoding is split so callers can read
+an address without touching the arguments:
+
+    parse_address(data)         -> "/audio/level" or "#bundle"
+    iter_messages(data)         -> (address, start, end) for every message,
+                                   walking nested bundles without copying
+    decode_args(data, start, end) -> [args...] only when actually needed
+
+Supported type tags: i f s S b h d t T F N I c m r (others stop decoding).
+"""
+
+import struct
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+BUNDLE_TAG = "#bundle"
+_BUNDLE_PREFIX = b"#bundle\0"
+_IMMEDIATELY = 1  # OSC timetag meaning "now"
+_NTP_EPOCH_OFFSET = 2208988800  # seconds from 1900-01-01 to 1970-01-01
+
+_INT = struct.Struct(">i")
+_UINT64 = struct.Struct(">Q")
+_FLOAT = struct.Struct(">f")
+_DOUBLE = struct.Struct(">d")
+_INT64 = struct.Struct(">q")
+
+
+class OSCDecodeError(ValueError):
+    """Raised when a packet is not valid OSC."""
+
+
+def _padded(size: int) -> int:
+    return (size + 3) & ~3
+
+
+def _read_string(data: bytes, offset: int) -> Tuple[str, int]:
+    end = data.find(b"\0", offset)
+    if end < 0:
+        raise OSCDecodeError("unterminated OSC string")
+    return data[offset:end].decode("utf-8", "replace"), offset + _padded(end - offset + 1)
+
+
+def is_bundle(data: bytes) -> bool:
+    return data[:8] == _BUNDLE_PREFIX
+
+
+def parse_address(data: bytes) -> Optional[str]:
+    """Return the address of a message ("#bundle" for bundles), or None if invalid."""
+    if not data or data[0] not in (0x2F, 0x23):  # "/" or "#"
+        return None
+    end = data.find(b"\0")
+    if end <= 0:
+        return None
+    return data[:end].decode("utf-8", "replace")
+
+
+def iter_messages(data: bytes, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[str, int, int]]:
+    """Yield (address, start, end) for each message, descending into bundles."""
+    end = len(data) if end is None else end
+    if data[start:start + 8] == _BUNDLE_PREFIX:
+        offset = start + 16
+        while offset + 4 <= end:
+            size = _INT.unpack_from(data, offset)[0]
+            offset += 4
+            if size <= 0 or offset + size > end:
+                raise OSCDecodeError("bad bundle element size")
+            yield from iter_messages(data, offset, offset + size)
+            offset += size
+        return
+    address_end = data.find(b"\0", start, end)
+    if address_end <= start:
+        raise OSCDecodeError("missing OSC address")
+    yield data[start:address_end].decode("utf-8", "replace"), start, end
+
+
+def bundle_timetag(data: bytes) -> Optional[int]:
+    """Raw 64-bit NTP timetag of a bundle (None for plain messages)."""
+    if not is_bundle(data) or len(data) < 16:
+        return None
+    return _UINT64.unpack_from(data, 8)[0]
+
+
+def decode_type_tags(data: bytes, start: int = 0, end: Optional[int] = None) -> Tuple[str, int]:
+    """Return (type tags without ',', offset of first argument)."""
+    end = len(data) if end is None else end
+    _, offset = _read_string(data, start)
+    if offset >= end or data[offset] != 0x2C:  # ","
+        return "", offset
+    tags, offset = _read_string(data, offset)
+    return tags[1:], offset
+
+
+def decode_args(data: bytes, start: int = 0, end: Optional[int] = None) -> List[Any]:
+    """Decode the arguments of the message at data[start:end]."""
+    end = len(data) if end is None else end
+    tags, offset = decode_type_tags(data, start, end)
+    args: List[Any] = []
+    for tag in tags:
+        if tag == "f":
+            args.append(_FLOAT.unpack_from(data, offset)[0])
+            offset += 4
+        elif tag == "i":
+            args.append(_INT.unpack_from(data, offset)[0])
+            offset += 4
+        elif tag in ("s", "S"):
+            value, offset = _read_string(data, offset)
+            args.append(value)
+        elif tag == "b":
+            size = _INT.unpack_from(data, offset)[0]
+            offset += 4
+            args.append(bytes(data[offset:offset + size]))
+            offset += _padded(size)
+        elif tag == "d":
+            args.append(_DOUBLE.unpack_from(data, offset)[0])
+            offset += 8
+        elif tag in ("h", "t"):
+            args.append(_INT64.unpack_from(data, offset)[0])
+            offset += 8
+        elif tag == "T":
+            args.append(True)
+        elif tag == "F":
+            args.append(False)
+        elif tag == "N":
+            args.append(None)
+        elif tag == "I":
+            args.append(float("inf"))
+        elif tag == "c":
+            args.append(chr(_INT.unpack_from(data, offset)[0]))
+            offset += 4
+        elif tag in ("m", "r"):
+            args.append(bytes(data[offset:offset + 4]))
+            offset += 4
+        else:
+            break
+        if offset > end:
+            raise OSCDecodeError("truncated OSC arguments")
+    return args
+
+
+def decode_message(data: bytes, start: int = 0, end: Optional[int] = None) -> Tuple[str, List[Any]]:
+    """Decode a single message into (address, args)."""
+    address, _ = _read_string(data, start)
+    return address, decode_args(data, start, end)
+
+
+def _encode_string(value: str) -> bytes:
+    raw = value.encode("utf-8", "replace")
+    return raw + b"\0" * (_padded(len(raw) + 1) - len(raw))
+
+
+def encode_message(address: str, args: Sequence[Any] = ()) -> bytes:
+    """Encode address + args using the same type mapping as liblo (int→i, float→f, str→s)."""
+    tags = [","]
+    payload: List[bytes] = []
+    for arg in args:
+        if arg is True:
+            tags.append("T")
+        elif arg is False:
+            tags.append("F")
+        elif arg is None:
+            tags.append("N")
+        elif isinstance(arg, int):
+            if -0x80000000 <= arg <= 0x7FFFFFFF:
+                tags.append("i")
+                payload.append(_INT.pack(arg))
+            else:
+                tags.append("h")
+                payload.append(_INT64.pack(arg))
+        elif isinstance(arg, float):
+            tags.append("f")
+            payload.append(_FLOAT.pack(arg))
+        elif isinstance(arg, str):
+            tags.append("s")
+            payload.append(_encode_string(arg))
+        elif isinstance(arg, (bytes, bytearray, memoryview)):
+            blob = bytes(arg)
+            tags.append("b")
+            payload.append(_INT.pack(len(blob)) + blob + b"\0" * (_padded(len(blob)) - len(blob)))
+        else:
+            tags.append("s")
+            payload.append(_encode_string(str(arg)))
+    return _encode_string(address) + _encode_string("".join(tags)) + b"".join(payload)
+
+
+def message_size(address: str, args: Sequence[Any] = ()) -> int:
+    """Encoded size of encode_message(address, args), computed without encoding."""
+    size = _padded(len(address.encode("utf-8", "replace")) + 1) + _padded(len(args) + 2)
+    for arg in args:
+        if arg is True or arg is False or arg is None:
+            continue
+        if isinstance(arg, int):
+            size += 4 if -0x80000000 <= arg <= 0x7FFFFFFF else 8
+        elif isinstance(arg, float):
+            size += 4
+        elif isinstance(arg, str):
+            size += _padded(len(arg.encode("utf-8", "replace")) + 1)
+        elif isinstance(arg, (bytes, bytearray, memoryview)):
+            size += 4 + _padded(len(arg))
+        else:
+            size += _padded(len(str(arg).encode("utf-8", "replace")) + 1)
+    return size
+
+
+def unix_to_ntp(seconds: float) -> float:
+    """Convert a Unix timestamp to NTP seconds (the float timetag liblo.Bundle takes)."""
+    return seconds + _NTP_EPOCH_OFFSET
+
+
+def unix_to_timetag(seconds: float) -> int:
+    """Convert a Unix timestamp to a 64-bit NTP timetag."""
+    ntp = seconds + _NTP_EPOCH_OFFSET
+    whole = int(ntp)
+    return (whole << 32) | int((ntp - whole) * 4294967296.0)
+
+
+def timetag_to_unix(timetag: int) -> float:
+    """Convert a 64-bit NTP timetag to a Unix timestamp."""
+    return (timetag >> 32) - _NTP_EPOCH_OFFSET + (timetag & 0xFFFFFFFF) / 4294967296.0
+
+
+def encode_bundle(elements: Sequence[bytes], timetag: int = _IMMEDIATELY) -> bytes:
+    """Wrap encoded messages/bundles into a bundle (timetag as 64-bit NTP)."""
+    parts = [_BUNDLE_PREFIX, _UINT64.pack(timetag)]
+    for element in elements:
+        parts.append(_INT.pack(len(element)))
+        parts.append(element)
+    return b"".join(parts)
+
+
+def pack_bundles(elements: Sequence[bytes], max_bytes: int) -> List[bytes]:
+    """
+    Group encoded elements into as few packets as fit max_bytes each.
+
+    A group of one is sent bare; an element larger than max_bytes goes alone.
+    """
+    packets: List[bytes] = []
+    group: List[bytes] = []
+    size = bundle_overhead(0)
+    for element in elements:
+        element_size = 4 + len(element)
+        if group and size + element_size > max_bytes:
+            packets.append(group[0] if len(group) == 1 else encode_bundle(group))
+            group = []
+            size = bundle_overhead(0)
+        group.append(element)
+        size += element_size
+    if group:
+        packets.append(group[0] if len(group) == 1 else encode_bundle(group))
+    return packets
+
+
+def bundle_overhead(count: int) -> int:
+    """Encoded size of a bundle header plus count element size prefixes."""
+    return 16 + 4 * count
@@ -10,93 +10,110 @@ Architecture:
   - vdj: VirtualDJ (port 9009)
   - synesthesia: Synesthesia (port 7777)
   - textler: VJUniverse (port 10000)
+- Conflating ingress queue: continuous addresses (levels, FFT, timecode)
+  keep only their newest args; discrete events stay strict FIFO
+- Priority lanes by address prefix (beat > control > stream); the worker
+  drains higher lanes first, latency is accounted per lane
+- Stats (while enabled): log-bucketed latency histograms for queue delay and
+  end-to-end dispatch, per-handler timing, per-address message rates
+- Optional batched forwarding: messages are coalesced into one bundle per
+  target per flush window (see set_forward_batching)
+- Optional raw mode: receive on a plain UDP socket and forward the original
+  datagram bytes unchanged; arguments are decoded only when a subscriber
+  matches the address (see set_raw_forwarding)
+- Per-target routing: include/exclude address patterns and per-address rate
+  caps for each forward target, hot-reloadable from JSON (see set_routes,
+  set_routing_file)
+- Slow-handler isolation: subscribe(..., isolated=True) runs a handler on its
+  own bounded queue/thread (drop_oldest / conflate / block); handlers that
+  exceed the latency budget are flagged in get_slow_handlers()
+- Outbound scheduling: channels can send through a paced writer thread with
+  priorities and bundling (see osc/scheduler.py); textler is scheduled by
+  default so lyric bursts don't overflow Processing's receive buffer
+- Retained state: the textler channel remembers the last value per
+  /textler/*, /shader/*, /image/* address plus lyric lines; resync() (or an
+  incoming /textler/resync) replays it as a compact bundle burst
+- Typed array subscriptions: all-float payloads (FFT, levels) delivered as
+  read-only NumPy arrays, optionally with a ring of recent frames per
+  address (see subscribe_array)
+- Shared-memory fan-out: received messages are written once into a ring
+  that other local processes read with OSCShmReader (see set_shared_memory)
 """
 
 import logging
-import queue
+import socket
+import struct
 import threading
 import time
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import pyliblo3 as liblo
 
-logger = logging.getLogger(__name__)
-
-Handler = Callable[[str, List[Any]], None]
+from . import codec
+from .arrays import NUMPY_AVAILABLE, ArrayHandler, ArraySubscription, array_from_args, array_from_packet
+from .forwarding import (
+    FORWARD_BATCH_MAX_LATENCY,
+    FORWARD_BATCH_MAX_MESSAGES,
+    ForwardBatcher,
+    RawForwardBatcher,
+)
+from .ingress import CONTINUOUS_PATTERNS, DEFAULT_LANES, IngressQueue, LaneConfig
+from .patterns import Handler, ListenerRegistry, PatternEntry, handler_label
+from .retained import RetainedState
+from .shm import SHM_NAME, SHM_SLOT_SIZE, SHM_SLOTS, OSCShmPublisher
+from .scheduler import SEND_BURST, SEND_MAX_BUNDLE, SEND_MAX_BUNDLE_BYTES, SEND_RATE, SendScheduler
+from .routing import ROUTING_POLL_INTERVAL, RouteConfig, RoutingFile, RoutingTable
+from .stats import LatencyHistogram
+from .subscribers import (
+    POLICY_DROP_OLDEST,
+    SUBSCRIBER_QUEUE_MAXSIZE,
+    IsolatedSubscriber,
+)
 
-_MATCH_ANY = "any"
-_MATCH_EXACT = "exact"
-_MATCH_PREFIX = "prefix"
+logger = logging.getLogger(__name__)
 
 QUEUE_MAXSIZE = 4096
 QUEUE_POLL_TIMEOUT = 0.1
+ADDRESS_RATE_MAX = 512  # distinct addresses tracked for rates; rest counted as "(other)"
+ADDRESS_RATE_TOP = 20
+RAW_RECV_BUFFER_BYTES = 1 << 20
+RAW_RECV_TIMEOUT = 0.1
+RAW_MAX_DATAGRAM = 65535
+HANDLER_BUDGET = 0.002  # seconds; slower handler calls are flagged
+RESYNC_ADDRESS = "/textler/resync"
+_RESYNC_BYTES = RESYNC_ADDRESS.encode() + b"\0"
+RESYNC_BUNDLE_MAX = 32  # messages per replay bundle (also capped at SEND_MAX_BUNDLE_BYTES)
 
 
-@dataclass(frozen=True)
-class _PatternEntry:
-    order: int
-    pattern: Optional[str]
-    handlers: Tuple[Handler, ...]
-
-
-class _PrefixTrieNode:
-    __slots__ = ("children", "entries")
-
-    def __init__(self) -> None:
-        self.children: Dict[str, "_PrefixTrieNode"] = {}
-        self.entries: List[_PatternEntry] = []
-
-
-class _PrefixTrie:
-    __slots__ = ("_root",)
-
-    def __init__(self) -> None:
-        self._root = _PrefixTrieNode()
-
-    def add(self, prefix: str, entry: _PatternEntry) -> None:
-        node = self._root
-        for char in prefix:
-            node = node.children.setdefault(char, _PrefixTrieNode())
-        node.entries.append(entry)
-
-    def match(self, path: str) -> List[_PatternEntry]:
-        node = self._root
-        matches: List[_PatternEntry] = []
-        if node.entries:
-            matches.extend(node.entries)
-        for char in path:
-            node = node.children.get(char)
-            if node is None:
-                break
-            if node.entries:
-                matches.extend(node.entries)
-        return matches
-
-
-@dataclass(frozen=True)
-class _ListenerSnapshot:
-    any_entries: Tuple[_PatternEntry, ...]
-    exact_entries: Dict[str, _PatternEntry]
-    prefix_trie: _PrefixTrie
+@dataclass
+class _LaneStats:
+    processed: int = 0
+    latency_sum: float = 0.0
+    latency_max: float = 0.0
 
 
-def _classify_pattern(pattern: Optional[str]) -> Tuple[str, Optional[str]]:
-    if pattern in (None, "", "/", "*"):
-        return _MATCH_ANY, None
-    if pattern.endswith("*"):
-        return _MATCH_PREFIX, pattern[:-1]
-    return _MATCH_EXACT, pattern
+@dataclass
+class _HandlerStats:
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
 
 
 @dataclass
 class _HubStats:
-    drops: int = 0
     processed: int = 0
     queue_peak: int = 0
     latency_sum: float = 0.0
     latency_max: float = 0.0
     latency_count: int = 0
+    lanes: List[_LaneStats] = field(default_factory=list)
+    queue_hist: LatencyHistogram = field(default_factory=LatencyHistogram)
+    dispatch_hist: LatencyHistogram = field(default_factory=LatencyHistogram)
+    handlers: Dict[str, _HandlerStats] = field(default_factory=dict)
+    address_counts: Dict[str, int] = field(default_factory=dict)
+    started_at: float = field(default_factory=time.monotonic)
+
 
 # Central receive port for all incoming OSC
 RECEIVE_PORT = 9999
@@ -115,12 +132,46 @@ class ChannelConfig:
     host: str
     send_port: int
     recv_port: Optional[int] = None
+    scheduled: bool = False  # send through a paced SendScheduler
+    retained: bool = False  # keep last-value state for resync()
 
 
 # Channel configurations (send only; recv_port mirrors shared hub port)
 VDJ = ChannelConfig("vdj", "127.0.0.1", 9009, RECEIVE_PORT)
 SYNESTHESIA = ChannelConfig("synesthesia", "127.0.0.1", 7777, RECEIVE_PORT)
-TEXTLER = ChannelConfig("textler", "127.0.0.1", 10000, None)
+TEXTLER = ChannelConfig("textler", "127.0.0.1", 10000, None, scheduled=True, retained=True)
+
+
+def _bundle_requests_resync(data: bytes) -> bool:
+    """True if a raw bundle contains a /textler/resync message."""
+    if _RESYNC_BYTES not in data:
+        return False
+    try:
+        return any(address == RESYNC_ADDRESS for address, _, _ in codec.iter_messages(data))
+    except codec.OSCDecodeError:
+        return False
+
+
+def _chunk_messages(
+    messages: Sequence[Tuple[str, Sequence[Any]]],
+    max_count: int,
+    max_bytes: int,
+) -> List[List[Tuple[str, Sequence[Any]]]]:
+    """Split messages into bundle-sized runs (an oversized message goes alone)."""
+    chunks: List[List[Tuple[str, Sequence[Any]]]] = []
+    chunk: List[Tuple[str, Sequence[Any]]] = []
+    size = codec.bundle_overhead(0)
+    for address, args in messages:
+        entry_size = 4 + codec.message_size(address, args)  # size prefix + message
+        if chunk and (len(chunk) >= max_count or size + entry_size > max_bytes):
+            chunks.append(chunk)
+            chunk = []
+            size = codec.bundle_overhead(0)
+        chunk.append((address, args))
+        size += entry_size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
 
 
 class Channel:
@@ -133,6 +184,12 @@ class Channel:
     def __init__(self, config: ChannelConfig):
         self._config = config
         self._target: Optional[liblo.Address] = None
+        self._scheduler: Optional[SendScheduler] = None
+        self._scheduling: Optional[Tuple[float, int, int]] = None  # (rate, burst, max_bundle) when enabled
+        self._retained: Optional[RetainedState] = RetainedState() if config.retained else None
+        self._taps: Tuple[Handler, ...] = ()
+        if config.scheduled:
+            self.set_scheduling(True)
 
     @property
     def name(self) -> str:
@@ -150,6 +207,8 @@ class Channel:
         """Start the channel. Returns True on success."""
         try:
             self._target = liblo.Address(self._config.host, self._config.send_port)
+            if self._scheduling is not None and self._scheduler is None:
+                self._scheduler = self._make_scheduler(*self._scheduling)
             logger.info(f"[{self.name}] → {self._config.host}:{self._config.send_port}")
             return True
         except liblo.ServerError as exc:
@@ -157,14 +216,100 @@ class Channel:
             return False
 
     def stop(self):
-        """Stop the channel."""
+        """Stop the channel (queued scheduled messages are flushed first)."""
+        scheduler = self._scheduler
+        if scheduler is not None:
+            scheduler.close(flush=True, timeout=0.2)
+            self._scheduler = None
         self._target = None
         logger.info(f"[{self.name}] Stopped")
 
-    def send(self, address: str, *args) -> bool:
-        """Send OSC message. Returns True on success."""
+    @property
+    def scheduler(self) -> Optional[SendScheduler]:
+        return self._scheduler
+
+    @property
+    def retained(self) -> Optional[RetainedState]:
+        return self._retained
+
+    def resync(self) -> int:
+        """
+        Replay retained state as bundles straight to the target.
+
+        Bypasses the scheduler so a restarted renderer is back in one burst.
+        Returns the number of messages sent.
+        """
+        retained = self._retained
+        target = self._target
+        if retained is None or target is None:
+            return 0
+        messages = retained.snapshot()
+        try:
+            for chunk in _chunk_messages(messages, RESYNC_BUNDLE_MAX, SEND_MAX_BUNDLE_BYTES):
+                liblo.send(target, liblo.Bundle(*[liblo.Message(address, *args) for address, args in chunk]))
+        except Exception as exc:
+            logger.error(f"[{self.name}] Resync error: {exc}")
+            return 0
+        logger.info(f"[{self.name}] Resynced {len(messages)} retained messages")
+        return len(messages)
+
+    def set_scheduling(
+        self,
+        enabled: bool,
+        rate: float = SEND_RATE,
+        burst: int = SEND_BURST,
+        max_bundle: int = SEND_MAX_BUNDLE,
+    ) -> None:
+        """
+        Route send() through a paced writer thread (or back to direct sends).
+
+        rate is in messages per second; up to max_bundle ready messages are
+        sent as one bundle.
+        """
+        previous = self._scheduler
+        self._scheduling = (rate, burst, max_bundle) if enabled else None
+        self._scheduler = self._make_scheduler(rate, burst, max_bundle) if enabled else None
+        if previous is not None:
+            previous.close()
+
+    def _make_scheduler(self, rate: float, burst: int, max_bundle: int) -> SendScheduler:
+        return SendScheduler(
+            self.name,
+            self._config.host,
+            self._config.send_port,
+            rate=rate,
+            burst=burst,
+            max_bundle=max_bundle,
+        )
+
+    def add_tap(self, tap: Handler) -> None:
+        """Call tap(address, args) for every message this channel accepts (e.g. a relay)."""
+        if tap not in self._taps:
+            self._taps = self._taps + (tap,)
+
+    def remove_tap(self, tap: Handler) -> None:
+        self._taps = tuple(t for t in self._taps if t != tap)
+
+    def send(self, address: str, *args, priority: Optional[int] = None) -> bool:
+        """
+        Send OSC message. Returns True on success.
+
+        With scheduling on, the message is queued (priority overrides the
+        address-based class) and True means it was accepted.
+        """
         if not self._target:
             return False
+        retained = self._retained
+        if retained is not None:
+            retained.record(address, args)
+        for tap in self._taps:
+            try:
+                tap(address, list(args))
+            except Exception as exc:
+                logger.error(f"[{self.name}] Tap error: {exc}")
+        scheduler = self._scheduler
+        if scheduler is not None:
+            return scheduler.send(address, args, priority)
         try:
             liblo.send(self._target, address, *args)
             return True
@@ -172,6 +317,39 @@ class Channel:
             logger.error(f"[{self.name}] Send error: {exc}")
             return False
 
+    def send_bundle(self, messages: Sequence[Tuple[str, Sequence[Any]]], at: Optional[float] = None) -> bool:
+        """
+        Send messages as one bundle timetagged for Unix time at (None = immediately).
+
+        With scheduling on, the bundle is queued in the high lane behind the
+        queued resets and bulk lyrics it must not overtake; the caller never
+        waits. Retained state and taps see every message.
+        """
+        target = self._target
+        if not target or not messages:
+            return False
+        retained = self._retained
+        for address, args in messages:
+            if retained is not None:
+                retained.record(address, args)
+            for tap in self._taps:
+                try:
+                    tap(address, list(args))
+                except Exception as exc:
+                    logger.error(f"[{self.name}] Tap error: {exc}")
+        timetag = None if at is None else codec.unix_to_ntp(at)
+        scheduler = self._scheduler
+        if scheduler is not None:
+            return scheduler.send_bundle(messages, timetag)
+        try:
+            elements = [liblo.Message(address, *args) for address, args in messages]
+            bundle = liblo.Bundle(*elements) if timetag is None else liblo.Bundle(timetag, *elements)
+            liblo.send(target, bundle)
+            return True
+        except Exception as exc:
+            logger.error(f"[{self.name}] Send error: {exc}")
+            return False
+
 
 class OSCHub:
     """
@@ -180,9 +358,16 @@ class OSCHub:
     - Receives on port 9999
     - Forwards every message to 10000 and 11111
     - Exposes send-only channels for vdj, synesthesia, textler
+
+    receive_port and forward_targets can be overridden for tests/benchmarks.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        receive_port: int = RECEIVE_PORT,
+        forward_targets: Optional[List[Tuple[str, int]]] = None,
+    ):
+        self._receive_port = receive_port
         self._vdj = Channel(VDJ)
         self._synesthesia = Channel(SYNESTHESIA)
         self._textler = Channel(TEXTLER)
@@ -191,7 +376,7 @@ class OSCHub:
         self._server: Optional[liblo.ServerThread] = None
         self._server_lock = threading.Lock()
 
-        self._queue: queue.Queue = queue.Queue(maxsize=QUEUE_MAXSIZE)
+        self._queue = IngressQueue(QUEUE_MAXSIZE, CONTINUOUS_PATTERNS, DEFAULT_LANES)
         self._worker_stop = threading.Event()
         self._worker_thread: Optional[threading.Thread] = None
 
@@ -199,14 +384,31 @@ class OSCHub:
         self._stats_lock = threading.Lock()
         self._stats = _HubStats()
 
+        targets = FORWARD_TARGETS if forward_targets is None else forward_targets
+        self._routing = RoutingTable.from_targets(targets)
+        self._pending_routing: Optional[RoutingTable] = None
+        self._routing_file: Optional[RoutingFile] = None
         self._forward_targets: List[liblo.Address] = [
-            liblo.Address(host, port) for host, port in FORWARD_TARGETS
+            liblo.Address(host, port) for host, port in targets
         ]
+        self._forward_addrs: List[Tuple[str, int]] = list(targets)
+        self._forward_batcher: Optional[Any] = None
+
+        self._raw_mode = False
+        self._raw_recv_sock: Optional[socket.socket] = None
+        self._raw_send_sock: Optional[socket.socket] = None
+        self._raw_thread: Optional[threading.Thread] = None
+        self._raw_stop = threading.Event()
 
-        self._listeners: Dict[str, List[Handler]] = {}
-        self._listeners_lock = threading.Lock()
-        self._listeners_snapshot = _ListenerSnapshot((), {}, _PrefixTrie())
-        self._listener_count = 0
+        self._shm_publisher: Optional[OSCShmPublisher] = None
+
+        self._listeners = ListenerRegistry()
+        self._array_listeners = ListenerRegistry()
+        self._isolated: Dict[Tuple[str, Handler], IsolatedSubscriber] = {}
+        self._isolated_lock = threading.Lock()
+        self._handler_budget = HANDLER_BUDGET
+        self._slow_lock = threading.Lock()
+        self._slow_handlers: Dict[str, _HandlerStats] = {}
 
     @property
     def is_started(self) -> bool:
@@ -214,7 +416,7 @@ class OSCHub:
 
     @property
     def receive_port(self) -> int:
-        return RECEIVE_PORT
+        return self._receive_port
 
     @property
     def vdj(self) -> Channel:
@@ -238,48 +440,367 @@ class OSCHub:
             self._stats_enabled = enabled
             if enabled:
                 self._stats = _HubStats()
+                self._queue.reset_stats()
+                self._routing.reset_stats()
+                batcher = self._forward_batcher
+                if batcher is not None:
+                    batcher.reset_stats()
+
+    def set_forward_batching(
+        self,
+        enabled: bool,
+        max_messages: int = FORWARD_BATCH_MAX_MESSAGES,
+        max_latency: float = FORWARD_BATCH_MAX_LATENCY,
+    ) -> None:
+        """
+        Enable or disable bundle-coalescing forwarding.
+
+        When enabled, forwarded messages are gathered for up to max_latency
+        seconds (or max_messages messages) and sent as one bundle per target.
+        """
+        if enabled:
+            if self._raw_mode:
+                self._forward_batcher = RawForwardBatcher(
+                    self._get_raw_send_socket(),
+                    self._forward_addrs,
+                    max_messages=max_messages,
+                    max_latency=max_latency,
+                )
+            else:
+                self._forward_batcher = ForwardBatcher(
+                    self._forward_targets,
+                    max_messages=max_messages,
+                    max_latency=max_latency,
+                )
+            logger.info(
+                f"OSCHub forward batching on ({max_messages} msgs / {max_latency * 1000.0:.1f} ms)"
+            )
+        else:
+            self._forward_batcher = None
+            logger.info("OSCHub forward batching off")
+
+    @property
+    def forward_batching(self) -> bool:
+        return self._forward_batcher is not None
+
+    def set_raw_forwarding(self, enabled: bool) -> bool:
+        """
+        Switch between liblo decoding (default) and raw datagram mode.
+
+        Raw mode forwards received bytes unchanged and decodes arguments only
+        for addresses with a matching subscriber. Must be set before start().
+        """
+        if self._started:
+            logger.warning("OSCHub raw mode can only be changed while stopped")
+            return False
+        self._raw_mode = enabled
+        batcher = self._forward_batcher
+        if batcher is not None:
+            self.set_forward_batching(True, batcher.max_messages, batcher.max_latency)
+        return True
+
+    def set_shared_memory(
+        self,
+        enabled: bool,
+        name: str = SHM_NAME,
+        slots: int = SHM_SLOTS,
+        slot_size: int = SHM_SLOT_SIZE,
+    ) -> bool:
+        """
+        Publish received messages into a shared-memory ring for local readers.
+
+        Readers in other processes use osc.shm.OSCShmReader(name). The segment
+        is removed when disabled or when the hub stops. Returns False if the
+        segment cannot be created.
+        """
+        previous = self._shm_publisher
+        if enabled and previous is not None and previous.name == name:
+            return True
+        publisher = None
+        if enabled:
+            try:
+                publisher = OSCShmPublisher(name, slots, slot_size)
+            except (OSError, ValueError) as exc:
+                logger.error(f"OSCHub shared memory '{name}' failed: {exc}")
+                return False
+        self._shm_publisher = publisher
+        if previous is not None and self._worker_thread is None:
+            previous.close()  # otherwise the worker closes it once it lets go
+        logger.info(f"OSCHub shared memory {'on (' + name + ')' if enabled else 'off'}")
+        return True
+
+    @property
+    def shared_memory(self) -> bool:
+        return self._shm_publisher is not None
+
+    @property
+    def raw_forwarding(self) -> bool:
+        return self._raw_mode
+
+    @property
+    def routes(self) -> List[RouteConfig]:
+        return self._routing.configs
+
+    def set_routes(self, routes: Sequence[RouteConfig]) -> None:
+        """
+        Replace the forward routing table (one route per forward target).
+
+        While running, the worker swaps the table in between messages.
+        """
+        table = RoutingTable(routes)
+        worker = self._worker_thread
+        if worker is not None and worker.is_alive():
+            self._pending_routing = table
+        else:
+            self._apply_routing(table)
+
+    def set_routing_file(self, path: Optional[str], interval: float = ROUTING_POLL_INTERVAL) -> bool:
+        """
+        Load forward routes from a JSON file and reload them when it changes.
+
+        Returns False if the initial load failed (the file is still watched).
+        None stops watching and keeps the current routes.
+        """
+        if path is None:
+            self._routing_file = None
+            return True
+        watcher = RoutingFile(path, interval)
+        routes = watcher.poll(time.monotonic())
+        if routes is not None:
+            self.set_routes(routes)
+        self._routing_file = watcher
+        return routes is not None
+
+    def _apply_routing(self, table: RoutingTable) -> None:
+        self._routing = table
+        self._forward_addrs = table.addresses
+        self._forward_targets = [liblo.Address(host, port) for host, port in self._forward_addrs]
+        batcher = self._forward_batcher
+        if batcher is not None:
+            self.set_forward_batching(True, batcher.max_messages, batcher.max_latency)
+
+    def _poll_routing(self) -> None:
+        pending = self._pending_routing
+        if pending is not None:
+            self._pending_routing = None
+            self._apply_routing(pending)
+        watcher = self._routing_file
+        if watcher is not None:
+            routes = watcher.poll(time.monotonic())
+            if routes is not None:
+                self._apply_routing(RoutingTable(routes))
+
+    def set_continuous_patterns(self, patterns: List[str]) -> None:
+        """
+        Set which addresses are continuous (latest value wins while queued).
+
+        Patterns are exact paths or prefixes with a trailing '*'.
+        """
+        self._queue.set_continuous_patterns(patterns)
+
+    def set_priority_lanes(self, lanes: List[LaneConfig]) -> None:
+        """
+        Configure priority lanes (highest first) by address prefix.
+
+        Unmatched addresses go to the trailing "stream" lane. Lane stats
+        are reset because lane indices change.
+        """
+        self._queue.set_lanes(lanes)
+        with self._stats_lock:
+            self._stats.lanes = []
 
     def get_hub_stats(self) -> Dict[str, Any]:
         if not self._stats_enabled:
             return {}
         with self._stats_lock:
             stats = _HubStats(
-                drops=self._stats.drops,
                 processed=self._stats.processed,
                 queue_peak=self._stats.queue_peak,
                 latency_sum=self._stats.latency_sum,
                 latency_max=self._stats.latency_max,
                 latency_count=self._stats.latency_count,
+                lanes=[
+                    _LaneStats(lane.processed, lane.latency_sum, lane.latency_max)
+                    for lane in self._stats.lanes
+                ],
+                queue_hist=self._stats.queue_hist.copy(),
+                dispatch_hist=self._stats.dispatch_hist.copy(),
+                handlers={
+                    label: _HandlerStats(h.calls, h.total, h.max)
+                    for label, h in self._stats.handlers.items()
+                },
+                address_counts=dict(self._stats.address_counts),
+                started_at=self._stats.started_at,
             )
+        ingress = self._queue.get_stats()
         avg_latency = (
             stats.latency_sum / stats.latency_count
             if stats.latency_count > 0
             else 0.0
         )
-        return {
+        result = {
             "queue_depth": self._queue.qsize(),
             "queue_capacity": self._queue.maxsize,
             "queue_peak": stats.queue_peak,
-            "dropped": stats.drops,
+            "dropped": ingress.dropped,
+            "dropped_discrete": ingress.dropped_discrete,
+            "dropped_continuous": ingress.dropped_continuous,
+            "conflated": ingress.conflated,
+            "evicted": ingress.evicted,
             "processed": stats.processed,
             "queue_latency_avg_ms": avg_latency * 1000.0,
             "queue_latency_max_ms": stats.latency_max * 1000.0,
             "queue_latency_samples": stats.latency_count,
+            "routes": self._routing.get_stats(),
+        }
+        result["lanes"] = self._build_lane_stats(stats.lanes)
+        result["queue_latency"] = stats.queue_hist.summary_ms()
+        result["dispatch_latency"] = stats.dispatch_hist.summary_ms()
+        result["handlers"] = self._build_handler_stats(stats.handlers)
+        result["slow_handlers"] = self.get_slow_handlers()
+        result["subscribers"] = self.get_subscriber_stats()
+        publisher = self._shm_publisher
+        if publisher is not None:
+            result["shared_memory"] = publisher.get_stats()
+        result["address_rates"] = self._build_address_rates(
+            stats.address_counts,
+            time.monotonic() - stats.started_at,
+        )
+        batcher = self._forward_batcher
+        if batcher is not None:
+            fwd = batcher.stats
+            flushes = fwd.flushes
+            result.update({
+                "forward_flushes": flushes,
+                "forward_batch_avg": fwd.messages / flushes if flushes else 0.0,
+                "forward_batch_max": fwd.flush_size_max,
+                "forward_flush_latency_avg_ms": (
+                    fwd.flush_latency_sum / flushes * 1000.0 if flushes else 0.0
+                ),
+                "forward_flush_latency_max_ms": fwd.flush_latency_max * 1000.0,
+                "forward_send_errors": fwd.send_errors,
+            })
+        return result
+
+    def _build_lane_stats(self, lane_stats: List[_LaneStats]) -> Dict[str, Dict[str, Any]]:
+        names = self._queue.lane_names
+        depths = self._queue.lane_depths()
+        ingress = self._queue.get_lane_stats()
+        lanes: Dict[str, Dict[str, Any]] = {}
+        for index, name in enumerate(names):
+            lane = lane_stats[index] if index < len(lane_stats) else _LaneStats()
+            counters = ingress[index] if index < len(ingress) else None
+            lanes[name] = {
+                "depth": depths[index] if index < len(depths) else 0,
+                "processed": lane.processed,
+                "latency_avg_ms": (
+                    lane.latency_sum / lane.processed * 1000.0 if lane.processed else 0.0
+                ),
+                "latency_max_ms": lane.latency_max * 1000.0,
+                "dropped": counters.dropped if counters else 0,
+                "conflated": counters.conflated if counters else 0,
+            }
+        return lanes
+
+    @staticmethod
+    def _build_handler_stats(handlers: Dict[str, _HandlerStats]) -> Dict[str, Dict[str, Any]]:
+        ordered = sorted(handlers.items(), key=lambda item: item[1].total, reverse=True)
+        return {
+            label: {
+                "calls": h.calls,
+                "total_ms": h.total * 1000.0,
+                "avg_ms": h.total / h.calls * 1000.0 if h.calls else 0.0,
+                "max_ms": h.max * 1000.0,
+            }
+            for label, h in ordered
+        }
+
+    def set_handler_budget(self, seconds: float) -> None:
+        """Set the per-call latency budget above which handlers are flagged."""
+        self._handler_budget = max(0.0, float(seconds))
+
+    def get_slow_handlers(self) -> Dict[str, Dict[str, Any]]:
+        """Handlers that exceeded the latency budget (over-budget calls only)."""
+        with self._slow_lock:
+            slow = {label: _HandlerStats(h.calls, h.total, h.max) for label, h in self._slow_handlers.items()}
+        ordered = sorted(slow.items(), key=lambda item: item[1].calls, reverse=True)
+        return {
+            label: {
+                "over_budget": h.calls,
+                "avg_ms": h.total / h.calls * 1000.0 if h.calls else 0.0,
+                "max_ms": h.max * 1000.0,
+            }
+            for label, h in ordered
+        }
+
+    def get_subscriber_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue stats for isolated subscriptions, by handler label."""
+        return {
+            handler_label(path, subscriber): subscriber.get_stats()
+            for (path, _), subscriber in self._isolated_subscribers()
         }
 
+    def _check_budget(self, label: str, elapsed: float) -> None:
+        if elapsed <= self._handler_budget:
+            return
+        with self._slow_lock:
+            slow = self._slow_handlers.get(label)
+            if slow is None:
+                slow = self._slow_handlers[label] = _HandlerStats()
+                logger.warning(
+                    f"Slow OSC handler {label}: {elapsed * 1000.0:.1f} ms "
+                    f"(budget {self._handler_budget * 1000.0:.1f} ms)"
+                )
+            slow.calls += 1
+            slow.total += elapsed
+            if elapsed > slow.max:
+                slow.max = elapsed
+
+    @staticmethod
+    def _build_address_rates(counts: Dict[str, int], elapsed: float) -> Dict[str, float]:
+        if elapsed <= 0:
+            return {}
+        top = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:ADDRESS_RATE_TOP]
+        return {address: count / elapsed for address, count in top}
+
+    def resync(self) -> int:
+        """Replay retained textler/shader/image state to VJUniverse."""
+        return self._textler.resync()
+
+    def set_send_scheduling(
+        self,
+        enabled: bool,
+        rate: float = SEND_RATE,
+        burst: int = SEND_BURST,
+        max_bundle: int = SEND_MAX_BUNDLE,
+        channels: Optional[Sequence[str]] = None,
+    ) -> None:
+        """Enable/disable paced outbound sending for the named channels (default: all)."""
+        for channel in (self._vdj, self._synesthesia, self._textler):
+            if channels is None or channel.name in channels:
+                channel.set_scheduling(enabled, rate, burst, max_bundle)
+
     def get_channel_status(self) -> Dict[str, Dict[str, Any]]:
         """Get status of all channels."""
+        status = self._channel_status()
+        for key, channel in (("vdj", self._vdj), ("synesthesia", self._synesthesia), ("textler", self._textler)):
+            scheduler = channel.scheduler
+            if scheduler is not None:
+                status[key]["scheduler"] = scheduler.get_stats()
+        return status
+
+    def _channel_status(self) -> Dict[str, Dict[str, Any]]:
         return {
             "vdj": {
                 "name": "VirtualDJ",
                 "send_port": VDJ.send_port,
-                "recv_port": RECEIVE_PORT,
+                "recv_port": self._receive_port,
                 "active": self._vdj._target is not None,
             },
             "synesthesia": {
                 "name": "Synesthesia",
                 "send_port": SYNESTHESIA.send_port,
-                "recv_port": RECEIVE_PORT,
+                "recv_port": self._receive_port,
                 "active": self._synesthesia._target is not None,
             },
             "textler": {
@@ -295,21 +816,32 @@ class OSCHub:
         if self._started:
             return True
 
+        batcher = self._forward_batcher
+        if self._raw_mode and batcher is not None and self._raw_send_sock is None:
+            # The send socket was closed by stop(); rebind the batcher to a new one
+            self.set_forward_batching(True, batcher.max_messages, batcher.max_latency)
         self._start_worker()
-        try:
-            with self._server_lock:
-                self._server = liblo.ServerThread(RECEIVE_PORT)
-                self._server.add_method(None, None, self._on_message)
-                self._server.start()
-        except liblo.ServerError as exc:
-            logger.error(f"OSCHub start failed: {exc}")
-            self._server = None
-            self._stop_worker()
-            return False
+        if self._raw_mode:
+            if not self._start_raw_receiver():
+                self._stop_worker()
+                return False
+        else:
+            try:
+                with self._server_lock:
+                    self._server = liblo.ServerThread(self._receive_port)
+                    self._server.add_method(None, None, self._on_message)
+                    self._server.start()
+            except liblo.ServerError as exc:
+                logger.error(f"OSCHub start failed: {exc}")
+                self._server = None
+                self._stop_worker()
+                return False
 
         self._vdj.start()
         self._synesthesia.start()
         self._textler.start()
+        for _, subscriber in self._isolated_subscribers():
+            subscriber.start()
 
         self._started = True
         # Do not register atexit; shutdown can block on some platforms.
@@ -342,7 +874,17 @@ class OSCHub:
             if stop_thread.is_alive():
                 logger.warning("OSCHub stop timed out; continuing shutdown")
 
+        self._stop_raw_receiver()
         self._stop_worker()
+        for _, subscriber in self._isolated_subscribers():
+            subscriber.stop()
+        publisher = self._shm_publisher
+        if publisher is not None and self._worker_thread is None:
+            self._shm_publisher = None
+            publisher.close()
+        if self._raw_send_sock is not None and self._worker_thread is None:
+            self._raw_send_sock.close()
+            self._raw_send_sock = None
         self._started = False
         logger.info("OSCHub stopped")
 
@@ -368,25 +910,76 @@ class OSCHub:
         if channel:
             channel.stop()
 
-    def subscribe(self, path: str, handler: Handler) -> None:
-        """Subscribe a handler to incoming OSC messages."""
+    def subscribe(
+        self,
+        path: str,
+        handler: Handler,
+        isolated: bool = False,
+        policy: str = POLICY_DROP_OLDEST,
+        maxsize: int = SUBSCRIBER_QUEUE_MAXSIZE,
+    ) -> None:
+        """
+        Subscribe a handler to incoming OSC messages.
+
+        isolated=True runs the handler on its own thread behind a bounded
+        queue with the given overflow policy (see osc.subscribers).
+        """
         if not self._started:
             self.start()
-        with self._listeners_lock:
-            handlers = self._listeners.setdefault(path, [])
-            if handler not in handlers:
-                handlers.append(handler)
-            self._refresh_listeners_snapshot()
+        if isolated:
+            key = (path, handler)
+            with self._isolated_lock:
+                if key in self._isolated:
+                    return
+                subscriber = IsolatedSubscriber(
+                    handler,
+                    path,
+                    policy=policy,
+                    maxsize=maxsize,
+                    on_slow=self._check_budget,
+                )
+                self._isolated[key] = subscriber
+            handler = subscriber
+        self._listeners.add(path, handler)
 
     def unsubscribe(self, path: str, handler: Handler) -> None:
         """Unsubscribe a handler from incoming OSC messages."""
-        with self._listeners_lock:
-            handlers = self._listeners.get(path, [])
-            if handler in handlers:
-                handlers.remove(handler)
-                if not handlers:
-                    del self._listeners[path]
-                self._refresh_listeners_snapshot()
+        with self._isolated_lock:
+            subscriber = self._isolated.pop((path, handler), None)
+        if subscriber is not None:
+            self._listeners.remove(path, subscriber)
+            subscriber.stop()
+            return
+        self._listeners.remove(path, handler)
+
+    def subscribe_array(
+        self,
+        path: str,
+        handler: Optional[ArrayHandler] = None,
+        history: int = 0,
+    ) -> Optional[ArraySubscription]:
+        """
+        Subscribe to all-float payloads as read-only float32 NumPy arrays.
+
+        handler(path, array) is optional; with history=N the returned
+        subscription keeps the last N frames per address (see osc.arrays).
+        Returns None if NumPy is not installed.
+        """
+        if not NUMPY_AVAILABLE:
+            logger.error("subscribe_array needs numpy")
+            return None
+        if not self._started:
+            self.start()
+        subscription = ArraySubscription(handler, history)
+        self._array_listeners.add(path, subscription)
+        return subscription
+
+    def unsubscribe_array(self, path: str, subscription: ArraySubscription) -> None:
+        self._array_listeners.remove(path, subscription)
+
+    def _isolated_subscribers(self) -> List[Tuple[Tuple[str, Handler], IsolatedSubscriber]]:
+        with self._isolated_lock:
+            return list(self._isolated.items())
 
     def _on_message(self, path: str, args: list, _types: Any, _src: Any):
         """Internal OSC callback: forward + dispatch to subscribers."""
@@ -394,12 +987,7 @@ class OSCHub:
 
     def _enqueue_message(self, path: str, args: list) -> None:
         timestamp = time.monotonic() if self._stats_enabled else None
-        try:
-            self._queue.put_nowait((path, args, timestamp))
-        except queue.Full:
-            if self._stats_enabled:
-                with self._stats_lock:
-                    self._stats.drops += 1
+        if not self._queue.put_nowait(path, args, timestamp):
             return
         if self._stats_enabled:
             queue_size = self._queue.qsize()
@@ -407,66 +995,159 @@ class OSCHub:
                 if queue_size > self._stats.queue_peak:
                     self._stats.queue_peak = queue_size
 
-    def _forward(self, path: str, args: List[Any]) -> None:
-        """Forward a message to all configured targets."""
+    def _start_raw_receiver(self) -> bool:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RAW_RECV_BUFFER_BYTES)
+            sock.bind(("0.0.0.0", self._receive_port))
+        except OSError as exc:
+            logger.error(f"OSCHub start failed: {exc}")
+            sock.close()
+            return False
+        sock.settimeout(RAW_RECV_TIMEOUT)
+        self._raw_recv_sock = sock
+        self._raw_stop.clear()
+        self._raw_thread = threading.Thread(
+            target=self._raw_receive_loop,
+            args=(sock,),
+            name="OSCHubRawRecv",
+            daemon=True,
+        )
+        self._raw_thread.start()
+        return True
+
+    def _stop_raw_receiver(self) -> None:
+        if not self._raw_thread:
+            return
+        self._raw_stop.set()
+        self._raw_thread.join(timeout=0.5)
+        if self._raw_thread.is_alive():
+            logger.warning("OSCHub raw receiver stop timed out; continuing shutdown")
+        self._raw_thread = None
+        if self._raw_recv_sock:
+            self._raw_recv_sock.close()
+            self._raw_recv_sock = None
+
+    def _raw_receive_loop(self, sock: socket.socket) -> None:
+        while not self._raw_stop.is_set():
+            try:
+                data = sock.recv(RAW_MAX_DATAGRAM)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            path = codec.parse_address(data)
+            if path is None:
+                continue
+            self._enqueue_message(path, data)
+
+    def _get_raw_send_socket(self) -> socket.socket:
+        if self._raw_send_sock is None:
+            self._raw_send_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        return self._raw_send_sock
+
+    def _forward_raw(self, data: bytes, targets: Optional[Tuple[int, ...]] = None) -> None:
+        """Forward original datagram bytes to the routed targets (None = all)."""
+        sock = self._get_raw_send_socket()
+        addrs = self._forward_addrs
+        for target in addrs if targets is None else [addrs[index] for index in targets]:
+            try:
+                sock.sendto(data, target)
+            except OSError as exc:
+                logger.error(f"Forward error to {target}: {exc}")
+
+    def _forward(self, path: str, args: List[Any], targets: Optional[Tuple[int, ...]] = None) -> None:
+        """Forward a message to the routed targets (None = all)."""
         message = liblo.Message(path, *args)
         bundle = liblo.Bundle()
         bundle.add(message)
-        for target in self._forward_targets:
+        forward_targets = self._forward_targets
+        if targets is not None:
+            forward_targets = [forward_targets[index] for index in targets]
+        for target in forward_targets:
             try:
                 liblo.send(target, bundle)
             except Exception as exc:
                 logger.error(f"Forward error to {target}: {exc}")
 
-    def _dispatch(self, path: str, args: List[Any]) -> None:
-        """Dispatch message to subscribed handlers."""
-        snapshot = self._listeners_snapshot
-        matches: List[_PatternEntry] = []
-        if snapshot.any_entries:
-            matches.extend(snapshot.any_entries)
-        exact_entry = snapshot.exact_entries.get(path)
-        if exact_entry:
-            matches.append(exact_entry)
-        matches.extend(snapshot.prefix_trie.match(path))
-        if not matches:
-            return
-        if len(matches) > 1:
-            matches.sort(key=lambda entry: entry.order)
-        # Reuse list args across handlers; treat as read-only.
-        args_list = args if isinstance(args, list) else list(args)
+    def _dispatch(
+        self,
+        path: str,
+        args: List[Any],
+        timings: Optional[List[Tuple[str, float]]] = None,
+    ) -> None:
+        """Dispatch message to subscribed handlers (timing each one if timings is given)."""
+        matches = self._listeners.match(path)
+        if matches:
+            self._call_handlers(matches, path, args, timings)
+
+    def _dispatch_raw(
+        self,
+        data: bytes,
+        timings: Optional[List[Tuple[str, float]]] = None,
+    ) -> None:
+        """Dispatch a raw datagram, decoding args only for matched addresses."""
+        try:
+            for path, start, end in codec.iter_messages(data):
+                matches = self._listeners.match(path)
+                if matches:
+                    args = codec.decode_args(data, start, end)
+                    self._call_handlers(matches, path, args, timings)
+        except (codec.OSCDecodeError, struct.error) as exc:
+            logger.debug(f"Dropping malformed OSC datagram: {exc}")
+
+    def _dispatch_array(
+        self,
+        path: str,
+        args: List[Any],
+        timings: Optional[List[Tuple[str, float]]] = None,
+    ) -> None:
+        """Dispatch an all-float message to array subscribers."""
+        matches = self._array_listeners.match(path)
+        if matches:
+            array = array_from_args(args)
+            if array is not None:
+                self._call_handlers(matches, path, array, timings)
+
+    def _dispatch_array_raw(
+        self,
+        data: bytes,
+        timings: Optional[List[Tuple[str, float]]] = None,
+    ) -> None:
+        """Dispatch all-float messages of a raw datagram as views into its bytes."""
+        try:
+            for path, start, end in codec.iter_messages(data):
+                matches = self._array_listeners.match(path)
+                if matches:
+                    array = array_from_packet(data, start, end)
+                    if array is not None:
+                        self._call_handlers(matches, path, array, timings)
+        except (codec.OSCDecodeError, struct.error, ValueError) as exc:
+            logger.debug(f"Dropping malformed OSC datagram: {exc}")
+
+    def _call_handlers(
+        self,
+        matches: Sequence[PatternEntry],
+        path: str,
+        args: Sequence[Any],
+        timings: Optional[List[Tuple[str, float]]],
+    ) -> None:
+        # Reuse args across handlers (list, or read-only array); treat as read-only.
+        args_list = list(args) if isinstance(args, tuple) else args
+        perf_counter = time.perf_counter
+        budget = self._handler_budget
         for entry in matches:
-            for handler in entry.handlers:
+            for handler, label in zip(entry.handlers, entry.labels):
+                started = perf_counter()
                 try:
                     handler(path, args_list)
                 except Exception as exc:
                     logger.error(f"OSC handler error for {entry.pattern}: {exc}")
-
-    def _refresh_listeners_snapshot(self) -> None:
-        any_entries: List[_PatternEntry] = []
-        exact_entries: Dict[str, _PatternEntry] = {}
-        prefix_trie = _PrefixTrie()
-        total = 0
-        order = 0
-        for pattern, handlers in self._listeners.items():
-            if not handlers:
-                continue
-            entry = _PatternEntry(order=order, pattern=pattern, handlers=tuple(handlers))
-            match_type, match_value = _classify_pattern(pattern)
-            if match_type == _MATCH_ANY:
-                any_entries.append(entry)
-            elif match_type == _MATCH_EXACT:
-                exact_entries[match_value] = entry
-            else:
-                if match_value is not None:
-                    prefix_trie.add(match_value, entry)
-            total += len(handlers)
-            order += 1
-        self._listeners_snapshot = _ListenerSnapshot(
-            tuple(any_entries),
-            exact_entries,
-            prefix_trie,
-        )
-        self._listener_count = total
+                elapsed = perf_counter() - started
+                if timings is not None:
+                    timings.append((label, elapsed))
+                if elapsed > budget:
+                    self._check_budget(label, elapsed)
 
     def _start_worker(self) -> None:
         if self._worker_thread and self._worker_thread.is_alive():
@@ -491,29 +1172,132 @@ class OSCHub:
         self._drain_queue()
 
     def _drain_queue(self) -> None:
-        try:
-            while True:
-                self._queue.get_nowait()
-        except queue.Empty:
-            return
+        self._queue.clear()
 
     def _worker_loop(self) -> None:
+        batcher: Optional[ForwardBatcher] = None
+        publisher: Optional[OSCShmPublisher] = None
         while not self._worker_stop.is_set():
-            try:
-                path, args, timestamp = self._queue.get(timeout=QUEUE_POLL_TIMEOUT)
-            except queue.Empty:
+            if self._pending_routing is not None or self._routing_file is not None:
+                self._poll_routing()
+            current = self._forward_batcher
+            if current is not batcher:
+                if batcher is not None:
+                    batcher.flush()
+                batcher = current
+
+            timeout = QUEUE_POLL_TIMEOUT
+            if batcher is not None:
+                remaining = batcher.time_until_due()
+                if remaining is not None:
+                    timeout = min(timeout, remaining)
+            item = self._queue.get(timeout=timeout)
+            if self._shm_publisher is not publisher:
+                if publisher is not None:
+                    publisher.close()
+                publisher = self._shm_publisher
+            if item is None:
+                if batcher is not None:
+                    batcher.flush()
                 continue
-            self._forward(path, args)
-            if self._listener_count:
-                self._dispatch(path, args)
-            if self._stats_enabled and timestamp is not None:
-                delay = time.monotonic() - timestamp
-                with self._stats_lock:
-                    self._stats.processed += 1
-                    self._stats.latency_sum += delay
-                    self._stats.latency_count += 1
-                    if delay > self._stats.latency_max:
-                        self._stats.latency_max = delay
+            path, args, timestamp, lane = item
+            timed = self._stats_enabled and timestamp is not None
+            dequeued = time.monotonic() if timed else 0.0
+            timings: Optional[List[Tuple[str, float]]] = [] if timed else None
+
+            raw = isinstance(args, bytes)
+            now = time.monotonic()
+            if raw and path == codec.BUNDLE_TAG:
+                targets = None  # raw bundles are relayed whole, unfiltered
+            else:
+                targets = self._routing.select(path, now)
+            if targets is None or targets:
+                if batcher is not None:
+                    if raw:
+                        batcher.add(args, now, targets)
+                    else:
+                        batcher.add(path, args, now, targets)
+                    if batcher.due(now):
+                        batcher.flush(now)
+                elif raw:
+                    self._forward_raw(args, targets)
+                else:
+                    self._forward(path, args, targets)
+            if publisher is not None:
+                if raw:
+                    publisher.publish(args)
+                else:
+                    publisher.publish_message(path, args)
+            if path == RESYNC_ADDRESS or (raw and path == codec.BUNDLE_TAG and _bundle_requests_resync(args)):
+                # Handled here, not as a listener, so an idle hub skips dispatch entirely
+                self.resync()
+            if self._listeners.count:
+                if raw:
+                    self._dispatch_raw(args, timings)
+                else:
+                    self._dispatch(path, args, timings)
+            if self._array_listeners.count:
+                if raw:
+                    self._dispatch_array_raw(args, timings)
+                else:
+                    self._dispatch_array(path, args, timings)
+            if timed:
+                self._record_stats(
+                    path,
+                    lane,
+                    dequeued - timestamp,
+                    time.monotonic() - timestamp,
+                    timings,
+                )
+
+        if batcher is not None:
+            batcher.flush()
+
+    def _record_stats(
+        self,
+        path: str,
+        lane: int,
+        delay: float,
+        end_to_end: float,
+        timings: Optional[List[Tuple[str, float]]],
+    ) -> None:
+        with self._stats_lock:
+            stats = self._stats
+            stats.processed += 1
+            stats.latency_sum += delay
+            stats.latency_count += 1
+            if delay > stats.latency_max:
+                stats.latency_max = delay
+            stats.queue_hist.record(delay)
+            stats.dispatch_hist.record(end_to_end)
+
+            lanes = stats.lanes
+            while len(lanes) <= lane:
+                lanes.append(_LaneStats())
+            lane_stats = lanes[lane]
+            lane_stats.processed += 1
+            lane_stats.latency_sum += delay
+            if delay > lane_stats.latency_max:
+                lane_stats.latency_max = delay
+
+            if timings:
+                handlers = stats.handlers
+                for label, elapsed in timings:
+                    handler_stats = handlers.get(label)
+                    if handler_stats is None:
+                        handler_stats = handlers[label] = _HandlerStats()
+                    handler_stats.calls += 1
+                    handler_stats.total += elapsed
+                    if elapsed > handler_stats.max:
+                        handler_stats.max = elapsed
+
+            counts = stats.address_counts
+            if path in counts:
+                counts[path] += 1
+            elif len(counts) < ADDRESS_RATE_MAX:
+                counts[path] = 1
+            else:
+                counts["(other)"] = counts.get("(other)", 0) + 1
 
     @staticmethod
     def _stop_server(server: liblo.ServerThread) -> None:
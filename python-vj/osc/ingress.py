@@ -0,0 +1,330 @@
+"""
+OSC Ingress - Conflating receive queue for the hub
+
+Replaces a plain FIFO with a structure keyed by OSC address:
+- Continuous addresses (levels, FFT, timecode) keep only their newest args.
+  A pending slot keeps its place in line; later values overwrite it in place.
+- Discrete addresses (beats, scene changes, VDJ replies) stay strict FIFO.
+
+Under overload, discrete messages evict the oldest pending continuous slot
+instead of being dropped, so control messages survive while stale frames go.
+
+Messages are routed by address prefix into priority lanes (e.g. beat, control,
+stream). The consumer always drains higher lanes first, so a backlog of FFT
+frames cannot delay /audio/beat/onbeat or VDJ track replies.
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Continuous (latest-value) addresses by default; trailing * = prefix match
+CONTINUOUS_PATTERNS: Tuple[str, ...] = (
+    "/audio/level*",
+    "/audio/fft*",
+    "/audio/timecode*",
+    "/audio/structure*",
+)
+
+# Priority lanes, highest first; unmatched addresses go to the stream lane
+BEAT_LANE_PATTERNS: Tuple[str, ...] = ("/audio/beat*",)
+CONTROL_LANE_PATTERNS: Tuple[str, ...] = (
+    "/vdj/*",
+    "/scenes/*",
+    "/presets/*",
+    "/controls/*",
+    "/textler/*",
+)
+STREAM_LANE = "stream"
+
+_CLASSIFY_CACHE_MAX = 4096
+
+# Entry layout (mutable list to allow in-place conflation):
+# [path, args, timestamp, continuous, live, arrival sequence]
+ENTRY_PATH, ENTRY_ARGS, ENTRY_TS, ENTRY_CONTINUOUS, ENTRY_LIVE, ENTRY_SEQ = range(6)
+
+QueueItem = Tuple[str, Any, Optional[float], int]  # path, args, timestamp, lane index
+
+
+@dataclass(frozen=True)
+class LaneConfig:
+    """Priority lane: addresses matching patterns (exact or trailing '*')."""
+    name: str
+    patterns: Tuple[str, ...]
+    maxsize: int
+
+
+DEFAULT_LANES: Tuple[LaneConfig, ...] = (
+    LaneConfig("beat", BEAT_LANE_PATTERNS, 256),
+    LaneConfig("control", CONTROL_LANE_PATTERNS, 1024),
+)
+
+
+@dataclass
+class IngressStats:
+    """Drop and conflation counters."""
+    conflated: int = 0
+    evicted: int = 0
+    dropped_continuous: int = 0
+    dropped_discrete: int = 0
+
+    @property
+    def dropped(self) -> int:
+        return self.dropped_continuous + self.dropped_discrete
+
+
+class _PatternSet:
+    """Exact paths plus trailing-'*' prefixes."""
+
+    __slots__ = ("_exact", "_prefixes")
+
+    def __init__(self, patterns: Iterable[str]):
+        self._exact = set()
+        prefixes: List[str] = []
+        for pattern in patterns:
+            if pattern.endswith("*"):
+                prefixes.append(pattern[:-1])
+            else:
+                self._exact.add(pattern)
+        self._prefixes = tuple(prefixes)
+
+    def matches(self, path: str) -> bool:
+        return path in self._exact or (bool(self._prefixes) and path.startswith(self._prefixes))
+
+
+class _AddressRouter:
+    """Map an address to (lane index, continuous), memoized per address."""
+
+    __slots__ = ("_lanes", "_default_lane", "_continuous", "_cache")
+
+    def __init__(self, lanes: Iterable[LaneConfig], continuous_patterns: Iterable[str]):
+        self._lanes = tuple(_PatternSet(lane.patterns) for lane in lanes)
+        self._default_lane = len(self._lanes)
+        self._continuous = _PatternSet(continuous_patterns)
+        self._cache: Dict[str, Tuple[int, bool]] = {}
+
+    def route(self, path: str) -> Tuple[int, bool]:
+        result = self._cache.get(path)
+        if result is None:
+            lane_index = self._default_lane
+            for index, patterns in enumerate(self._lanes):
+                if patterns.matches(path):
+                    lane_index = index
+                    break
+            result = (lane_index, self._continuous.matches(path))
+            if len(self._cache) >= _CLASSIFY_CACHE_MAX:
+                self._cache.clear()
+            self._cache[path] = result
+        return result
+
+
+class ConflatingLane:
+    """
+    Single FIFO lane with in-place conflation of continuous addresses (not thread-safe).
+
+    Entries are numbered from sequence on arrival (lanes of one queue share
+    it); a conflated entry keeps its number along with its place.
+    """
+
+    __slots__ = ("maxsize", "_order", "_pending", "_size", "_sequence", "stats")
+
+    def __init__(self, maxsize: int, sequence: Optional[Iterator[int]] = None):
+        self.maxsize = maxsize
+        self._sequence = itertools.count() if sequence is None else sequence
+        self._order: Deque[list] = deque()
+        self._pending: Dict[str, list] = {}
+        self._size = 0
+        self.stats = IngressStats()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put(self, path: str, args: Any, timestamp: Optional[float], continuous: bool) -> bool:
+        if continuous:
+            entry = self._pending.get(path)
+            if entry is not None:
+                entry[ENTRY_ARGS] = args
+                entry[ENTRY_TS] = timestamp
+                self.stats.conflated += 1
+                return True
+            if self._size >= self.maxsize:
+                self.stats.dropped_continuous += 1
+                return False
+            entry = [path, args, timestamp, True, True, next(self._sequence)]
+            self._pending[path] = entry
+        else:
+            if self._size >= self.maxsize and not self._evict_continuous():
+                self.stats.dropped_discrete += 1
+                return False
+            entry = [path, args, timestamp, False, True, next(self._sequence)]
+        self._order.append(entry)
+        self._size += 1
+        return True
+
+    def pop(self) -> Optional[list]:
+        order = self._order
+        while order:
+            entry = order.popleft()
+            if not entry[ENTRY_LIVE]:
+                continue
+            if entry[ENTRY_CONTINUOUS]:
+                del self._pending[entry[ENTRY_PATH]]
+            self._size -= 1
+            return entry
+        return None
+
+    def clear(self) -> None:
+        self._order.clear()
+        self._pending.clear()
+        self._size = 0
+
+    def _evict_continuous(self) -> bool:
+        """Drop the oldest pending continuous slot to make room (lazy removal)."""
+        if not self._pending:
+            return False
+        path = next(iter(self._pending))
+        entry = self._pending.pop(path)
+        entry[ENTRY_LIVE] = False
+        entry[ENTRY_ARGS] = None
+        self._size -= 1
+        self.stats.evicted += 1
+        return True
+
+
+class IngressQueue:
+    """
+    Thread-safe conflating ingress queue with strict-priority lanes.
+
+    Producers call put_nowait() (receive thread); one consumer calls get().
+    Lanes are drained highest first; the last lane ("stream") takes every
+    address that no configured lane matches.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        continuous_patterns: Iterable[str] = CONTINUOUS_PATTERNS,
+        lanes: Iterable[LaneConfig] = DEFAULT_LANES,
+    ):
+        self._stream_maxsize = maxsize
+        self._continuous_patterns = tuple(continuous_patterns)
+        self._cond = threading.Condition(threading.Lock())
+        self._lane_configs: Tuple[LaneConfig, ...] = ()
+        self._lanes: List[ConflatingLane] = []
+        self._sequence = itertools.count()
+        self._router = _AddressRouter((), self._continuous_patterns)
+        self.set_lanes(lanes)
+
+    @property
+    def maxsize(self) -> int:
+        return sum(lane.maxsize for lane in self._lanes)
+
+    @property
+    def lane_names(self) -> List[str]:
+        return [lane.name for lane in self._lane_configs]
+
+    def set_lanes(self, lanes: Iterable[LaneConfig]) -> None:
+        """Replace priority lanes; pending messages are re-routed in order."""
+        configs = tuple(lanes) + (LaneConfig(STREAM_LANE, (), self._stream_maxsize),)
+        router = _AddressRouter(configs[:-1], self._continuous_patterns)
+        with self._cond:
+            pending = []
+            for lane in self._lanes:
+                entry = lane.pop()
+                while entry is not None:
+                    pending.append(entry)
+                    entry = lane.pop()
+            pending.sort(key=lambda entry: entry[ENTRY_SEQ])
+            self._lane_configs = configs
+            self._lanes = [ConflatingLane(config.maxsize, self._sequence) for config in configs]
+            self._router = router
+            for entry in pending:
+                lane_index, continuous = router.route(entry[ENTRY_PATH])
+                self._lanes[lane_index].put(entry[ENTRY_PATH], entry[ENTRY_ARGS], entry[ENTRY_TS], continuous)
+
+    def set_continuous_patterns(self, patterns: Iterable[str]) -> None:
+        """Replace the set of continuous (latest-value) address patterns."""
+        self._continuous_patterns = tuple(patterns)
+        self._router = _AddressRouter(self._lane_configs[:-1], self._continuous_patterns)
+
+    def is_continuous(self, path: str) -> bool:
+        return self._router.route(path)[1]
+
+    def lane_for(self, path: str) -> str:
+        return self._lane_configs[self._router.route(path)[0]].name
+
+    def qsize(self) -> int:
+        return sum(len(lane) for lane in self._lanes)
+
+    def lane_depths(self) -> List[int]:
+        return [len(lane) for lane in self._lanes]
+
+    def put_nowait(self, path: str, args: Any, timestamp: Optional[float] = None) -> bool:
+        """Enqueue a message. Returns False if it was dropped."""
+        with self._cond:
+            lane_index, continuous = self._router.route(path)
+            accepted = self._lanes[lane_index].put(path, args, timestamp, continuous)
+            if accepted:
+                self._cond.notify()
+            return accepted
+
+    def get(self, timeout: Optional[float] = None) -> Optional[QueueItem]:
+        """Dequeue the highest-priority message, waiting up to timeout. Returns None if empty."""
+        with self._cond:
+            item = self._pop()
+            if item is not None or timeout == 0:
+                return item
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while item is None:
+                if deadline is None:
+                    self._cond.wait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    self._cond.wait(remaining)
+                item = self._pop()
+            return item
+
+    def clear(self) -> None:
+        with self._cond:
+            for lane in self._lanes:
+                lane.clear()
+
+    def get_stats(self) -> IngressStats:
+        """Counters summed over all lanes."""
+        total = IngressStats()
+        for stats in self.get_lane_stats():
+            total.conflated += stats.conflated
+            total.evicted += stats.evicted
+            total.dropped_continuous += stats.dropped_continuous
+            total.dropped_discrete += stats.dropped_discrete
+        return total
+
+    def get_lane_stats(self) -> List[IngressStats]:
+        with self._cond:
+            return [
+                IngressStats(
+                    conflated=lane.stats.conflated,
+                    evicted=lane.stats.evicted,
+                    dropped_continuous=lane.stats.dropped_continuous,
+                    dropped_discrete=lane.stats.dropped_discrete,
+                )
+                for lane in self._lanes
+            ]
+
+    def reset_stats(self) -> None:
+        with self._cond:
+            for lane in self._lanes:
+                lane.stats = IngressStats()
+
+    def _pop(self) -> Optional[QueueItem]:
+        for index, lane in enumerate(self._lanes):
+            if lane._size:
+                entry = lane.pop()
+                if entry is not None:
+                    return entry[ENTRY_PATH], entry[ENTRY_ARGS], entry[ENTRY_TS], index
+        return None
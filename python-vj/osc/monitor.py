@@ -3,19 +3,55 @@ OSC Monitor - Aggregated message tracking for UI display
 
 Groups messages by (channel, address), shows only latest value + count.
 Monitoring work is active only while the OSC panel is open.
+
+Recording is allocation-free in steady state:
+- one preallocated mutable slot per address (latest args kept by reference,
+  count, last time); when full, slots are reused oldest-claimed first
+- rates come from a small ring of time-bucketed counters, not per-message
+  timestamps
+- optional 1-in-N sampling (automatic above MONITOR_AUTO_SAMPLE_RATE); sampled
+  counts are scaled by N
+- incoming traffic (hub worker) and outgoing records (sender threads) use
+  separate stores, so the hub path takes no lock
+- prefix counts live in a per-channel prefix tree updated on record; each
+  node keeps its children sorted by count (one bubble step per update), so
+  grouped views walk only the rows they return
+- per-second counts for the busiest addresses go into a fixed NumPy ring
+  (rows x seconds, optional min/max of the first numeric arg); slot counts
+  are folded in when a rate bucket rolls, not per message
+
+snapshot() and the get_* views read the slots without locking: the UI never
+blocks the recorder and may see a slot mid-update (a value from one message
+with the count of the previous one).
 """
 
 import logging
+import math
 import threading
 import time
-from collections import Counter, defaultdict, deque
+from collections import Counter
 from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from .hub import OSCHub, osc
 
-from .hub import osc
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+MONITOR_RATE_WINDOW = 2.0
+MONITOR_RATE_BUCKETS = 8
+MONITOR_AUTO_SAMPLE_RATE = 5000.0  # msg/s per store before 1-in-N sampling kicks in
+MONITOR_MAX_PREFIX_DEPTH = 3
+MONITOR_FILTER_CACHE = 8
+MONITOR_SERIES_ADDRESSES = 32  # rows in the per-second ring (per store)
+MONITOR_SERIES_SECONDS = 180
+
 
 @dataclass
 class AggregatedMessage:
@@ -27,6 +63,385 @@ class AggregatedMessage:
     count: int = 1
 
 
+class _PrefixNode:
+    __slots__ = ("prefix", "lower", "count", "depth", "parent", "children", "order", "rank")
+
+    def __init__(self, prefix: str, depth: int, parent: Optional["_PrefixNode"]):
+        self.prefix = prefix
+        self.lower = prefix.lower()
+        self.count = 0
+        self.depth = depth
+        self.parent = parent
+        self.children: Dict[str, "_PrefixNode"] = {}
+        self.order: List["_PrefixNode"] = []  # children, highest count first
+        self.rank = 0  # index in parent.order
+
+
+class _PrefixTree:
+    """
+    Live prefix counts for one channel ("/a", "/a/b", ... up to max_depth).
+
+    Written by one recorder; readers copy child order lists and never lock.
+    Substring filters are cached as sets of included nodes (matches plus
+    their ancestors) and extended as new nodes appear.
+    """
+
+    def __init__(self, max_depth: int = MONITOR_MAX_PREFIX_DEPTH):
+        self.root = _PrefixNode("", 0, None)
+        self._max_depth = max_depth
+        # ((filter text, included nodes), ...); readers replace the tuple, never mutate it
+        self._filters: Tuple[Tuple[str, Set[_PrefixNode]], ...] = ()
+
+    def path(self, address: str) -> Tuple[_PrefixNode, ...]:
+        """Nodes for the prefixes of address, created on first use."""
+        nodes = []
+        node = self.root
+        for part in address.split("/"):
+            if not part:
+                continue
+            if node.depth >= self._max_depth:
+                break
+            child = node.children.get(part)
+            if child is None:
+                child = self._add_child(node, part)
+            nodes.append(child)
+            node = child
+        return tuple(nodes)
+
+    def _add_child(self, parent: _PrefixNode, part: str) -> _PrefixNode:
+        child = _PrefixNode(f"{parent.prefix}/{part}", parent.depth + 1, parent)
+        child.rank = len(parent.order)
+        parent.order.append(child)
+        parent.children[part] = child
+        for match, included in self._filters:
+            if match in child.lower:
+                self._include_branch(included, child)
+        return child
+
+    @staticmethod
+    def _include_branch(included: Set[_PrefixNode], node: _PrefixNode) -> None:
+        while node.depth:
+            included.add(node)
+            node = node.parent
+
+    @staticmethod
+    def add(nodes: Tuple[_PrefixNode, ...], count: int) -> None:
+        """Add count to each node and restore its place among its siblings."""
+        for node in nodes:
+            node.count += count
+            order = node.parent.order
+            rank = node.rank
+            while rank and order[rank - 1].count < node.count:
+                previous = order[rank - 1]
+                order[rank] = previous
+                previous.rank = rank
+                rank -= 1
+            order[rank] = node
+            node.rank = rank
+
+    def _included(self, match: str) -> Set[_PrefixNode]:
+        for text, included in self._filters:
+            if text == match:
+                return included
+        # New filter text: one full walk, then kept current by _add_child.
+        included: Set[_PrefixNode] = set()
+        stack = list(self.root.order)
+        while stack:
+            node = stack.pop()
+            if match in node.lower:
+                self._include_branch(included, node)
+            stack.extend(list(node.order))
+        self._filters = ((match, included),) + self._filters[:MONITOR_FILTER_CACHE - 1]
+        return included
+
+    def grouped(
+        self,
+        filter_text: str = "",
+        max_depth: int = MONITOR_MAX_PREFIX_DEPTH,
+        limit: int = 6,
+        child_limit: int = 5,
+    ) -> List[Tuple[str, int, int]]:
+        """(prefix, count, depth) rows: top children first, depth-first."""
+        match = filter_text.strip().lower()
+        included = self._included(match) if match else None
+        result: List[Tuple[str, int, int]] = []
+
+        def top(node: _PrefixNode, count: int) -> List[_PrefixNode]:
+            if included is None:
+                return node.order[:count]
+            picked = []
+            for child in list(node.order):
+                if child in included:
+                    picked.append(child)
+                    if len(picked) >= count:
+                        break
+            return picked
+
+        def add_branch(node: _PrefixNode, depth: int) -> None:
+            result.append((node.prefix, node.count, depth))
+            if depth < max_depth:
+                for child in top(node, child_limit):
+                    add_branch(child, depth + 1)
+
+        for node in top(self.root, limit):
+            add_branch(node, 1)
+        return result
+
+
+class _Slot:
+    __slots__ = ("channel", "address", "args", "last_time", "count", "prefixes", "folded", "low", "high")
+
+    def __init__(self):
+        self.channel = ""
+        self.address: Optional[str] = None
+        self.args: Sequence[Any] = ()
+        self.last_time = 0.0
+        self.count = 0
+        self.prefixes: Tuple[_PrefixNode, ...] = ()
+        self.folded = 0  # count already written to the rate series
+        self.low: Optional[float] = None  # first numeric arg since the last fold
+        self.high: Optional[float] = None
+
+
+class _RateCounter:
+    """Message counts in fixed time buckets covering the rate window."""
+
+    __slots__ = ("_width", "_counts", "_current")
+
+    def __init__(self, window: float = MONITOR_RATE_WINDOW, buckets: int = MONITOR_RATE_BUCKETS):
+        self._width = window / buckets
+        self._counts = [0] * buckets
+        self._current = 0
+
+    @property
+    def window(self) -> float:
+        return self._width * len(self._counts)
+
+    def add(self, now: float, count: int = 1) -> bool:
+        """Count messages at now. Returns True when a new bucket was started."""
+        bucket = int(now / self._width)
+        rolled = bucket != self._current
+        if rolled:
+            counts = self._counts
+            size = len(counts)
+            steps = bucket - self._current
+            if steps >= size or steps < 0:
+                counts[:] = [0] * size
+            else:
+                for step in range(1, steps + 1):
+                    counts[(self._current + step) % size] = 0
+            self._current = bucket
+        self._counts[bucket % len(self._counts)] += count
+        return rolled
+
+    def rate(self, now: float) -> float:
+        """Messages per second over the window (read-only; safe from other threads)."""
+        counts = self._counts
+        size = len(counts)
+        current = self._current
+        first = max(int(now / self._width), current) - size + 1
+        total = sum(counts[bucket % size] for bucket in range(first, current + 1))
+        return total / self.window
+
+    def clear(self) -> None:
+        self._counts[:] = [0] * len(self._counts)
+
+
+class _RateSeries:
+    """
+    Per-second counts of the busiest addresses in a (rows, seconds) ring.
+
+    Column `second % seconds` holds that second. The recorder folds slot
+    count deltas into the open second whenever a rate bucket rolls (bucket
+    edges fall on whole seconds), so the newest few hundred ms can lag.
+    When all rows are taken, an address replaces the row with the smallest
+    windowed total once its own delta exceeds it.
+    """
+
+    def __init__(self, rows: int, seconds: int, track_values: bool):
+        self.seconds = max(2, int(seconds))
+        rows = max(1, int(rows))
+        self.counts = np.zeros((rows, self.seconds), dtype=np.int32)
+        self.low = np.full((rows, self.seconds), np.nan, dtype=np.float32) if track_values else None
+        self.high = np.full((rows, self.seconds), np.nan, dtype=np.float32) if track_values else None
+        self.keys: List[Optional[Tuple[str, str]]] = [None] * rows
+        self.rows: Dict[Tuple[str, str], int] = {}
+        self.second = -1  # open second (still being filled)
+
+    def fold(self, slots: List[_Slot], second: int) -> None:
+        """Write slot deltas into the open second, then open `second`."""
+        if self.second >= 0:
+            column = self.second % self.seconds
+            totals = None
+            for slot in slots:
+                delta = slot.count - slot.folded
+                if delta <= 0:
+                    continue
+                slot.folded = slot.count
+                key = (slot.channel, slot.address)
+                row = self.rows.get(key)
+                if row is None:
+                    if totals is None:
+                        totals = self.counts.sum(axis=1)
+                    row = self._claim(key, delta, totals)
+                    if row is None:
+                        continue
+                self.counts[row, column] += delta
+                if self.low is not None and slot.low is not None:
+                    low = self.low[row, column]
+                    high = self.high[row, column]
+                    self.low[row, column] = slot.low if math.isnan(low) else min(low, slot.low)
+                    self.high[row, column] = slot.high if math.isnan(high) else max(high, slot.high)
+                slot.low = slot.high = None
+        if second > self.second:
+            self._open(second)
+
+    def _claim(self, key: Tuple[str, str], delta: int, totals: Any) -> Optional[int]:
+        if len(self.rows) < len(self.keys):
+            row = self.keys.index(None)
+        else:
+            row = int(totals.argmin())
+            if totals[row] >= delta:
+                return None
+            del self.rows[self.keys[row]]
+            self.counts[row] = 0
+            if self.low is not None:
+                self.low[row] = np.nan
+                self.high[row] = np.nan
+        totals[row] = delta
+        self.keys[row] = key
+        self.rows[key] = row
+        return row
+
+    def _open(self, second: int) -> None:
+        # Clear columns for the new second and any silent seconds before it.
+        steps = second - self.second if self.second >= 0 else self.seconds
+        columns = np.arange(second - min(steps, self.seconds) + 1, second + 1) % self.seconds
+        self.counts[:, columns] = 0
+        if self.low is not None:
+            self.low[:, columns] = np.nan
+            self.high[:, columns] = np.nan
+        self.second = second
+
+    def series(self, now: float, seconds: int) -> List[Dict[str, Any]]:
+        """Copies of each row for the last `seconds` seconds, oldest first."""
+        seconds = max(1, min(int(seconds), self.seconds))
+        end = int(now)
+        stamps = np.arange(end - seconds + 1, end + 1)
+        columns = stamps % self.seconds
+        # Seconds after the open one had no traffic; older ones left the ring.
+        stale = (stamps > self.second) | (stamps <= self.second - self.seconds)
+        result = []
+        for (channel, address), row in list(self.rows.items()):
+            counts = self.counts[row, columns]
+            counts[stale] = 0
+            entry = {
+                "channel": channel,
+                "address": address,
+                "counts": counts,
+                "total": int(counts.sum()),
+                "peak": int(counts.max()),
+            }
+            if self.low is not None:
+                low = self.low[row, columns]
+                high = self.high[row, columns]
+                low[stale] = np.nan
+                high[stale] = np.nan
+                entry["min"] = low
+                entry["max"] = high
+            result.append(entry)
+        return result
+
+
+class _Store:
+    """Slots and counters for one writer (not thread-safe for concurrent writers)."""
+
+    def __init__(
+        self,
+        max_addresses: int,
+        sample_every: int,
+        auto_sample_rate: Optional[float],
+        series: Optional[_RateSeries] = None,
+    ):
+        self.slots = [_Slot() for _ in range(max(1, max_addresses))]
+        self.index: Dict[str, Dict[str, _Slot]] = {}
+        self.used = 0
+        self.evict = 0
+        self.total = 0
+        self.channel_counts: Counter = Counter()
+        self.trees: Dict[str, _PrefixTree] = {}
+        self.rate = _RateCounter()
+        self.base_sample_every = max(1, int(sample_every))
+        self.sample_every = self.base_sample_every
+        self.auto_sample_rate = auto_sample_rate
+        self.series = series
+        self._skipped = 0
+
+    def record(self, channel: str, address: str, args: Sequence[Any], now: float) -> None:
+        self.total += 1
+        self.channel_counts[channel] += 1
+        if self.rate.add(now):
+            if self.series is not None:
+                self.series.fold(self.live_slots(), int(now))
+            if self.auto_sample_rate:
+                self._update_sampling(now)
+        every = self.sample_every
+        if every > 1:
+            self._skipped += 1
+            if self._skipped < every:
+                return
+            self._skipped = 0
+
+        by_address = self.index.get(channel)
+        if by_address is None:
+            by_address = self.index[channel] = {}
+            self.trees[channel] = _PrefixTree()
+        slot = by_address.get(address)
+        if slot is None:
+            slot = self._claim(channel, address, by_address)
+        slot.args = args
+        slot.last_time = now
+        slot.count += every
+        _PrefixTree.add(slot.prefixes, every)
+        if self.series is not None and self.series.low is not None and args:
+            value = args[0]
+            if type(value) is float or type(value) is int:
+                if slot.low is None:
+                    slot.low = slot.high = value
+                elif value < slot.low:
+                    slot.low = value
+                elif value > slot.high:
+                    slot.high = value
+
+    def _claim(self, channel: str, address: str, by_address: Dict[str, _Slot]) -> _Slot:
+        slots = self.slots
+        if self.used < len(slots):
+            slot = slots[self.used]
+            self.used += 1
+        else:
+            slot = slots[self.evict]
+            self.evict = (self.evict + 1) % len(slots)
+            previous = self.index.get(slot.channel)
+            if previous is not None:
+                previous.pop(slot.address, None)
+        slot.channel = channel
+        slot.address = address
+        slot.count = 0
+        slot.folded = 0
+        slot.low = slot.high = None
+        slot.prefixes = self.trees[channel].path(address)
+        by_address[address] = slot
+        return slot
+
+    def _update_sampling(self, now: float) -> None:
+        rate = self.rate.rate(now)
+        every = math.ceil(rate / self.auto_sample_rate) if rate > self.auto_sample_rate else 1
+        self.sample_every = max(self.base_sample_every, every)
+
+    def live_slots(self) -> List[_Slot]:
+        return self.slots[:self.used]
+
+
 class OSCMonitor:
     """
     Monitor OSC traffic across the hub with aggregation.
@@ -37,33 +452,64 @@ class OSCMonitor:
 
         for msg in monitor.get_aggregated():
             print(f"{msg.channel} {msg.address} = {msg.last_args} (×{msg.count})")
+
+    sample_every=N records only every Nth message into slots and prefix
+    counts; auto_sample_rate raises N automatically under load (None = off).
+    Totals and rates always count every message.
+
+    With NumPy, get_rate_series() returns per-second counts of the busiest
+    `series_addresses` addresses per direction over `series_seconds`;
+    track_values adds per-second min/max of the first numeric argument.
     """
 
-    def __init__(self, max_addresses: int = 100):
+    def __init__(
+        self,
+        max_addresses: int = 100,
+        hub: Optional[OSCHub] = None,
+        sample_every: int = 1,
+        auto_sample_rate: Optional[float] = MONITOR_AUTO_SAMPLE_RATE,
+        series_addresses: int = MONITOR_SERIES_ADDRESSES,
+        series_seconds: int = MONITOR_SERIES_SECONDS,
+        track_values: bool = False,
+    ):
         self._max = max_addresses
-        self._data: Dict[str, AggregatedMessage] = {}
-        self._lock = threading.Lock()
+        self._hub = hub or osc
+        self._sample_every = sample_every
+        self._auto_sample_rate = auto_sample_rate
+        self._series_addresses = series_addresses
+        self._series_seconds = series_seconds
+        self._track_values = track_values
+        self._incoming = self._new_store()
+        self._outgoing = self._new_store()
+        self._outgoing_lock = threading.Lock()
         self._started = False
-        self._msg_count = 0
-        self._total_count = 0
-        self._channel_counts: Counter[str] = Counter()
-        self._prefix_counts: Dict[str, Counter[str]] = defaultdict(Counter)
-        self._recent_timestamps: deque[float] = deque()
-        self._rate_window_sec = 2.0
-        self._max_prefix_depth = 3
 
     @property
     def is_started(self) -> bool:
         return self._started
 
+    @property
+    def sample_every(self) -> int:
+        """Current incoming sampling factor (1 = every message)."""
+        return self._incoming.sample_every
+
+    def set_sampling(self, every: int, auto_sample_rate: Optional[float] = MONITOR_AUTO_SAMPLE_RATE) -> None:
+        """Record 1 in `every` messages (minimum when auto sampling is on)."""
+        self._sample_every = max(1, int(every))
+        self._auto_sample_rate = auto_sample_rate
+        for store in (self._incoming, self._outgoing):
+            store.base_sample_every = self._sample_every
+            store.sample_every = self._sample_every
+            store.auto_sample_rate = auto_sample_rate
+
     def start(self):
         """Subscribe to all incoming OSC messages."""
         if self._started:
             return True
-        if not osc.is_started:
-            osc.start()
-        osc.set_stats_enabled(True)
-        osc.subscribe("/", self._on_incoming)
+        if not self._hub.is_started:
+            self._hub.start()
+        self._hub.set_stats_enabled(True)
+        self._hub.subscribe("/", self._on_incoming)
         self._started = True
         logger.info(f"OSCMonitor started")
         return True
@@ -72,89 +518,69 @@ class OSCMonitor:
         """Unsubscribe from incoming OSC messages."""
         if not self._started:
             return
-        osc.unsubscribe("/", self._on_incoming)
-        osc.set_stats_enabled(False)
+        self._hub.unsubscribe("/", self._on_incoming)
+        self._hub.set_stats_enabled(False)
         self._started = False
 
     def _on_incoming(self, path: str, args: list):
-        self._record("hub", path, args)
+        # Only the hub worker records here, so no lock is needed.
+        self._incoming.record("hub", path, args, time.time())
 
-    def record_outgoing(self, channel: str, address: str, args: list):
-        """Record outgoing message (call from OSCSender)."""
+    def record_outgoing(self, channel: str, address: str, args: Sequence[Any]):
+        """Record outgoing message (call from OSCSender; args are kept, not copied)."""
         if not self._started:
             return
-        self._record(f"→{channel}", address, args)
+        with self._outgoing_lock:
+            self._outgoing.record(f"→{channel}", address, args, time.time())
 
-    def _record(self, channel: str, address: str, args: list):
-        """Record a message, aggregating by channel:address."""
-        now = time.time()
-        if not self._started:
-            return
+    def _new_store(self) -> _Store:
+        series = None
+        if NUMPY_AVAILABLE and self._series_addresses > 0:
+            series = _RateSeries(self._series_addresses, self._series_seconds, self._track_values)
+        return _Store(self._max, self._sample_every, self._auto_sample_rate, series)
 
-        key = f"{channel}:{address}"
-        prefixes = self._build_prefixes(address, self._max_prefix_depth)
-
-        with self._lock:
-            self._msg_count += 1
-            self._total_count += 1
-            self._channel_counts[channel] += 1
-
-            self._recent_timestamps.append(now)
-            cutoff = now - self._rate_window_sec
-            while self._recent_timestamps and self._recent_timestamps[0] < cutoff:
-                self._recent_timestamps.popleft()
-
-            for prefix in prefixes:
-                self._prefix_counts[channel][prefix] += 1
-
-            existing = self._data.get(key)
-            if existing:
-                self._data[key] = AggregatedMessage(
-                    channel=channel,
-                    address=address,
-                    last_args=list(args),
-                    last_time=now,
-                    count=existing.count + 1
-                )
-                return
+    def _stores(self) -> Tuple[_Store, _Store]:
+        return self._incoming, self._outgoing
+
+    def _live_slots(self) -> List[_Slot]:
+        return [slot for store in self._stores() for slot in store.live_slots() if slot.address is not None]
 
-            if len(self._data) >= self._max:
-                try:
-                    first_key = next(iter(self._data))
-                    del self._data[first_key]
-                except StopIteration:
-                    pass
-
-            self._data[key] = AggregatedMessage(
-                channel=channel,
-                address=address,
-                last_args=list(args),
-                last_time=now,
-                count=1
-            )
+    @staticmethod
+    def _to_message(slot: _Slot) -> AggregatedMessage:
+        return AggregatedMessage(
+            channel=slot.channel,
+            address=slot.address,
+            last_args=list(slot.args),
+            last_time=slot.last_time,
+            count=slot.count,
+        )
+
+    def snapshot(self) -> List[AggregatedMessage]:
+        """Copy of all tracked addresses; never blocks the recorder."""
+        return [self._to_message(slot) for slot in self._live_slots()]
 
     def get_aggregated(self, limit: int = 50) -> List[AggregatedMessage]:
         """Get aggregated messages sorted by recency."""
-        with self._lock:
-            items = list(self._data.values())
-        items.sort(key=lambda m: m.last_time, reverse=True)
-        return items[:limit]
+        slots = sorted(self._live_slots(), key=lambda slot: slot.last_time, reverse=True)
+        return [self._to_message(slot) for slot in slots[:limit]]
 
     def get_stats(self) -> Dict[str, Any]:
         """Get current statistics snapshot."""
-        with self._lock:
-            total = self._total_count
-            unique_addresses = len(self._data)
-            channels = dict(self._channel_counts)
-            rate = len(self._recent_timestamps) / self._rate_window_sec
+        now = time.time()
+        channels: Dict[str, int] = {}
+        for store in self._stores():
+            channels.update(store.channel_counts.copy())
 
         stats = {
-            "total": total,
-            "unique_addresses": unique_addresses,
-            "rate": rate,
+            "total": sum(store.total for store in self._stores()),
+            "unique_addresses": sum(
+                len(by_address) for store in self._stores() for by_address in list(store.index.values())
+            ),
+            "rate": sum(store.rate.rate(now) for store in self._stores()),
             "channels": channels,
+            "sample_every": self._incoming.sample_every,
         }
-        hub_stats = osc.get_hub_stats()
+        hub_stats = self._hub.get_hub_stats()
         if hub_stats:
             stats["hub"] = hub_stats
         return stats
@@ -166,19 +592,16 @@ class OSCMonitor:
         limit: int = 6,
         child_limit: int = 5,
     ) -> Dict[str, List[Tuple[str, int, int]]]:
-        """Get grouped prefix counts by channel."""
-        with self._lock:
-            snapshot = {ch: dict(counts) for ch, counts in self._prefix_counts.items()}
-
+        """Get grouped prefix counts by channel (cost follows the rows returned)."""
         grouped: Dict[str, List[Tuple[str, int, int]]] = {}
-        for channel, counts in snapshot.items():
-            grouped[channel] = self._build_grouped_prefixes(
-                counts,
-                filter_text=filter_text,
-                max_depth=max_depth,
-                limit=limit,
-                child_limit=child_limit,
-            )
+        for store in self._stores():
+            for channel, tree in list(store.trees.items()):
+                grouped[channel] = tree.grouped(
+                    filter_text=filter_text,
+                    max_depth=max_depth,
+                    limit=limit,
+                    child_limit=child_limit,
+                )
         return grouped
 
     def get_grouped_messages(
@@ -187,94 +610,45 @@ class OSCMonitor:
         limit_per_channel: int = 8,
     ) -> Dict[str, List[AggregatedMessage]]:
         """Get aggregated messages grouped by channel."""
-        with self._lock:
-            items = list(self._data.values())
-
         match = filter_text.strip().lower()
-        grouped: Dict[str, List[AggregatedMessage]] = defaultdict(list)
-        for msg in items:
-            if match and match not in msg.address.lower():
+        grouped: Dict[str, List[_Slot]] = {}
+        for slot in self._live_slots():
+            if match and match not in slot.address.lower():
                 continue
-            grouped[msg.channel].append(msg)
+            grouped.setdefault(slot.channel, []).append(slot)
+
+        return {
+            channel: [
+                self._to_message(slot)
+                for slot in sorted(slots, key=lambda slot: slot.last_time, reverse=True)[:limit_per_channel]
+            ]
+            for channel, slots in grouped.items()
+        }
 
-        for channel in grouped:
-            grouped[channel].sort(key=lambda m: m.last_time, reverse=True)
-            grouped[channel] = grouped[channel][:limit_per_channel]
+    def get_rate_series(self, limit: int = 8, seconds: int = 60) -> List[Dict[str, Any]]:
+        """
+        Per-second message counts of the busiest addresses, busiest first.
 
-        return dict(grouped)
+        Each entry has channel, address, counts (int32 array of `seconds`
+        values, oldest first, ending at the current second), total and peak;
+        min/max float32 arrays (NaN for seconds without values) are added
+        when track_values is on. Empty without NumPy.
+        """
+        now = time.time()
+        entries = [
+            entry
+            for store in self._stores()
+            if store.series is not None
+            for entry in store.series.series(now, seconds)
+        ]
+        entries.sort(key=lambda entry: entry["total"], reverse=True)
+        return entries[:limit]
 
     def clear(self):
         """Clear all tracked messages."""
-        with self._lock:
-            self._data.clear()
-            self._msg_count = 0
-            self._total_count = 0
-            self._channel_counts.clear()
-            self._prefix_counts.clear()
-            self._recent_timestamps.clear()
-
-    @staticmethod
-    def _build_prefixes(address: str, max_depth: int) -> List[str]:
-        parts = [part for part in address.split("/") if part]
-        prefixes = []
-        for idx in range(min(len(parts), max_depth)):
-            prefixes.append("/" + "/".join(parts[: idx + 1]))
-        return prefixes
-
-    @staticmethod
-    def _build_grouped_prefixes(
-        counts: Dict[str, int],
-        filter_text: str = "",
-        max_depth: int = 3,
-        limit: int = 6,
-        child_limit: int = 5,
-    ) -> List[Tuple[str, int, int]]:
-        match = filter_text.strip().lower()
-        prefixes = [p for p in counts.keys() if p.count("/") <= max_depth]
-        children: Dict[str, List[str]] = defaultdict(list)
-        for prefix in prefixes:
-            if prefix.count("/") <= 1:
-                parent = ""
-            else:
-                parent = prefix.rsplit("/", 1)[0]
-            children[parent].append(prefix)
-
-        include = set(prefixes)
-        if match:
-            include = set()
-            for prefix in prefixes:
-                if match in prefix.lower():
-                    current = prefix
-                    while True:
-                        include.add(current)
-                        if current.count("/") <= 1:
-                            break
-                        current = current.rsplit("/", 1)[0]
-
-        result: List[Tuple[str, int, int]] = []
-
-        def add_branch(prefix: str, depth: int) -> None:
-            if prefix not in include or depth > max_depth:
-                return
-            result.append((prefix, counts.get(prefix, 0), depth))
-            for child in sorted(
-                children.get(prefix, []),
-                key=lambda p: counts.get(p, 0),
-                reverse=True,
-            )[:child_limit]:
-                if child in include:
-                    add_branch(child, depth + 1)
-
-        top_level = sorted(
-            [p for p in children.get("", []) if p in include],
-            key=lambda p: counts.get(p, 0),
-            reverse=True,
-        )[:limit]
-
-        for prefix in top_level:
-            add_branch(prefix, 1)
-
-        return result
+        self._incoming = self._new_store()
+        with self._outgoing_lock:
+            self._outgoing = self._new_store()
 
 
 # Global singleton instance
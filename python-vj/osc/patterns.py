@@ -0,0 +1,362 @@
+"""
+OSC Patterns - Subscriber registry and address matching
+
+Subscription patterns:
+- "/", "*", "" or None: every message
+- "/vdj/*": prefix match (trailing '*' matches any remaining characters)
+- "/audio/beat/onbeat": exact match
+- OSC 1.0 address patterns, matched per '/'-separated segment:
+    "?"      any single character
+    "*"      any run of characters within the segment
+    "[a-z]"  character set / range ("[!0-9]" negates)
+    "{a,b}"  alternatives
+  e.g. "/vdj/deck/*/get_title", "/controls/{meta,global}/*". A trailing '*'
+  keeps the prefix meaning above and may span further segments.
+
+The registry publishes an immutable snapshot on every change, so matching on
+the hot path never takes a lock. Each snapshot memoizes the result per
+concrete address (bounded by MATCH_CACHE_SIZE), so repeated addresses resolve
+with a single dict lookup.
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Pattern, Sequence, Tuple
+
+Handler = Callable[[str, List[Any]], None]
+
+_MATCH_ANY = "any"
+_MATCH_EXACT = "exact"
+_MATCH_PREFIX = "prefix"
+_MATCH_GLOB = "glob"
+
+_GLOB_CHARS = frozenset("?*[]{}")
+
+MATCH_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class PatternEntry:
+    order: int
+    pattern: Optional[str]
+    handlers: Tuple[Handler, ...]
+    labels: Tuple[str, ...] = ()
+
+
+class _PrefixTrieNode:
+    __slots__ = ("children", "entries")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_PrefixTrieNode"] = {}
+        self.entries: List[PatternEntry] = []
+
+
+class _PrefixTrie:
+    __slots__ = ("_root",)
+
+    def __init__(self) -> None:
+        self._root = _PrefixTrieNode()
+
+    def add(self, prefix: str, entry: PatternEntry) -> None:
+        node = self._root
+        for char in prefix:
+            node = node.children.setdefault(char, _PrefixTrieNode())
+        node.entries.append(entry)
+
+    def match(self, path: str) -> List[PatternEntry]:
+        node = self._root
+        matches: List[PatternEntry] = []
+        if node.entries:
+            matches.extend(node.entries)
+        for char in path:
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.entries:
+                matches.extend(node.entries)
+        return matches
+
+
+def _has_glob(text: str) -> bool:
+    return any(char in _GLOB_CHARS for char in text)
+
+
+def _segment_regex(segment: str, tail: bool = False) -> str:
+    """Translate one OSC pattern segment to a regex ('*' stays inside the segment)."""
+    out: List[str] = []
+    index = 0
+    length = len(segment)
+    while index < length:
+        char = segment[index]
+        if char == "*":
+            out.append(".*" if tail and index == length - 1 else "[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            close = segment.find("]", index + 1)
+            if close < 0:
+                out.append(re.escape(char))
+            else:
+                body = segment[index + 1:close]
+                negate = body.startswith("!")
+                if negate:
+                    body = body[1:]
+                body = body.replace("\\", "\\\\").replace("^", "\\^")
+                out.append(f"[{'^/' if negate else ''}{body}]")
+                index = close
+        elif char == "{":
+            close = segment.find("}", index + 1)
+            if close < 0:
+                out.append(re.escape(char))
+            else:
+                options = segment[index + 1:close].split(",")
+                out.append("(?:" + "|".join(re.escape(option) for option in options) + ")")
+                index = close
+        else:
+            out.append(re.escape(char))
+        index += 1
+    return "".join(out)
+
+
+class _SegmentTrieNode:
+    __slots__ = ("literal", "wildcard", "tail", "entries")
+
+    def __init__(self) -> None:
+        self.literal: Dict[str, "_SegmentTrieNode"] = {}
+        self.wildcard: List[Tuple[Pattern[str], "_SegmentTrieNode"]] = []
+        self.tail: List[Tuple[Pattern[str], PatternEntry]] = []
+        self.entries: List[PatternEntry] = []
+
+
+class _SegmentTrie:
+    """OSC address patterns compiled segment by segment (literal segments share nodes)."""
+
+    __slots__ = ("_root", "_wildcards")
+
+    def __init__(self) -> None:
+        self._root = _SegmentTrieNode()
+        self._wildcards: Dict[Tuple[int, str], _SegmentTrieNode] = {}
+
+    def add(self, pattern: str, entry: PatternEntry) -> None:
+        segments = pattern.split("/")
+        node = self._root
+        last = len(segments) - 1
+        for index, segment in enumerate(segments):
+            if index == last and segment.endswith("*"):
+                node.tail.append((re.compile(_segment_regex(segment, tail=True) + r"\Z", re.S), entry))
+                return
+            if not _has_glob(segment):
+                node = node.literal.setdefault(segment, _SegmentTrieNode())
+                continue
+            key = (id(node), segment)
+            child = self._wildcards.get(key)
+            if child is None:
+                child = _SegmentTrieNode()
+                self._wildcards[key] = child
+                node.wildcard.append((re.compile(_segment_regex(segment) + r"\Z"), child))
+            node = child
+        node.entries.append(entry)
+
+    def match(self, path: str) -> List[PatternEntry]:
+        matches: List[PatternEntry] = []
+        self._walk(self._root, path.split("/"), 0, path, 0, matches)
+        return matches
+
+    def _walk(
+        self,
+        node: _SegmentTrieNode,
+        segments: List[str],
+        index: int,
+        path: str,
+        offset: int,
+        matches: List[PatternEntry],
+    ) -> None:
+        if index == len(segments):
+            matches.extend(node.entries)
+            return
+        if node.tail:
+            rest = path[offset:]
+            for regex, entry in node.tail:
+                if regex.match(rest):
+                    matches.append(entry)
+        segment = segments[index]
+        next_offset = offset + len(segment) + 1
+        child = node.literal.get(segment)
+        if child is not None:
+            self._walk(child, segments, index + 1, path, next_offset, matches)
+        for regex, child in node.wildcard:
+            if regex.match(segment):
+                self._walk(child, segments, index + 1, path, next_offset, matches)
+
+
+@dataclass(frozen=True)
+class _ListenerSnapshot:
+    any_entries: Tuple[PatternEntry, ...]
+    exact_entries: Dict[str, PatternEntry]
+    prefix_trie: _PrefixTrie
+    segment_trie: Optional[_SegmentTrie] = None
+    cache: Dict[str, Tuple[PatternEntry, ...]] = field(default_factory=dict)
+
+
+def _classify_pattern(pattern: Optional[str]) -> Tuple[str, Optional[str]]:
+    if pattern in (None, "", "/", "*"):
+        return _MATCH_ANY, None
+    if pattern.endswith("*") and not _has_glob(pattern[:-1]):
+        return _MATCH_PREFIX, pattern[:-1]
+    if _has_glob(pattern):
+        return _MATCH_GLOB, pattern
+    return _MATCH_EXACT, pattern
+
+
+def handler_label(pattern: Optional[str], handler: Any) -> str:
+    """Stats label; wrappers expose handler_name to report the handler they wrap."""
+    name = (
+        getattr(handler, "handler_name", None)
+        or getattr(handler, "__qualname__", None)
+        or type(handler).__name__
+    )
+    return f"{pattern or '/'} → {name}"
+
+
+class PatternMatcher:
+    """
+    Test addresses against a fixed list of subscription patterns.
+
+    Same pattern syntax as subscriptions; results are memoized per address.
+    An empty pattern list matches nothing.
+    """
+
+    def __init__(self, patterns: Sequence[Optional[str]] = ()):
+        self._patterns = tuple(patterns)
+        self._any = False
+        self._exact: set = set()
+        self._prefixes: List[str] = []
+        self._globs: List[Pattern[str]] = []
+        for pattern in self._patterns:
+            match_type, match_value = _classify_pattern(pattern)
+            if match_type == _MATCH_ANY:
+                self._any = True
+            elif match_type == _MATCH_EXACT:
+                self._exact.add(match_value)
+            elif match_type == _MATCH_PREFIX:
+                self._prefixes.append(match_value)
+            else:
+                self._globs.append(re.compile(_segment_regex(match_value, tail=True) + r"\Z", re.S))
+        self._prefix_tuple = tuple(self._prefixes)
+        self._cache: Dict[str, bool] = {}
+
+    @property
+    def patterns(self) -> Tuple[Optional[str], ...]:
+        return self._patterns
+
+    def __bool__(self) -> bool:
+        return bool(self._patterns)
+
+    def matches(self, path: str) -> bool:
+        cached = self._cache.get(path)
+        if cached is not None:
+            return cached
+        result = (
+            self._any
+            or path in self._exact
+            or (bool(self._prefix_tuple) and path.startswith(self._prefix_tuple))
+            or any(regex.match(path) for regex in self._globs)
+        )
+        if len(self._cache) >= MATCH_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[path] = result
+        return result
+
+
+class ListenerRegistry:
+    """Thread-safe pattern → handlers registry with lock-free matching."""
+
+    def __init__(self) -> None:
+        self._listeners: Dict[str, List[Handler]] = {}
+        self._lock = threading.Lock()
+        self._snapshot = _ListenerSnapshot((), {}, _PrefixTrie())
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        """Total number of subscribed handlers."""
+        return self._count
+
+    def add(self, path: str, handler: Handler) -> None:
+        with self._lock:
+            handlers = self._listeners.setdefault(path, [])
+            if handler not in handlers:
+                handlers.append(handler)
+            self._refresh_snapshot()
+
+    def remove(self, path: str, handler: Handler) -> None:
+        with self._lock:
+            handlers = self._listeners.get(path, [])
+            if handler in handlers:
+                handlers.remove(handler)
+                if not handlers:
+                    del self._listeners[path]
+                self._refresh_snapshot()
+
+    def match(self, path: str) -> Tuple[PatternEntry, ...]:
+        """Entries matching path, in subscription order (memoized per address)."""
+        snapshot = self._snapshot
+        cache = snapshot.cache
+        cached = cache.get(path)
+        if cached is not None:
+            return cached
+        matches: List[PatternEntry] = []
+        if snapshot.any_entries:
+            matches.extend(snapshot.any_entries)
+        exact_entry = snapshot.exact_entries.get(path)
+        if exact_entry:
+            matches.append(exact_entry)
+        matches.extend(snapshot.prefix_trie.match(path))
+        if snapshot.segment_trie is not None:
+            matches.extend(snapshot.segment_trie.match(path))
+        if len(matches) > 1:
+            matches.sort(key=lambda entry: entry.order)
+        result = tuple(matches)
+        if len(cache) >= MATCH_CACHE_SIZE:
+            cache.clear()
+        cache[path] = result
+        return result
+
+    def _refresh_snapshot(self) -> None:
+        any_entries: List[PatternEntry] = []
+        exact_entries: Dict[str, PatternEntry] = {}
+        prefix_trie = _PrefixTrie()
+        segment_trie: Optional[_SegmentTrie] = None
+        total = 0
+        order = 0
+        for pattern, handlers in self._listeners.items():
+            if not handlers:
+                continue
+            entry = PatternEntry(
+                order=order,
+                pattern=pattern,
+                handlers=tuple(handlers),
+                labels=tuple(handler_label(pattern, handler) for handler in handlers),
+            )
+            match_type, match_value = _classify_pattern(pattern)
+            if match_type == _MATCH_ANY:
+                any_entries.append(entry)
+            elif match_type == _MATCH_EXACT:
+                exact_entries[match_value] = entry
+            elif match_type == _MATCH_GLOB:
+                if segment_trie is None:
+                    segment_trie = _SegmentTrie()
+                segment_trie.add(match_value, entry)
+            else:
+                if match_value is not None:
+                    prefix_trie.add(match_value, entry)
+            total += len(handlers)
+            order += 1
+        self._snapshot = _ListenerSnapshot(
+            tuple(any_entries),
+            exact_entries,
+            prefix_trie,
+            segment_trie,
+        )
+        self._count = total
@@ -0,0 +1,325 @@
+"""
+OSC Recorder - Capture hub traffic to disk and replay it with original timing
+
+Log format (little-endian, append-only):
+    header:  b"VJOSCLOG" | uint16 version | uint16 flags | float64 unix start time
+    record:  float64 seconds since start | uint32 size | OSC message (size bytes)
+
+Messages are stored as encoded OSC packets (osc.codec), so a replay sends the
+same bytes a live source would. Logs are read back through mmap; only records
+actually consumed are decoded.
+
+The recorder sees what hub subscribers see: continuous addresses may already be
+conflated and priority lanes may reorder messages across lanes.
+
+Usage:
+    recorder = OSCRecorder("show.osclog")
+    recorder.start()            # subscribes to the osc hub
+    ...
+    recorder.stop()
+
+    OSCReplayer("show.osclog", speed=2.0).run()   # 2x speed into port 9999
+
+CLI:
+    python -m osc.recorder record show.osclog --duration 60
+    python -m osc.recorder replay show.osclog --speed 4
+    python -m osc.recorder replay show.osclog --max
+    python -m osc.recorder info show.osclog
+"""
+
+import argparse
+import logging
+import mmap
+import signal
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Iterator, List, Optional, Tuple
+
+from . import codec
+from .hub import RECEIVE_PORT, OSCHub, osc
+
+logger = logging.getLogger(__name__)
+
+LOG_MAGIC = b"VJOSCLOG"
+LOG_VERSION = 1
+
+_HEADER = struct.Struct("<8sHHd")
+_RECORD = struct.Struct("<dI")
+
+
+class OSCLogError(ValueError):
+    """Raised when a file is not a valid OSC log."""
+
+
+@dataclass
+class ReplayStats:
+    """Outcome of a replay run."""
+    sent: int = 0
+    send_errors: int = 0
+    duration: float = 0.0
+    late_max: float = 0.0
+
+
+class OSCRecorder:
+    """Subscribes to the hub and appends every message to a log file."""
+
+    def __init__(self, path: str, hub: Optional[OSCHub] = None, pattern: str = "/"):
+        self._path = path
+        self._hub = hub or osc
+        self._pattern = pattern
+        self._file: Optional[BinaryIO] = None
+        self._lock = threading.Lock()
+        self._start = 0.0
+        self.messages = 0
+        self.bytes_written = 0
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def is_recording(self) -> bool:
+        return self._file is not None
+
+    def start(self) -> bool:
+        """Open the log and subscribe to the hub. Returns True on success."""
+        if self._file is not None:
+            return True
+        try:
+            handle = open(self._path, "wb")
+        except OSError as exc:
+            logger.error(f"Cannot open OSC log {self._path}: {exc}")
+            return False
+        handle.write(_HEADER.pack(LOG_MAGIC, LOG_VERSION, 0, time.time()))
+        self._start = time.monotonic()
+        self.messages = 0
+        self.bytes_written = _HEADER.size
+        self._file = handle
+        self._hub.subscribe(self._pattern, self._on_message)
+        logger.info(f"Recording OSC to {self._path}")
+        return True
+
+    def stop(self) -> None:
+        """Unsubscribe and close the log."""
+        if self._file is None:
+            return
+        self._hub.unsubscribe(self._pattern, self._on_message)
+        with self._lock:
+            handle, self._file = self._file, None
+            handle.close()
+        logger.info(f"Recorded {self.messages} OSC messages to {self._path}")
+
+    def _on_message(self, path: str, args: List[Any]) -> None:
+        self.write(path, args, time.monotonic() - self._start)
+
+    def write(self, path: str, args: List[Any], timestamp: float) -> None:
+        """Append one message at the given offset (seconds since start)."""
+        packet = codec.encode_message(path, args)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(_RECORD.pack(timestamp, len(packet)))
+            self._file.write(packet)
+            self.messages += 1
+            self.bytes_written += _RECORD.size + len(packet)
+
+
+class OSCLogReader:
+    """Read-only mmap view of an OSC log."""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise OSCLogError(f"{path}: empty OSC log")
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise OSCLogError(f"{path}: truncated header")
+        magic, version, _, started = _HEADER.unpack_from(self._map, 0)
+        if magic != LOG_MAGIC or version != LOG_VERSION:
+            self.close()
+            raise OSCLogError(f"{path}: not an OSC log (version {version})")
+        self.started_at = started
+
+    def __enter__(self) -> "OSCLogReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def records(self) -> Iterator[Tuple[float, bytes]]:
+        """Yield (seconds since start, OSC packet bytes). Stops at a torn tail."""
+        data = self._map
+        offset = _HEADER.size
+        size_total = len(data)
+        while offset + _RECORD.size <= size_total:
+            timestamp, size = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            if offset + size > size_total:
+                break
+            yield timestamp, data[offset:offset + size]
+            offset += size
+
+    def messages(self) -> Iterator[Tuple[float, str, List[Any]]]:
+        """Yield (seconds since start, address, args)."""
+        for timestamp, packet in self.records():
+            address, args = codec.decode_message(packet)
+            yield timestamp, address, args
+
+
+class OSCReplayer:
+    """
+    Send a recorded log to a UDP port.
+
+    speed: 1.0 = original timing, N = N times faster, 0 = as fast as possible.
+    """
+
+    def __init__(self, path: str, host: str = "127.0.0.1", port: int = RECEIVE_PORT, speed: float = 1.0):
+        self._path = path
+        self._target = (host, port)
+        self._speed = max(0.0, float(speed))
+        self._stop = threading.Event()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self) -> ReplayStats:
+        """Replay the whole log (blocking). Returns replay stats."""
+        stats = ReplayStats()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        begin = time.perf_counter()
+        try:
+            with OSCLogReader(self._path) as reader:
+                for timestamp, packet in reader.records():
+                    if self._stop.is_set():
+                        break
+                    if self._speed > 0.0:
+                        due = begin + timestamp / self._speed
+                        delay = due - time.perf_counter()
+                        if delay > 0.0:
+                            if self._stop.wait(delay):
+                                break
+                        elif -delay > stats.late_max:
+                            stats.late_max = -delay
+                    try:
+                        sock.sendto(packet, self._target)
+                        stats.sent += 1
+                    except OSError as exc:
+                        stats.send_errors += 1
+                        logger.debug(f"Replay send error: {exc}")
+        finally:
+            sock.close()
+        stats.duration = time.perf_counter() - begin
+        return stats
+
+
+def _print_info(path: str) -> None:
+    count = 0
+    last = 0.0
+    addresses: Counter = Counter()
+    with OSCLogReader(path) as reader:
+        for timestamp, packet in reader.records():
+            count += 1
+            last = timestamp
+            addresses[codec.parse_address(packet)] += 1
+    print(f"{path}: {count} messages over {last:.1f}s")
+    for address, hits in addresses.most_common(20):
+        print(f"  {hits:8d}  {address}")
+
+
+def main():
+    """CLI entry point for recording and replaying OSC traffic."""
+    parser = argparse.ArgumentParser(
+        description="OSC Recorder - record hub traffic and replay it with original timing"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record = sub.add_parser("record", help="Record messages received by the hub")
+    record.add_argument("path", help="Output log file")
+    record.add_argument(
+        "--duration", type=float, default=0.0,
+        help="Stop after this many seconds (default: until Ctrl+C)"
+    )
+    record.add_argument(
+        "--pattern", default="/",
+        help="Subscription pattern to record (default: all)"
+    )
+
+    replay = sub.add_parser("replay", help="Send a log to the hub port")
+    replay.add_argument("path", help="Input log file")
+    replay.add_argument("--host", default="127.0.0.1", help="Target host (default: 127.0.0.1)")
+    replay.add_argument(
+        "--port", type=int, default=RECEIVE_PORT,
+        help=f"Target port (default: {RECEIVE_PORT})"
+    )
+    replay.add_argument("--speed", type=float, default=1.0, help="Playback speed multiplier (default: 1.0)")
+    replay.add_argument("--max", action="store_true", help="Send as fast as possible")
+    replay.add_argument("--loop", type=int, default=1, help="Number of passes (default: 1)")
+
+    info = sub.add_parser("info", help="Summarize a log")
+    info.add_argument("path", help="Input log file")
+
+    args = parser.parse_args()
+
+    if args.command == "info":
+        _print_info(args.path)
+        return
+
+    if args.command == "replay":
+        replayer = OSCReplayer(args.path, args.host, args.port, 0.0 if args.max else args.speed)
+        signal.signal(signal.SIGINT, lambda sig, frame: replayer.stop())
+        for _ in range(max(1, args.loop)):
+            if replayer.stopped:
+                break
+            stats = replayer.run()
+            print(
+                f"Sent {stats.sent} messages in {stats.duration:.2f}s "
+                f"({stats.sent / max(stats.duration, 1e-9):.0f} msg/s, "
+                f"max late {stats.late_max * 1000:.1f}ms)"
+            )
+        return
+
+    if not osc.start():
+        print("Failed to start OSC hub", file=sys.stderr)
+        sys.exit(1)
+    recorder = OSCRecorder(args.path, osc, args.pattern)
+    if not recorder.start():
+        osc.stop()
+        sys.exit(1)
+
+    stop_event = threading.Event()
+    signal.signal(signal.SIGINT, lambda sig, frame: stop_event.set())
+    signal.signal(signal.SIGTERM, lambda sig, frame: stop_event.set())
+    print(f"Recording to {args.path}. Press Ctrl+C to stop.")
+    deadline = time.monotonic() + args.duration if args.duration > 0 else None
+    while not stop_event.is_set():
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        stop_event.wait(0.5)
+        print(f"\rRecorded {recorder.messages} messages", end="", flush=True)
+
+    recorder.stop()
+    osc.stop()
+    print(f"\nSaved {recorder.messages} messages ({recorder.bytes_written} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""
+OSC Relay - Peer hubs on several machines share selected address spaces
+
+A RelayNode runs next to a hub on each machine:
+
+- outbound: messages from the local hub (subscription) and from tapped send
+  channels (e.g. osc.textler driven by TextlerEngine) that match a peer's
+  patterns are batched per peer and sent to the peer's relay port as bundles
+- inbound: bundles from peers are unwrapped and delivered unchanged to the
+  local renderer targets (VJUniverse, Magic); they are never relayed again,
+  so a full mesh cannot loop
+
+Every relay datagram is a bundle whose first element is a link header
+    /relay/seq <node id> <sequence>
+with one sequence counter per link, so receivers can count lost and
+reordered datagrams per peer. A sequence more than RELAY_REORDER_WINDOW
+behind the expected one means the peer restarted: its counter starts over.
+
+Optional float-array compression: messages with at least FLOAT_ARRAY_MIN
+float arguments (FFT frames) travel as
+    /relay/f16 <address> <blob of float16 values>
+and are expanded back to float arguments on arrival (~3 significant digits).
+
+Usage:
+    node = RelayNode("stage-left", peers=[RelayPeer("10.0.0.12", compress=True)],
+                     hub=osc, channels=[osc.textler])
+    node.start()
+"""
+
+import logging
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from . import codec
+from .forwarding import FORWARD_BATCH_MAX_BYTES, FORWARD_BATCH_MAX_MESSAGES, BatcherBase
+from .patterns import PatternMatcher
+
+logger = logging.getLogger(__name__)
+
+RELAY_PORT = 9998
+RELAY_HEADER_ADDRESS = "/relay/seq"
+RELAY_F16_ADDRESS = "/relay/f16"
+RELAY_PATTERNS = ("/textler/*", "/shader/*", "/image/*")
+RELAY_MAX_LATENCY = 0.005
+RELAY_LOCAL_TARGETS: List[Tuple[str, int]] = [("127.0.0.1", 10000), ("127.0.0.1", 11111)]
+RELAY_RECV_TIMEOUT = 0.1
+FLOAT_ARRAY_MIN = 8
+RELAY_MAX_BYTES = FORWARD_BATCH_MAX_BYTES  # per datagram, to peers and to local renderers
+RELAY_REORDER_WINDOW = 64  # datagrams; a larger step back is a peer restart
+
+
+@dataclass(frozen=True)
+class RelayPeer:
+    """A remote relay node and the address space forwarded to it."""
+    host: str
+    port: int = RELAY_PORT
+    patterns: Tuple[str, ...] = RELAY_PATTERNS
+    compress: bool = False
+    name: str = ""
+
+    @property
+    def label(self) -> str:
+        return self.name or f"{self.host}:{self.port}"
+
+
+@dataclass
+class LinkStats:
+    """Inbound counters for one remote node."""
+    datagrams: int = 0
+    messages: int = 0
+    lost: int = 0
+    reordered: int = 0
+    restarts: int = 0
+    next_seq: int = -1
+
+
+def compress_message(address: str, args: Sequence[Any]) -> Optional[bytes]:
+    """Encode a long all-float message as /relay/f16 (None if not applicable)."""
+    if len(args) < FLOAT_ARRAY_MIN or not all(type(arg) is float for arg in args):
+        return None
+    try:
+        blob = struct.pack(f"<{len(args)}e", *args)
+    except (OverflowError, struct.error):
+        return None
+    return codec.encode_message(RELAY_F16_ADDRESS, [address, blob])
+
+
+def expand_message(data: bytes, start: int, end: int) -> bytes:
+    """Turn a /relay/f16 element back into the original float message."""
+    address, blob = codec.decode_args(data, start, end)[:2]
+    values = struct.unpack(f"<{len(blob) // 2}e", blob)
+    return codec.encode_message(address, [float(value) for value in values])
+
+
+class _RelayLink(BatcherBase):
+    """Batches packets for one peer; every flush carries the next link sequence number."""
+
+    def __init__(self, peer: RelayPeer, node_id: str, sock: socket.socket):
+        # Leave room for the link header (sequence numbers grow, so budget the int32 max)
+        header_bytes = 4 + codec.message_size(RELAY_HEADER_ADDRESS, [node_id, 2 ** 31 - 1])
+        super().__init__(FORWARD_BATCH_MAX_MESSAGES, RELAY_MAX_LATENCY, RELAY_MAX_BYTES - header_bytes)
+        self.peer = peer
+        self.matcher = PatternMatcher(peer.patterns)
+        self._node_id = node_id
+        self._sock = sock
+        self._targets = [(peer.host, peer.port)]
+        self._seq = 0
+        self.bytes_sent = 0
+
+    def add(self, packet: bytes, now: Optional[float] = None) -> None:
+        self._append(packet, len(packet), now, None)
+
+    def _send_to(self, indices: Sequence[int], items: List[bytes]) -> None:
+        header = codec.encode_message(RELAY_HEADER_ADDRESS, [self._node_id, self._seq])
+        self._seq += 1
+        packet = codec.encode_bundle([header] + items)
+        try:
+            self._sock.sendto(packet, self._targets[0])
+            self.bytes_sent += len(packet)
+        except OSError as exc:
+            self.stats.send_errors += 1
+            logger.debug(f"Relay send error to {self.peer.label}: {exc}")
+
+
+class RelayNode:
+    """Relay endpoint: batches outbound traffic to peers, delivers inbound traffic locally."""
+
+    def __init__(
+        self,
+        node_id: str,
+        peers: Sequence[RelayPeer] = (),
+        listen_port: int = RELAY_PORT,
+        local_targets: Optional[Sequence[Tuple[str, int]]] = None,
+        hub: Optional[Any] = None,
+        channels: Sequence[Any] = (),
+    ):
+        self._node_id = node_id
+        self._peers = list(peers)
+        self._listen_port = listen_port
+        self._local_targets = list(RELAY_LOCAL_TARGETS if local_targets is None else local_targets)
+        self._hub = hub
+        self._channels = list(channels)
+        self._send_sock: Optional[socket.socket] = None
+        self._recv_sock: Optional[socket.socket] = None
+        self._links: List[_RelayLink] = []
+        self._cond = threading.Condition(threading.Lock())
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._inbound: Dict[str, LinkStats] = {}
+        self._started = False
+
+    @property
+    def node_id(self) -> str:
+        return self._node_id
+
+    @property
+    def is_started(self) -> bool:
+        return self._started
+
+    def start(self) -> bool:
+        """Bind the relay port and start relaying. Returns True on success."""
+        if self._started:
+            return True
+        recv_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            recv_sock.bind(("0.0.0.0", self._listen_port))
+        except OSError as exc:
+            logger.error(f"Relay {self._node_id} start failed: {exc}")
+            recv_sock.close()
+            return False
+        recv_sock.settimeout(RELAY_RECV_TIMEOUT)
+        self._recv_sock = recv_sock
+        self._send_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._links = [_RelayLink(peer, self._node_id, self._send_sock) for peer in self._peers]
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._receive_loop, name="OSCRelayRecv", daemon=True),
+            threading.Thread(target=self._flush_loop, name="OSCRelayFlush", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        if self._hub is not None and self._links:
+            self._hub.subscribe("/", self._on_hub_message)
+        for channel in self._channels:
+            channel.add_tap(self._on_hub_message)
+        self._started = True
+        logger.info(f"Relay {self._node_id} on :{self._listen_port} → {[p.label for p in self._peers]}")
+        return True
+
+    def stop(self) -> None:
+        if not self._started:
+            return
+        if self._hub is not None and self._links:
+            self._hub.unsubscribe("/", self._on_hub_message)
+        for channel in self._channels:
+            channel.remove_tap(self._on_hub_message)
+        self._stop.set()
+        with self._cond:
+            for link in self._links:
+                link.flush()
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=0.5)
+        self._threads = []
+        for sock in (self._recv_sock, self._send_sock):
+            if sock is not None:
+                sock.close()
+        self._recv_sock = None
+        self._send_sock = None
+        self._started = False
+
+    def publish(self, address: str, args: Sequence[Any]) -> None:
+        """Relay a message to every peer whose patterns match the address."""
+        links = [link for link in self._links if link.matcher.matches(address)]
+        if not links:
+            return
+        plain: Optional[bytes] = None
+        packed: Optional[bytes] = None
+        now = time.monotonic()
+        with self._cond:
+            for link in links:
+                if link.peer.compress:
+                    if packed is None:
+                        packed = compress_message(address, args) or b""
+                    if packed:
+                        link.add(packed, now)
+                        continue
+                if plain is None:
+                    plain = codec.encode_message(address, args)
+                link.add(plain, now)
+            self._cond.notify()
+
+    def _on_hub_message(self, path: str, args: List[Any]) -> None:
+        self.publish(path, args)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            outbound = {
+                link.peer.label: {
+                    "datagrams": link.stats.flushes,
+                    "messages": link.stats.messages,
+                    "bytes": link.bytes_sent,
+                    "send_errors": link.stats.send_errors,
+                }
+                for link in self._links
+            }
+            inbound = {
+                node: {
+                    "datagrams": stats.datagrams,
+                    "messages": stats.messages,
+                    "lost": stats.lost,
+                    "reordered": stats.reordered,
+                    "restarts": stats.restarts,
+                }
+                for node, stats in self._inbound.items()
+            }
+        return {"node": self._node_id, "outbound": outbound, "inbound": inbound}
+
+    def _flush_loop(self) -> None:
+        with self._cond:
+            while not self._stop.is_set():
+                timeout = RELAY_RECV_TIMEOUT
+                now = time.monotonic()
+                for link in self._links:
+                    remaining = link.time_until_due(now)
+                    if remaining is None:
+                        continue
+                    if remaining <= 0.0:
+                        link.flush(now)
+                    else:
+                        timeout = min(timeout, remaining)
+                self._cond.wait(timeout)
+
+    def _receive_loop(self) -> None:
+        sock = self._recv_sock
+        send_sock = self._send_sock
+        while not self._stop.is_set():
+            try:
+                data = sock.recv(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            for packet in self._unwrap(data):
+                for target in self._local_targets:
+                    try:
+                        send_sock.sendto(packet, target)
+                    except OSError as exc:
+                        logger.debug(f"Relay delivery error to {target}: {exc}")
+
+    def _unwrap(self, data: bytes) -> List[bytes]:
+        """
+        Check the link header, update link stats and return the local packets.
+
+        Expanded /relay/f16 frames are twice their relayed size, so delivery is
+        re-split into bundles of at most RELAY_MAX_BYTES.
+        """
+        try:
+            elements = list(codec.iter_messages(data))
+            if not elements or elements[0][0] != RELAY_HEADER_ADDRESS:
+                return []
+            _, start, end = elements[0]
+            node, seq = codec.decode_args(data, start, end)[:2]
+            messages = [
+                expand_message(data, start, end) if address == RELAY_F16_ADDRESS else data[start:end]
+                for address, start, end in elements[1:]
+            ]
+        except (codec.OSCDecodeError, struct.error, ValueError) as exc:
+            logger.debug(f"Dropping malformed relay datagram: {exc}")
+            return []
+        with self._cond:
+            stats = self._inbound.get(node)
+            if stats is None:
+                stats = self._inbound[node] = LinkStats()
+            stats.datagrams += 1
+            stats.messages += len(messages)
+            if stats.next_seq < 0 or seq == stats.next_seq:
+                stats.next_seq = seq + 1
+            elif seq > stats.next_seq:
+                stats.lost += seq - stats.next_seq
+                stats.next_seq = seq + 1
+            elif stats.next_seq - seq > RELAY_REORDER_WINDOW:
+                stats.restarts += 1
+                stats.next_seq = seq + 1
+            else:
+                stats.reordered += 1
+                if stats.lost:
+                    stats.lost -= 1
+        return codec.pack_bundles(messages, RELAY_MAX_BYTES)
@@ -0,0 +1,81 @@
+"""
+OSC Retained State - Last-value cache of outgoing state for fast resync
+
+Records what a channel sends to a renderer (VJUniverse) so the full current
+state can be replayed after the renderer restarts, without re-running the
+pipeline:
+
+- last value per address for retained prefixes (/textler/*, /shader/*, /image/*)
+- ordered collections keyed by their first argument (lyric/refrain lines,
+  bulk lyric chunks)
+- "<prefix>/reset" drops everything retained under "<prefix>/" (previous song)
+
+snapshot() returns the live send sequence with superseded messages removed:
+entries are ordered by their latest update, collection items stay in place.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, List, Sequence, Tuple
+
+from .patterns import PatternMatcher
+from .scheduler import RESET_SUFFIX
+
+RETAIN_PATTERNS = ("/textler/*", "/shader/*", "/image/*")
+RETAIN_COLLECTIONS = ("/textler/lyrics/line", "/textler/lyrics/bulk", "/textler/refrain/line")
+RETAIN_EXCLUDE = ("/textler/resync",)
+RETAIN_MAX_ENTRIES = 4096
+
+
+class RetainedState:
+    """Thread-safe retained-state cache for one outgoing channel."""
+
+    def __init__(
+        self,
+        patterns: Sequence[str] = RETAIN_PATTERNS,
+        collections: Sequence[str] = RETAIN_COLLECTIONS,
+        exclude: Sequence[str] = RETAIN_EXCLUDE,
+        max_entries: int = RETAIN_MAX_ENTRIES,
+    ):
+        self._include = PatternMatcher(patterns)
+        self._exclude = PatternMatcher(exclude)
+        self._collections = frozenset(collections)
+        self._max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[Hashable, Tuple[str, Tuple[Any, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, address: str, args: Sequence[Any]) -> bool:
+        """Remember a sent message. Returns False if the address is not retained."""
+        if not self._include.matches(address) or self._exclude.matches(address):
+            return False
+        args = tuple(args)
+        with self._lock:
+            entries = self._entries
+            if address.endswith(RESET_SUFFIX):
+                prefix = address[:-len(RESET_SUFFIX) + 1]
+                for key in [key for key, (path, _) in entries.items() if path.startswith(prefix)]:
+                    del entries[key]
+            if address in self._collections and args:
+                key: Hashable = (address, args[0])
+                if key in entries:
+                    entries[key] = (address, args)
+                    return True
+            else:
+                key = address
+                entries.pop(key, None)
+            entries[key] = (address, args)
+            while len(entries) > self._max_entries:
+                entries.popitem(last=False)
+        return True
+
+    def snapshot(self) -> List[Tuple[str, Tuple[Any, ...]]]:
+        """Retained messages in replay order."""
+        with self._lock:
+            return list(self._entries.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
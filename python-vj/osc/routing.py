@@ -0,0 +1,234 @@
+"""
+OSC Routing - Per-target forward filters and rate decimation for the hub
+
+Each forward target gets a route:
+- include: address patterns to forward (empty = everything)
+- exclude: address patterns never forwarded (checked after include)
+- max_rate: {pattern: hz} per-address rate cap; messages arriving sooner
+  than 1/hz after the last forwarded one for the same address are skipped
+
+Patterns use the subscription syntax from osc.patterns ("/vdj/*",
+"/audio/fft*", "/vdj/deck/?/get_title", ...).
+
+Routing decisions are memoized per address, so the steady-state cost is a
+dict lookup plus one clock comparison per rate-limited target.
+
+Routes can be loaded from JSON and hot-reloaded (RoutingFile polls mtime):
+
+    {
+      "targets": [
+        {"name": "vjuniverse", "host": "127.0.0.1", "port": 10000, "exclude": ["/vdj/*"]},
+        {"name": "magic", "host": "127.0.0.1", "port": 11111,
+         "include": ["/audio/*"], "max_rate": {"/audio/fft*": 30}}
+      ]
+    }
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .patterns import MATCH_CACHE_SIZE, PatternMatcher
+
+logger = logging.getLogger(__name__)
+
+ROUTING_POLL_INTERVAL = 1.0
+
+
+@dataclass(frozen=True)
+class RouteConfig:
+    """Forward filter for one target."""
+    host: str
+    port: int
+    name: str = ""
+    include: Tuple[str, ...] = ()
+    exclude: Tuple[str, ...] = ()
+    max_rate: Tuple[Tuple[str, float], ...] = ()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return (self.host, self.port)
+
+    @property
+    def is_passthrough(self) -> bool:
+        return not (self.include or self.exclude or self.max_rate)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RouteConfig":
+        max_rate = data.get("max_rate") or {}
+        return cls(
+            host=str(data.get("host", "127.0.0.1")),
+            port=int(data["port"]),
+            name=str(data.get("name", "")),
+            include=tuple(data.get("include") or ()),
+            exclude=tuple(data.get("exclude") or ()),
+            max_rate=tuple((str(pattern), float(hz)) for pattern, hz in max_rate.items()),
+        )
+
+
+@dataclass
+class RouteStats:
+    forwarded: int = 0
+    filtered: int = 0
+    decimated: int = 0
+
+
+class _Route:
+    __slots__ = ("config", "include", "exclude", "rate_limits", "last_sent", "stats")
+
+    def __init__(self, config: RouteConfig):
+        self.config = config
+        self.include = PatternMatcher(config.include)
+        self.exclude = PatternMatcher(config.exclude)
+        self.rate_limits = [
+            (PatternMatcher([pattern]), 1.0 / hz) for pattern, hz in config.max_rate if hz > 0
+        ]
+        self.last_sent: Dict[str, float] = {}
+        self.stats = RouteStats()
+
+    def accepts(self, path: str) -> bool:
+        if self.include and not self.include.matches(path):
+            return False
+        return not (self.exclude and self.exclude.matches(path))
+
+    def min_interval(self, path: str) -> float:
+        for matcher, interval in self.rate_limits:
+            if matcher.matches(path):
+                return interval
+        return 0.0
+
+
+class RoutingTable:
+    """
+    Decides which forward targets receive each address.
+
+    select() returns None when every target gets the message (the common,
+    unfiltered case), otherwise a tuple of target indices (possibly empty).
+    Not thread-safe: driven by the hub worker only.
+    """
+
+    def __init__(self, routes: Sequence[RouteConfig]):
+        self._routes = [_Route(config) for config in routes]
+        self._passthrough = all(route.config.is_passthrough for route in self._routes)
+        # path -> ((route index, min interval), ...) for routes accepting the path
+        self._plan: Dict[str, Tuple[Tuple[int, float], ...]] = {}
+
+    @classmethod
+    def from_targets(cls, targets: Sequence[Tuple[str, int]]) -> "RoutingTable":
+        return cls([RouteConfig(host, port) for host, port in targets])
+
+    @property
+    def configs(self) -> List[RouteConfig]:
+        return [route.config for route in self._routes]
+
+    @property
+    def addresses(self) -> List[Tuple[str, int]]:
+        return [route.config.address for route in self._routes]
+
+    @property
+    def passthrough(self) -> bool:
+        return self._passthrough
+
+    def _plan_for(self, path: str) -> Tuple[Tuple[int, float], ...]:
+        plan = self._plan.get(path)
+        if plan is None:
+            plan = tuple(
+                (index, route.min_interval(path))
+                for index, route in enumerate(self._routes)
+                if route.accepts(path)
+            )
+            if len(self._plan) >= MATCH_CACHE_SIZE:
+                self._plan.clear()
+            self._plan[path] = plan
+        return plan
+
+    def select(self, path: str, now: float) -> Optional[Tuple[int, ...]]:
+        """Target indices that should receive path at time now (None = all)."""
+        routes = self._routes
+        if self._passthrough:
+            for route in routes:
+                route.stats.forwarded += 1
+            return None
+        plan = self._plan_for(path)
+        if len(plan) < len(routes):
+            accepted = {index for index, _ in plan}
+            for index, route in enumerate(routes):
+                if index not in accepted:
+                    route.stats.filtered += 1
+        selected: List[int] = []
+        for index, interval in plan:
+            route = routes[index]
+            if interval > 0.0:
+                last = route.last_sent.get(path)
+                if last is not None and now - last < interval:
+                    route.stats.decimated += 1
+                    continue
+                if last is None and len(route.last_sent) >= MATCH_CACHE_SIZE:
+                    route.last_sent.clear()
+                route.last_sent[path] = now
+            route.stats.forwarded += 1
+            selected.append(index)
+        if len(selected) == len(routes):
+            return None
+        return tuple(selected)
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": route.config.name or f"{route.config.host}:{route.config.port}",
+                "forwarded": route.stats.forwarded,
+                "filtered": route.stats.filtered,
+                "decimated": route.stats.decimated,
+            }
+            for route in self._routes
+        ]
+
+    def reset_stats(self) -> None:
+        for route in self._routes:
+            route.stats = RouteStats()
+
+
+def load_routes(path: str) -> List[RouteConfig]:
+    """Parse a routing JSON file (raises OSError/ValueError/KeyError on bad input)."""
+    with open(path) as handle:
+        data = json.load(handle)
+    targets = data.get("targets") if isinstance(data, dict) else data
+    if not isinstance(targets, list):
+        raise ValueError("routing file needs a 'targets' list")
+    return [RouteConfig.from_dict(entry) for entry in targets]
+
+
+class RoutingFile:
+    """Watches a routing JSON file and returns new routes when it changes."""
+
+    def __init__(self, path: str, interval: float = ROUTING_POLL_INTERVAL):
+        self._path = path
+        self._interval = interval
+        self._mtime: Optional[float] = None
+        self._next_check = 0.0
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def poll(self, now: float) -> Optional[List[RouteConfig]]:
+        """Routes if the file changed since the last successful load, else None."""
+        if now < self._next_check:
+            return None
+        self._next_check = now + self._interval
+        try:
+            mtime = os.stat(self._path).st_mtime
+        except OSError:
+            return None
+        if mtime == self._mtime:
+            return None
+        self._mtime = mtime
+        try:
+            routes = load_routes(self._path)
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.error(f"Routing file {self._path} not loaded: {exc}")
+            return None
+        logger.info(f"Loaded {len(routes)} forward routes from {self._path}")
+        return routes
@@ -0,0 +1,345 @@
+"""
+OSC Send Scheduler - Paced, prioritized outbound sending for a channel
+
+Channel.send() normally calls liblo.send() on the caller's thread, so a track
+change that fires hundreds of lyric lines in a loop hits the receiver
+(Processing) in one burst and overflows its UDP buffer. With a scheduler the
+caller only enqueues; one writer thread per channel drains the queue:
+
+- token bucket: at most `rate` messages/s, bursts up to `burst`
+- priority classes: PRIORITY_HIGH (shader load, active line, track) before
+  PRIORITY_NORMAL before PRIORITY_BULK (lyric/refrain lines, metadata);
+  ".../reset" is always high so nothing queued after it can overtake it
+- bundling: up to `max_bundle` ready messages go out as one OSC bundle,
+  kept under `max_bundle_bytes` so bulk chunks never form oversized datagrams
+- coalescing: state-like addresses (active line, position, shader) keep only
+  their newest pending args; an ".../reset" drops pending messages under
+  the same prefix (stale lines of the previous song)
+- timetagged bundles (send_bundle) go out whole in the high lane, behind
+  queued high and bulk messages (a reset and the lyric set they refer to)
+
+Stats: queued, sent, bundles, coalesced, late (waited > late_after), dropped.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+import pyliblo3 as liblo
+
+from .codec import BUNDLE_TAG, bundle_overhead, message_size
+from .patterns import PatternMatcher
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BULK = 2
+PRIORITY_NAMES = ("high", "normal", "bulk")
+
+HIGH_PRIORITY_PATTERNS = (
+    "/shader/load",
+    "/textler/line/active",
+    "/textler/refrain/active",
+    "/textler/track",
+)
+BULK_PRIORITY_PATTERNS = (
+    "/textler/lyrics/line",
+    "/textler/lyrics/bulk",
+    "/textler/refrain/line",
+    "/textler/keywords/*",
+    "/textler/metadata/*",
+    "/textler/categories/*",
+)
+COALESCE_PATTERNS = (
+    "/shader/load",
+    "/textler/line/active",
+    "/textler/refrain/active",
+    "/textler/position*",
+)
+RESET_SUFFIX = "/reset"
+
+SEND_RATE = 1000.0  # messages per second
+SEND_BURST = 64
+SEND_MAX_BUNDLE = 16
+SEND_MAX_BUNDLE_BYTES = 1400  # stay inside one Ethernet-MTU datagram
+SEND_QUEUE_MAXSIZE = 4096
+SEND_LATE_AFTER = 0.05
+
+_ADDRESS, _ARGS, _ENQUEUED, _LIVE = range(4)  # bundle entries: (NTP timetag or None, messages) as args
+
+
+@dataclass
+class SchedulerStats:
+    enqueued: int = 0
+    sent: int = 0
+    bundles: int = 0
+    coalesced: int = 0
+    late: int = 0
+    dropped: int = 0
+    send_errors: int = 0
+    wait_max: float = 0.0
+
+
+class SendScheduler:
+    """Per-channel outbound queue with a dedicated writer thread (started lazily)."""
+
+    def __init__(
+        self,
+        name: str,
+        host: str,
+        port: int,
+        rate: float = SEND_RATE,
+        burst: int = SEND_BURST,
+        max_bundle: int = SEND_MAX_BUNDLE,
+        max_bundle_bytes: int = SEND_MAX_BUNDLE_BYTES,
+        maxsize: int = SEND_QUEUE_MAXSIZE,
+        late_after: float = SEND_LATE_AFTER,
+        high_patterns: Sequence[str] = HIGH_PRIORITY_PATTERNS,
+        bulk_patterns: Sequence[str] = BULK_PRIORITY_PATTERNS,
+        coalesce_patterns: Sequence[str] = COALESCE_PATTERNS,
+    ):
+        self._name = name
+        self._target = liblo.Address(host, port)
+        self._rate = max(1.0, float(rate))
+        self._burst = max(1.0, float(burst))
+        self._max_bundle = max(1, int(max_bundle))
+        self._max_bundle_bytes = int(max_bundle_bytes)
+        self._maxsize = max(1, int(maxsize))
+        self._late_after = late_after
+        self._high = PatternMatcher(high_patterns)
+        self._bulk = PatternMatcher(bulk_patterns)
+        self._coalesce = PatternMatcher(coalesce_patterns)
+
+        self._lanes: List[Deque[list]] = [deque() for _ in PRIORITY_NAMES]
+        self._pending: Dict[str, list] = {}
+        self._size = 0
+        self._inflight = 0
+        self._tokens = self._burst
+        self._refilled = time.monotonic()
+        self._cond = threading.Condition(threading.Lock())
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.stats = SchedulerStats()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def qsize(self) -> int:
+        return self._size
+
+    def priority_for(self, address: str) -> int:
+        if address.endswith(RESET_SUFFIX) or self._high.matches(address):
+            return PRIORITY_HIGH
+        if self._bulk.matches(address):
+            return PRIORITY_BULK
+        return PRIORITY_NORMAL
+
+    def send(self, address: str, args: Sequence[Any], priority: Optional[int] = None) -> bool:
+        """Queue a message. Returns False if the scheduler is closed or full."""
+        if priority is None:
+            priority = self.priority_for(address)
+        coalesce = self._coalesce.matches(address)
+        now = time.monotonic()
+        with self._cond:
+            if self._closed:
+                return False
+            stats = self.stats
+            if address.endswith(RESET_SUFFIX):
+                self._purge_prefix(address[:-len(RESET_SUFFIX) + 1])
+            if coalesce:
+                entry = self._pending.get(address)
+                if entry is not None:
+                    entry[_ARGS] = args
+                    stats.coalesced += 1
+                    return True
+            if self._size >= self._maxsize:
+                stats.dropped += 1
+                return False
+            entry = [address, args, now, True]
+            if coalesce:
+                self._pending[address] = entry
+            self._lanes[priority].append(entry)
+            self._size += 1
+            stats.enqueued += 1
+            self._start_writer()
+        return True
+
+    def send_bundle(self, messages: Sequence[Any], timetag: Optional[float] = None) -> bool:
+        """
+        Queue (address, args) pairs to go out as one bundle (timetag in NTP seconds).
+
+        Queued bulk messages are moved to the high lane ahead of it, so the
+        bundle never overtakes what was queued before it in those classes.
+        Returns False if the scheduler is closed or full.
+        """
+        now = time.monotonic()
+        with self._cond:
+            if self._closed:
+                return False
+            if self._size >= self._maxsize:
+                self.stats.dropped += 1
+                return False
+            high = self._lanes[PRIORITY_HIGH]
+            bulk = self._lanes[PRIORITY_BULK]
+            while bulk:
+                entry = bulk.popleft()
+                if entry[_LIVE]:
+                    high.append(entry)
+            high.append([BUNDLE_TAG, (timetag, tuple(messages)), now, True])
+            self._size += 1
+            self.stats.enqueued += 1
+            self._start_writer()
+        return True
+
+    def _start_writer(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"OSCSend-{self._name}",
+                daemon=True,
+            )
+            self._thread.start()
+        self._cond.notify()
+
+    def flush(self, timeout: float = 1.0) -> bool:
+        """Wait until the queue is empty. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._size or self._inflight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(min(remaining, 0.01))
+        return True
+
+    def close(self, flush: bool = True, timeout: float = 1.0) -> None:
+        """Stop the writer (sending what is queued first when flush is True)."""
+        if flush:
+            self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            for lane in self._lanes:
+                lane.clear()
+            self._pending.clear()
+            self._size = 0
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats
+        with self._cond:
+            depths = {name: sum(1 for entry in lane if entry[_LIVE]) for name, lane in zip(PRIORITY_NAMES, self._lanes)}
+        return {
+            "queued": self._size,
+            "queued_by_priority": depths,
+            "enqueued": stats.enqueued,
+            "sent": stats.sent,
+            "bundles": stats.bundles,
+            "coalesced": stats.coalesced,
+            "late": stats.late,
+            "dropped": stats.dropped,
+            "send_errors": stats.send_errors,
+            "wait_max_ms": stats.wait_max * 1000.0,
+            "rate": self._rate,
+        }
+
+    def _purge_prefix(self, prefix: str) -> None:
+        """Drop queued messages under prefix (superseded by a reset)."""
+        purged = 0
+        for lane in self._lanes:
+            for entry in lane:
+                if entry[_LIVE] and entry[_ADDRESS].startswith(prefix):
+                    entry[_LIVE] = False
+                    self._pending.pop(entry[_ADDRESS], None)
+                    purged += 1
+        self._size -= purged
+        self.stats.coalesced += purged
+
+    def _take(self, limit: int) -> List[list]:
+        batch: List[list] = []
+        size = bundle_overhead(0)
+        for lane in self._lanes:
+            while lane and len(batch) < limit:
+                entry = lane[0]
+                if not entry[_LIVE]:
+                    lane.popleft()
+                    continue
+                if entry[_ADDRESS] == BUNDLE_TAG:  # goes out alone, as built
+                    if not batch:
+                        batch.append(lane.popleft())
+                    limit = len(batch)
+                    break
+                entry_size = 4 + message_size(entry[_ADDRESS], entry[_ARGS])  # size prefix + message
+                if batch and size + entry_size > self._max_bundle_bytes:
+                    limit = len(batch)
+                    break
+                lane.popleft()
+                size += entry_size
+                self._pending.pop(entry[_ADDRESS], None)
+                batch.append(entry)
+            if len(batch) >= limit:
+                break
+        self._size -= len(batch)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._size and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                now = time.monotonic()
+                self._tokens = min(self._burst, self._tokens + (now - self._refilled) * self._rate)
+                self._refilled = now
+                if self._tokens < 1.0:
+                    self._cond.wait((1.0 - self._tokens) / self._rate)
+                    continue
+                batch = self._take(min(int(self._tokens), self._max_bundle))
+                self._tokens -= len(batch)
+                self._inflight = len(batch)
+            if batch:
+                self._send_batch(batch, now)
+            with self._cond:
+                self._inflight = 0
+                self._cond.notify_all()
+
+    def _send_batch(self, batch: List[list], now: float) -> None:
+        stats = self.stats
+        for entry in batch:
+            waited = now - entry[_ENQUEUED]
+            if waited > self._late_after:
+                stats.late += 1
+            if waited > stats.wait_max:
+                stats.wait_max = waited
+        try:
+            if batch[0][_ADDRESS] == BUNDLE_TAG:
+                timetag, messages = batch[0][_ARGS]
+                elements = [liblo.Message(address, *args) for address, args in messages]
+                bundle = liblo.Bundle(*elements) if timetag is None else liblo.Bundle(timetag, *elements)
+                liblo.send(self._target, bundle)
+                stats.bundles += 1
+                stats.sent += len(messages)
+                return
+            if len(batch) == 1:
+                liblo.send(self._target, batch[0][_ADDRESS], *batch[0][_ARGS])
+            else:
+                liblo.send(self._target, liblo.Bundle(*[
+                    liblo.Message(entry[_ADDRESS], *entry[_ARGS]) for entry in batch
+                ]))
+                stats.bundles += 1
+            stats.sent += len(batch)
+        except Exception as exc:
+            stats.send_errors += 1
+            logger.error(f"[{self._name}] Send error: {exc}")
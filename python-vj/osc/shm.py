@@ -0,0 +1,357 @@
+"""
+OSC Shared Memory - Fan-out of hub traffic to co-located Python processes
+
+The hub owns port 9999; other local consumers (launchpad CLI, consoles) read
+the same stream from a shared-memory ring instead of binding a socket or
+asking the hub for per-consumer work. The hub writes each message once;
+readers attach, follow the write index and decode only addresses they
+subscribed to. Readers stamp the header each time they poll; while no reader
+has done so for SHM_READER_TIMEOUT the hub skips publishing entirely.
+
+Layout (little endian):
+    header   "VJOSCSHM" u32 version u32 slots u32 slot_size u32 pad u64 head
+             f64 reader_seen (time.monotonic() of the latest reader poll)
+    slot[i]  u64 stamp  u32 length  u32 pad  payload[slot_size]
+
+Single writer, many readers, no locks:
+- writer: stamp = 0, copy payload, stamp = index + 1, then head = index + 1
+- reader: read stamp, copy payload, re-read stamp; a changed or unexpected
+  stamp means the writer lapped the reader, the message counts as dropped
+
+Payloads are plain OSC messages (raw datagrams in raw hub mode, re-encoded
+otherwise); bundles are split into their messages.
+
+Usage:
+    osc.set_shared_memory(True)                 # hub process (or the
+                                                # osc_shared_memory setting)
+
+    reader = OSCShmReader()                     # any other local process
+    reader.subscribe("/audio/*", on_audio)
+    reader.start()
+"""
+
+import logging
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Optional
+
+from . import codec
+from .patterns import Handler, ListenerRegistry
+
+logger = logging.getLogger(__name__)
+
+SHM_NAME = "vj_osc_hub"
+SHM_SLOTS = 4096
+SHM_SLOT_SIZE = 512
+SHM_POLL_INTERVAL = 0.001
+SHM_READER_TIMEOUT = 1.0  # seconds without a reader poll before publishing pauses
+SHM_VERSION = 2
+
+_MAGIC = b"VJOSCSHM"
+_HEADER = struct.Struct("<8sIIII")
+_HEAD = struct.Struct("<Q")
+_HEAD_OFFSET = 32
+_SEEN = struct.Struct("<d")
+_SEEN_OFFSET = 40
+_HEADER_BYTES = 64
+_STAMP = struct.Struct("<Q")
+_LENGTH = struct.Struct("<I")
+_SLOT_HEADER_BYTES = 16
+
+# Segments created by this process (name -> current publisher); readers here
+# share the writer's tracking and only the current publisher unlinks.
+_OWNED: Dict[str, "OSCShmPublisher"] = {}
+
+
+def _segment_size(slots: int, slot_size: int) -> int:
+    return _HEADER_BYTES + slots * (_SLOT_HEADER_BYTES + slot_size)
+
+
+@dataclass
+class ShmStats:
+    published: int = 0
+    idle: int = 0
+    oversized: int = 0
+    received: int = 0
+    dispatched: int = 0
+    dropped: int = 0
+    errors: int = 0
+
+
+class OSCShmPublisher:
+    """Single-writer side of the ring; driven by the hub worker thread only."""
+
+    def __init__(self, name: str = SHM_NAME, slots: int = SHM_SLOTS, slot_size: int = SHM_SLOT_SIZE):
+        self._slots = max(2, int(slots))
+        self._slot_size = (max(64, int(slot_size)) + 3) & ~3
+        self._stride = _SLOT_HEADER_BYTES + self._slot_size
+        size = _segment_size(self._slots, self._slot_size)
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Left behind by a crashed hub: replace it.
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _OWNED[self._shm.name] = self
+        self._buf = self._shm.buf
+        self._buf[:_HEADER_BYTES] = bytes(_HEADER_BYTES)
+        _HEADER.pack_into(self._buf, 0, _MAGIC, SHM_VERSION, self._slots, self._slot_size, 0)
+        self._index = 0
+        self.stats = ShmStats()
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def has_readers(self) -> bool:
+        """True if a reader polled within SHM_READER_TIMEOUT."""
+        if time.monotonic() - _SEEN.unpack_from(self._buf, _SEEN_OFFSET)[0] < SHM_READER_TIMEOUT:
+            return True
+        self.stats.idle += 1
+        return False
+
+    def publish(self, packet: bytes) -> None:
+        """Publish an OSC message or bundle (bundles are split into messages)."""
+        if not self.has_readers():
+            return
+        if packet[:1] == b"#":
+            try:
+                for _, start, end in codec.iter_messages(packet):
+                    self._write(packet[start:end])
+            except (codec.OSCDecodeError, struct.error):
+                self.stats.errors += 1
+            return
+        self._write(packet)
+
+    def publish_message(self, path: str, args: List[Any]) -> None:
+        """Encode and publish a decoded message (skipped, unencoded, without readers)."""
+        if not self.has_readers():
+            return
+        try:
+            packet = codec.encode_message(path, args)
+        except (TypeError, ValueError, struct.error):
+            self.stats.errors += 1
+            return
+        self._write(packet)
+
+    def _write(self, packet: bytes) -> None:
+        length = len(packet)
+        if length > self._slot_size:
+            self.stats.oversized += 1
+            return
+        buf = self._buf
+        index = self._index
+        offset = _HEADER_BYTES + (index % self._slots) * self._stride
+        _STAMP.pack_into(buf, offset, 0)
+        _LENGTH.pack_into(buf, offset + 8, length)
+        buf[offset + _SLOT_HEADER_BYTES:offset + _SLOT_HEADER_BYTES + length] = packet
+        _STAMP.pack_into(buf, offset, index + 1)
+        self._index = index + 1
+        _HEAD.pack_into(buf, _HEAD_OFFSET, self._index)
+        self.stats.published += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "slots": self._slots,
+            "slot_size": self._slot_size,
+            "published": self.stats.published,
+            "idle": self.stats.idle,
+            "oversized": self.stats.oversized,
+        }
+
+    def close(self) -> None:
+        """Release and remove the segment (attached readers stop receiving)."""
+        self._buf = None
+        owner = _OWNED.get(self._shm.name) is self
+        if owner:
+            del _OWNED[self._shm.name]
+        try:
+            self._shm.close()
+            if owner:
+                self._shm.unlink()
+        except (BufferError, FileNotFoundError) as exc:
+            logger.debug(f"Shared memory close: {exc}")
+
+
+class OSCShmReader:
+    """
+    Reader client with the hub's subscribe API.
+
+    Starts at the current write position (no backlog). Handlers run on the
+    reader thread; poll() can be used instead of start() to drain manually.
+    """
+
+    def __init__(self, name: str = SHM_NAME, poll_interval: float = SHM_POLL_INTERVAL):
+        self._name = name
+        self._poll_interval = poll_interval
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._slots = 0
+        self._slot_size = 0
+        self._stride = 0
+        self._index = 0
+        self._listeners = ListenerRegistry()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = ShmStats()
+
+    @property
+    def is_attached(self) -> bool:
+        return self._shm is not None
+
+    def subscribe(self, path: str, handler: Handler) -> None:
+        self._listeners.add(path, handler)
+
+    def unsubscribe(self, path: str, handler: Handler) -> None:
+        self._listeners.remove(path, handler)
+
+    def attach(self) -> bool:
+        """Attach to the hub's segment. Returns False if no hub is publishing."""
+        if self._shm is not None:
+            return True
+        try:
+            if sys.version_info >= (3, 13):
+                shm = shared_memory.SharedMemory(name=self._name, track=False)
+            else:
+                shm = shared_memory.SharedMemory(name=self._name)
+                if self._name not in _OWNED:
+                    # Readers must not unlink the writer's segment when they exit.
+                    resource_tracker.unregister(shm._name, "shared_memory")
+        except FileNotFoundError:
+            logger.info(f"No OSC shared memory '{self._name}' (is the hub publishing?)")
+            return False
+        magic, version, slots, slot_size, _ = _HEADER.unpack_from(shm.buf, 0)
+        if magic != _MAGIC or version != SHM_VERSION or shm.size < _segment_size(slots, slot_size):
+            logger.error(f"OSC shared memory '{self._name}' has an unknown layout")
+            shm.close()
+            return False
+        self._shm = shm
+        self._slots = slots
+        self._slot_size = slot_size
+        self._stride = _SLOT_HEADER_BYTES + slot_size
+        self._index = _HEAD.unpack_from(shm.buf, _HEAD_OFFSET)[0]
+        _SEEN.pack_into(shm.buf, _SEEN_OFFSET, time.monotonic())
+        return True
+
+    def start(self) -> bool:
+        """Attach and dispatch on a background thread. Returns True on success."""
+        if self._thread is not None:
+            return True
+        if not self.attach():
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="OSCShmReader", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        thread = self._thread
+        if thread is not None:
+            self._stop.set()
+            thread.join(timeout=0.5)
+            self._thread = None
+        shm = self._shm
+        self._shm = None
+        if shm is not None:
+            try:
+                shm.close()
+            except BufferError:
+                pass
+
+    def poll(self) -> int:
+        """Dispatch everything published since the last poll. Returns messages read."""
+        shm = self._shm
+        if shm is None:
+            return 0
+        buf = shm.buf
+        _SEEN.pack_into(buf, _SEEN_OFFSET, time.monotonic())
+        head = _HEAD.unpack_from(buf, _HEAD_OFFSET)[0]
+        index = self._index
+        stats = self.stats
+        if head < index:
+            index = 0  # writer restarted
+        if head - index > self._slots:
+            stats.dropped += head - index - self._slots
+            index = head - self._slots
+        count = 0
+        listeners = self._listeners
+        while index < head:
+            offset = _HEADER_BYTES + (index % self._slots) * self._stride
+            stamp = _STAMP.unpack_from(buf, offset)[0]
+            expected = index + 1
+            index = expected
+            if stamp != expected:
+                stats.dropped += 1
+                continue
+            length = _LENGTH.unpack_from(buf, offset + 8)[0]
+            packet = bytes(buf[offset + _SLOT_HEADER_BYTES:offset + _SLOT_HEADER_BYTES + min(length, self._slot_size)])
+            if _STAMP.unpack_from(buf, offset)[0] != stamp:
+                stats.dropped += 1
+                continue
+            count += 1
+            path = codec.parse_address(packet)
+            matches = listeners.match(path) if path is not None else ()
+            if not matches:
+                continue
+            try:
+                args = codec.decode_args(packet)
+            except (codec.OSCDecodeError, struct.error):
+                stats.errors += 1
+                continue
+            for entry in matches:
+                for handler in entry.handlers:
+                    try:
+                        handler(path, args)
+                    except Exception as exc:
+                        stats.errors += 1
+                        logger.error(f"OSC handler error for {entry.pattern}: {exc}")
+            stats.dispatched += 1
+        self._index = index
+        stats.received += count
+        return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats
+        lag = 0
+        if self._shm is not None:
+            lag = _HEAD.unpack_from(self._shm.buf, _HEAD_OFFSET)[0] - self._index
+        return {
+            "name": self._name,
+            "attached": self.is_attached,
+            "received": stats.received,
+            "dispatched": stats.dispatched,
+            "dropped": stats.dropped,
+            "errors": stats.errors,
+            "lag": max(0, lag),
+        }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if not self.poll():
+                self._stop.wait(self._poll_interval)
+
+
+def open_inbound(hub: Any, name: str = SHM_NAME) -> Optional[Any]:
+    """
+    Start the hub, or follow another process's hub when the port is taken.
+
+    Returns the hub itself, a started OSCShmReader, or None when there is no
+    inbound stream at all. Unless the hub started, its send channels are
+    started anyway so outgoing messages still work.
+    """
+    if hub.start():
+        return hub
+    for channel in (hub.vdj, hub.synesthesia, hub.textler):
+        channel.start()
+    reader = OSCShmReader(name)
+    if not reader.start():
+        logger.warning(f"Port {hub.receive_port} in use and no shared memory '{name}'; no inbound OSC")
+        return None
+    logger.info(f"Port {hub.receive_port} in use; reading hub traffic from shared memory '{name}'")
+    return reader
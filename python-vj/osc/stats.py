@@ -0,0 +1,82 @@
+"""
+OSC Stats - Cheap, fixed-memory latency accounting for the hub
+
+LatencyHistogram buckets samples logarithmically (4 sub-buckets per power of
+two, 1 µs .. ~2 min), so recording is a frexp() plus an index increment and
+memory never grows. Percentiles are accurate to roughly ±10%.
+"""
+
+import math
+from typing import Dict, List
+
+_SUB_BUCKETS = 4
+_MAX_EXPONENT = 28  # 2**27 µs ≈ 134 s
+_BUCKET_COUNT = _MAX_EXPONENT * _SUB_BUCKETS + 1
+
+PERCENTILES = (("p50", 0.50), ("p90", 0.90), ("p99", 0.99), ("p999", 0.999))
+
+
+def _bucket_index(seconds: float) -> int:
+    micros = seconds * 1_000_000.0
+    if micros < 1.0:
+        return 0
+    mantissa, exponent = math.frexp(micros)  # micros = mantissa * 2**exponent, 0.5 <= mantissa < 1
+    if exponent >= _MAX_EXPONENT:
+        return _BUCKET_COUNT - 1
+    sub = int((mantissa - 0.5) * 2.0 * _SUB_BUCKETS)
+    return 1 + (exponent - 1) * _SUB_BUCKETS + sub
+
+
+def _bucket_upper_seconds(index: int) -> float:
+    if index <= 0:
+        return 1e-6
+    exponent, sub = divmod(index - 1, _SUB_BUCKETS)
+    mantissa = 0.5 + (sub + 1) / (2.0 * _SUB_BUCKETS)
+    return math.ldexp(mantissa, exponent + 1) / 1_000_000.0
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with fixed memory."""
+
+    __slots__ = ("_counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self._counts: List[int] = [0] * _BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self._counts[_bucket_index(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def copy(self) -> "LatencyHistogram":
+        clone = LatencyHistogram()
+        clone._counts = list(self._counts)
+        clone.count = self.count
+        clone.total = self.total
+        clone.max = self.max
+        return clone
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound (seconds) of the bucket holding the given fraction."""
+        if not self.count:
+            return 0.0
+        threshold = fraction * self.count
+        running = 0
+        for index, bucket in enumerate(self._counts):
+            running += bucket
+            if bucket and running >= threshold:
+                return min(_bucket_upper_seconds(index), self.max)
+        return self.max
+
+    def summary_ms(self) -> Dict[str, float]:
+        """Percentiles plus avg/max in milliseconds."""
+        summary = {name: self.percentile(fraction) * 1000.0 for name, fraction in PERCENTILES}
+        summary["avg"] = self.total / self.count * 1000.0 if self.count else 0.0
+        summary["max"] = self.max * 1000.0
+        summary["samples"] = self.count
+        return summary
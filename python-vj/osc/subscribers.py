@@ -0,0 +1,193 @@
+"""
+OSC Subscribers - Isolated subscriptions with their own queue and thread
+
+An isolated subscription decouples a handler from the hub worker: the worker
+only enqueues (path, args) and moves on, the handler runs on its own thread.
+A slow or blocking consumer then delays only itself.
+
+Queue policies when the subscriber queue is full:
+- drop_oldest: discard the oldest queued message to make room
+- conflate:    keep one pending message per address (latest args win);
+               new addresses are dropped while full
+- block:       the hub worker waits for room (up to block_timeout, then drops)
+
+Usage:
+    osc.subscribe("/vdj/*", monitor.on_message, isolated=True, policy=POLICY_CONFLATE)
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from .ingress import ENTRY_ARGS, ENTRY_PATH, ConflatingLane
+from .patterns import handler_label
+
+logger = logging.getLogger(__name__)
+
+POLICY_DROP_OLDEST = "drop_oldest"
+POLICY_CONFLATE = "conflate"
+POLICY_BLOCK = "block"
+POLICIES = (POLICY_DROP_OLDEST, POLICY_CONFLATE, POLICY_BLOCK)
+
+SUBSCRIBER_QUEUE_MAXSIZE = 256
+SUBSCRIBER_BLOCK_TIMEOUT = 0.1
+
+SlowCallback = Callable[[str, float], None]
+
+
+@dataclass
+class SubscriberStats:
+    processed: int = 0
+    dropped: int = 0
+    conflated: int = 0
+    blocked: int = 0
+    errors: int = 0
+
+
+class IsolatedSubscriber:
+    """
+    Callable wrapper that queues messages for a handler running on its own thread.
+
+    on_slow(label, seconds) is called from the subscriber thread after every
+    handler call, so the hub can apply its latency budget.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str, List[Any]], None],
+        pattern: Optional[str] = None,
+        policy: str = POLICY_DROP_OLDEST,
+        maxsize: int = SUBSCRIBER_QUEUE_MAXSIZE,
+        block_timeout: float = SUBSCRIBER_BLOCK_TIMEOUT,
+        on_slow: Optional[SlowCallback] = None,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown subscriber policy {policy!r} (expected one of {POLICIES})")
+        self._handler = handler
+        self._pattern = pattern
+        self._policy = policy
+        self._block_timeout = block_timeout
+        self._on_slow = on_slow
+        self._lane = ConflatingLane(max(1, int(maxsize)))
+        self._cond = threading.Condition(threading.Lock())
+        self._stopped = False
+        self.stats = SubscriberStats()
+        self._name = getattr(handler, "__qualname__", None) or type(handler).__name__
+        self._thread: Optional[threading.Thread] = None
+        self._generation = 0  # bumped per start(); an older thread exits when it sees a newer one
+        self.start()
+
+    @property
+    def handler_name(self) -> str:
+        """Name used by handler_label(), so stats show the wrapped handler."""
+        return f"{self._name}[{self._policy}]"
+
+    @property
+    def handler(self) -> Callable[[str, List[Any]], None]:
+        return self._handler
+
+    @property
+    def policy(self) -> str:
+        return self._policy
+
+    @property
+    def depth(self) -> int:
+        return len(self._lane)
+
+    @property
+    def maxsize(self) -> int:
+        return self._lane.maxsize
+
+    def __call__(self, path: str, args: List[Any]) -> None:
+        lane = self._lane
+        with self._cond:
+            if self._stopped:
+                return
+            if self._policy == POLICY_CONFLATE:
+                if not lane.put(path, args, None, True):
+                    self.stats.dropped += 1
+                self.stats.conflated = lane.stats.conflated
+            else:
+                if len(lane) >= lane.maxsize:
+                    if self._policy == POLICY_BLOCK:
+                        self.stats.blocked += 1
+                        if not self._cond.wait_for(
+                            lambda: len(lane) < lane.maxsize or self._stopped,
+                            self._block_timeout,
+                        ) or self._stopped:
+                            self.stats.dropped += 1
+                            return
+                    else:
+                        lane.pop()
+                        self.stats.dropped += 1
+                lane.put(path, args, None, False)
+            self._cond.notify_all()
+
+    def start(self) -> None:
+        """Start (or restart after stop()) the handler thread."""
+        with self._cond:
+            thread = self._thread
+            if thread is not None and thread.is_alive() and not self._stopped:
+                return
+            self._stopped = False
+            self._generation += 1
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(self._generation,),
+                name=f"OSCSub-{self._name}",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 0.5) -> None:
+        with self._cond:
+            self._stopped = True
+            self._lane.clear()
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is not None and threading.current_thread() is not thread:
+            thread.join(timeout=timeout)
+
+    @property
+    def running(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive() and not self._stopped
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats
+        return {
+            "policy": self._policy,
+            "depth": self.depth,
+            "maxsize": self.maxsize,
+            "processed": stats.processed,
+            "dropped": stats.dropped,
+            "conflated": stats.conflated,
+            "blocked": stats.blocked,
+            "errors": stats.errors,
+        }
+
+    def _run(self, generation: int) -> None:
+        lane = self._lane
+        perf_counter = time.perf_counter
+        label = handler_label(self._pattern, self)
+        while True:
+            with self._cond:
+                while not len(lane) and not self._stopped and generation == self._generation:
+                    self._cond.wait()
+                if self._stopped or generation != self._generation:
+                    return
+                entry = lane.pop()
+                self._cond.notify_all()
+            if entry is None:
+                continue
+            started = perf_counter()
+            try:
+                self._handler(entry[ENTRY_PATH], entry[ENTRY_ARGS])
+            except Exception as exc:
+                self.stats.errors += 1
+                logger.error(f"OSC handler error for {self._pattern}: {exc}")
+            self.stats.processed += 1
+            if self._on_slow is not None:
+                self._on_slow(label, perf_counter() - started)
@@ -193,3 +193,11 @@ def requires_internet():
         socket.create_connection(("lrclib.net", 443), timeout=5)
     except (socket.timeout, OSError):
         pytest.skip("No internet connection")
+
+
+@pytest.fixture(autouse=True)
+def isolated_app_data(tmp_path, monkeypatch):
+    """Keep pipeline/categorization caches written by tests out of the source tree."""
+    from infrastructure import Config
+
+    monkeypatch.setattr(Config, "APP_DATA_DIR", tmp_path / "app_data")
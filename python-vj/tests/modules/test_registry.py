@@ -76,12 +76,14 @@ class TestRegistryConfig:
         config = ModuleRegistryConfig(
             playback_source="spotify_applescript",
             skip_images=True,
+            osc_shared_memory=True,
         )
 
         registry = ModuleRegistry(config)
 
         assert registry._config.playback_source == "spotify_applescript"
         assert registry._config.skip_images is True
+        assert registry.osc.config.shared_memory is True
 
         print("\nCustom config accepted")
 
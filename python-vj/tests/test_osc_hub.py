@@ -0,0 +1,1784 @@
+"""
+Unit tests for OSC hub internals (no external services required).
+
+Run with: pytest tests/test_osc_hub.py -v -s
+"""
+import socket
+import time
+
+import pytest
+
+
+def free_udp_port() -> int:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+@pytest.fixture
+def udp_sink():
+    """Local UDP socket standing in for a forward target."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(1.0)
+    yield sock
+    sock.close()
+
+
+class TestForwardBatching:
+    """Test bundle-coalescing forwarding."""
+
+    def test_flushes_one_bundle_at_message_limit(self, udp_sink):
+        """Messages are coalesced into a single bundle once max_messages is reached."""
+        import pyliblo3 as liblo
+        from osc.forwarding import ForwardBatcher
+
+        target = liblo.Address("127.0.0.1", udp_sink.getsockname()[1])
+        batcher = ForwardBatcher([target], max_messages=4, max_latency=10.0)
+
+        for i in range(4):
+            batcher.add(f"/audio/level/{i}", [0.5])
+
+        data, _ = udp_sink.recvfrom(65536)
+        assert data.startswith(b"#bundle\0")
+        for i in range(4):
+            assert f"/audio/level/{i}".encode() in data
+        assert batcher.pending == 0
+        assert batcher.stats.flushes == 1
+        assert batcher.stats.flush_size_max == 4
+
+    def test_due_after_latency_window(self):
+        """A partial batch becomes due once the flush window elapses."""
+        from osc.forwarding import ForwardBatcher
+
+        batcher = ForwardBatcher([], max_messages=100, max_latency=0.004)
+        batcher.add("/audio/fft", [0.1, 0.2], now=10.0)
+
+        assert not batcher.due(now=10.001)
+        assert batcher.due(now=10.005)
+        assert batcher.flush(now=10.005) == 1
+        assert batcher.time_until_due() is None
+
+    def test_splits_bundles_at_byte_limit(self):
+        """Large payloads flush early to keep datagrams under max_bytes."""
+        from osc.forwarding import ForwardBatcher
+
+        batcher = ForwardBatcher([], max_messages=100, max_latency=1.0, max_bytes=256)
+        for _ in range(3):
+            batcher.add("/textler/lyrics/line", [0, 0.0, "x" * 100])
+
+        assert batcher.stats.flushes == 2
+        assert batcher.pending == 1
+
+    def test_default_bundles_fit_one_datagram(self, udp_sink):
+        """Default batches stay under the MTU so oscP5's 1536-byte buffer never truncates them."""
+        from osc import codec
+        from osc.forwarding import RawForwardBatcher
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        batcher = RawForwardBatcher(sock, [udp_sink.getsockname()], max_latency=10.0)
+        packet = codec.encode_message("/textler/lyrics/line", [0, 0.0, "x" * 80])
+        for _ in range(32):
+            batcher.add(packet)
+        batcher.flush()
+        sock.close()
+
+        received = 0
+        while received < 32:
+            data, _ = udp_sink.recvfrom(65536)
+            assert len(data) <= 1400
+            received += sum(1 for _ in codec.iter_messages(data))
+
+
+class TestConflatingIngress:
+    """Test the latest-value conflating ingress queue."""
+
+    def test_continuous_addresses_keep_newest_args_in_place(self):
+        """Repeated continuous frames collapse into one slot holding the newest args."""
+        from osc.ingress import IngressQueue
+
+        q = IngressQueue(16, ["/audio/fft*"], [])
+        q.put_nowait("/audio/fft", [1])
+        q.put_nowait("/audio/beat/onbeat", [1])
+        q.put_nowait("/audio/fft", [2])
+        q.put_nowait("/audio/fft", [3])
+
+        assert q.qsize() == 2
+        assert q.get(timeout=0)[:2] == ("/audio/fft", [3])
+        assert q.get(timeout=0)[:2] == ("/audio/beat/onbeat", [1])
+        assert q.get(timeout=0) is None
+        assert q.get_stats().conflated == 2
+
+    def test_discrete_messages_evict_continuous_when_full(self):
+        """A full queue makes room for control messages by evicting stale frames."""
+        from osc.ingress import IngressQueue
+
+        q = IngressQueue(2, ["/audio/level*"], [])
+        q.put_nowait("/audio/level/bass", [0.1])
+        q.put_nowait("/audio/level/mid", [0.2])
+        assert q.put_nowait("/scenes/next", [])
+
+        items = [q.get(timeout=0)[0], q.get(timeout=0)[0]]
+        assert items == ["/audio/level/mid", "/scenes/next"]
+        stats = q.get_stats()
+        assert stats.evicted == 1
+        assert stats.dropped == 0
+
+    def test_drops_discrete_only_when_no_continuous_to_evict(self):
+        """Discrete messages are dropped (and counted) only when nothing can be evicted."""
+        from osc.ingress import IngressQueue
+
+        q = IngressQueue(1, [], [])
+        assert q.put_nowait("/a", [])
+        assert not q.put_nowait("/b", [])
+        assert q.get_stats().dropped_discrete == 1
+
+
+class TestPriorityLanes:
+    """Test strict-priority ingress lanes."""
+
+    def test_higher_lanes_drain_first(self):
+        """Beat and control messages overtake a backlog of stream traffic."""
+        from osc.ingress import IngressQueue, LaneConfig
+
+        lanes = [
+            LaneConfig("beat", ("/audio/beat*",), 8),
+            LaneConfig("control", ("/vdj/*",), 8),
+        ]
+        q = IngressQueue(16, [], lanes)
+        for i in range(5):
+            q.put_nowait(f"/audio/fft/{i}", [i])
+        q.put_nowait("/vdj/deck/1/get_title", ["Song"])
+        q.put_nowait("/audio/beat/onbeat", [1])
+
+        order = [q.get(timeout=0) for _ in range(3)]
+        assert [(item[0], item[3]) for item in order] == [
+            ("/audio/beat/onbeat", 0),
+            ("/vdj/deck/1/get_title", 1),
+            ("/audio/fft/0", 2),
+        ]
+        assert q.lane_names == ["beat", "control", "stream"]
+
+    def test_set_lanes_reroutes_pending_messages(self):
+        """Reconfiguring lanes keeps queued messages."""
+        from osc.ingress import IngressQueue, LaneConfig
+
+        q = IngressQueue(16, [], [])
+        q.put_nowait("/scenes/next", [], 1.0)
+        q.put_nowait("/audio/level", [0.3], 2.0)
+        q.set_lanes([LaneConfig("control", ("/scenes/*",), 4)])
+
+        assert q.lane_for("/scenes/next") == "control"
+        assert q.get(timeout=0)[3] == 0
+        assert q.get(timeout=0)[0] == "/audio/level"
+
+    def test_set_lanes_keeps_arrival_order_without_timestamps(self):
+        """With stats off (no timestamps), merged lanes still drain in arrival order."""
+        from osc.ingress import IngressQueue, LaneConfig
+
+        q = IngressQueue(16, [], [LaneConfig("control", ("/scenes/*",), 4)])
+        for path in ("/audio/level", "/scenes/next", "/audio/bass", "/scenes/prev"):
+            q.put_nowait(path, [], None)
+        q.set_lanes([])
+
+        assert [q.get(timeout=0)[0] for _ in range(4)] == ["/audio/level", "/scenes/next", "/audio/bass", "/scenes/prev"]
+
+
+class TestLatencyHistogram:
+    """Test fixed-memory latency histograms."""
+
+    def test_percentiles_within_bucket_error(self):
+        """Percentiles land within the log-bucket resolution of the true value."""
+        from osc.stats import LatencyHistogram
+
+        hist = LatencyHistogram()
+        for i in range(1, 1001):
+            hist.record(i / 1_000_000.0 * 100)  # 100 µs .. 100 ms
+
+        summary = hist.summary_ms()
+        assert summary["samples"] == 1000
+        assert 45.0 <= summary["p50"] <= 60.0
+        assert 95.0 <= summary["p99"] <= 100.0
+        assert summary["max"] == 100.0
+
+    def test_empty_histogram_reports_zero(self):
+        """An empty histogram reports zero percentiles."""
+        from osc.stats import LatencyHistogram
+
+        assert LatencyHistogram().summary_ms()["p999"] == 0.0
+
+
+class TestCodec:
+    """Test the raw OSC codec."""
+
+    def test_roundtrip_matches_liblo_encoding(self):
+        """Our encoder and liblo agree on the wire format for common types."""
+        from osc import codec
+
+        data = codec.encode_message("/textler/lyrics/line", [3, 1.5, "hello"])
+        assert codec.parse_address(data) == "/textler/lyrics/line"
+        address, args = codec.decode_message(data)
+        assert address == "/textler/lyrics/line"
+        assert args == [3, 1.5, "hello"]
+
+    def test_iter_messages_walks_bundles(self):
+        """Bundle elements are yielded with offsets so args decode lazily."""
+        from osc import codec
+
+        first = codec.encode_message("/a", [1])
+        second = codec.encode_message("/b", ["x"])
+        bundle = codec.encode_bundle([first, codec.encode_bundle([second])])
+
+        found = [(addr, codec.decode_args(bundle, start, end))
+                 for addr, start, end in codec.iter_messages(bundle)]
+        assert found == [("/a", [1]), ("/b", ["x"])]
+        assert codec.parse_address(bundle) == codec.BUNDLE_TAG
+
+
+class TestRawForwarding:
+    """Test raw datagram forwarding mode."""
+
+    def test_forwards_original_bytes_and_dispatches_lazily(self, udp_sink):
+        """Datagrams are relayed byte-for-byte; only subscribed addresses decode."""
+        from osc import codec
+        from osc.hub import OSCHub
+
+        port = free_udp_port()
+        hub = OSCHub(receive_port=port, forward_targets=[udp_sink.getsockname()])
+        assert hub.set_raw_forwarding(True)
+        received = []
+        hub.subscribe("/vdj/*", lambda addr, args: received.append((addr, args)))
+        try:
+            sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            packet = codec.encode_message("/vdj/deck/1/get_title", ["Song"])
+            sender.sendto(packet, ("127.0.0.1", port))
+            sender.close()
+
+            data, _ = udp_sink.recvfrom(65536)
+            assert data == packet
+            deadline = time.time() + 1.0
+            while not received and time.time() < deadline:
+                time.sleep(0.01)
+            assert received == [("/vdj/deck/1/get_title", ["Song"])]
+        finally:
+            hub.stop()
+
+    def test_stop_closes_send_socket_and_restart_recreates_it(self, udp_sink):
+        """stop() releases the raw send socket; a restarted hub forwards on a fresh one."""
+        from osc import codec
+        from osc.hub import OSCHub
+
+        port = free_udp_port()
+        hub = OSCHub(receive_port=port, forward_targets=[udp_sink.getsockname()])
+        assert hub.set_raw_forwarding(True)
+        hub.set_forward_batching(True, max_messages=1)
+        assert hub.start()
+        first = hub._get_raw_send_socket()
+        hub.stop()
+        assert first.fileno() == -1
+        assert hub._raw_send_sock is None
+
+        assert hub.start()
+        try:
+            sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            packet = codec.encode_message("/vdj/deck/1/play", [1])
+            sender.sendto(packet, ("127.0.0.1", port))
+            sender.close()
+            data, _ = udp_sink.recvfrom(65536)
+            assert data == packet
+        finally:
+            hub.stop()
+
+    def test_cannot_switch_mode_while_running(self):
+        """Raw mode is fixed while the hub is started."""
+        from osc.hub import OSCHub
+
+        hub = OSCHub(receive_port=free_udp_port(), forward_targets=[])
+        assert hub.start()
+        try:
+            assert not hub.set_raw_forwarding(True)
+        finally:
+            hub.stop()
+
+
+class TestAsyncHub:
+    """Test the asyncio-native hub."""
+
+    def test_forwards_and_dispatches_sync_and_async_handlers(self, udp_sink):
+        """Datagrams are relayed unchanged; sync and coroutine handlers both run."""
+        import asyncio
+        from osc import codec
+        from osc.aio import AsyncOSCHub
+
+        async def scenario():
+            port = free_udp_port()
+            hub = AsyncOSCHub(receive_port=port, forward_targets=[udp_sink.getsockname()])
+            assert await hub.start()
+            sync_calls = []
+            async_calls = []
+
+            async def on_deck(addr, args):
+                await asyncio.sleep(0)
+                async_calls.append((addr, args))
+
+            hub.subscribe("/audio/beat/onbeat", lambda addr, args: sync_calls.append(args))
+            hub.subscribe("/vdj/*", on_deck)
+            try:
+                sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                packet = codec.encode_bundle([
+                    codec.encode_message("/audio/beat/onbeat", [1]),
+                    codec.encode_message("/vdj/deck/1/play", [1.0]),
+                ])
+                sender.sendto(packet, ("127.0.0.1", port))
+                sender.close()
+                for _ in range(100):
+                    if sync_calls and async_calls:
+                        break
+                    await asyncio.sleep(0.01)
+            finally:
+                hub.stop()
+            return sync_calls, async_calls, hub.get_hub_stats()
+
+        sync_calls, async_calls, stats = asyncio.run(scenario())
+        assert sync_calls == [[1]]
+        assert async_calls == [("/vdj/deck/1/play", [1.0])]
+        assert stats["received"] == 1
+        assert stats["forwarded"] == 1
+        data, _ = udp_sink.recvfrom(65536)
+        assert codec.parse_address(data) == codec.BUNDLE_TAG
+
+    def test_awaitable_results_are_scheduled_and_unsubscribe_sticks(self):
+        """partial() of a coroutine and async __call__ objects run; unsubscribed ones do not."""
+        import asyncio
+        import functools
+        from osc import codec
+        from osc.aio import AsyncOSCHub
+
+        calls = []
+
+        async def tagged(tag, addr, args):
+            calls.append((tag, args))
+
+        class Handler:
+            async def __call__(self, addr, args):
+                calls.append(("object", args))
+
+        async def scenario():
+            port = free_udp_port()
+            hub = AsyncOSCHub(receive_port=port, forward_targets=[])
+            assert await hub.start()
+            partial = functools.partial(tagged, "partial")
+            removed = functools.partial(tagged, "removed")
+            hub.subscribe("/vdj/*", partial)
+            hub.subscribe("/vdj/*", Handler())
+            hub.subscribe("/vdj/*", removed)
+            hub.unsubscribe("/vdj/*", removed)
+            try:
+                sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                sender.sendto(codec.encode_message("/vdj/deck/1/play", [1]), ("127.0.0.1", port))
+                sender.close()
+                for _ in range(100):
+                    if len(calls) >= 2:
+                        break
+                    await asyncio.sleep(0.01)
+                await asyncio.sleep(0.02)
+            finally:
+                hub.stop()
+
+        asyncio.run(scenario())
+        assert sorted(calls) == [("object", [1]), ("partial", [1])]
+
+
+class TestPatternMatching:
+    """Test OSC address-pattern subscriptions."""
+
+    def test_osc_patterns_match_per_segment(self):
+        """?, * within a segment, [] and {} follow OSC 1.0 rules."""
+        from osc.patterns import ListenerRegistry
+
+        registry = ListenerRegistry()
+        handler = lambda addr, args: None
+        for pattern in ("/vdj/deck/*/get_title", "/controls/{meta,global}/*",
+                        "/audio/level?", "/deck/[0-9]/play"):
+            registry.add(pattern, handler)
+
+        def patterns(path):
+            return [entry.pattern for entry in registry.match(path)]
+
+        assert patterns("/vdj/deck/1/get_title") == ["/vdj/deck/*/get_title"]
+        assert patterns("/vdj/deck/1/2/get_title") == []
+        assert patterns("/controls/global/speed") == ["/controls/{meta,global}/*"]
+        assert patterns("/controls/other/speed") == []
+        assert patterns("/audio/levels") == ["/audio/level?"]
+        assert patterns("/audio/level") == []
+        assert patterns("/deck/7/play") == ["/deck/[0-9]/play"]
+        assert patterns("/deck/x/play") == []
+
+    def test_legacy_prefix_and_order_preserved(self):
+        """Trailing '*' still spans segments; results keep subscription order."""
+        from osc.patterns import ListenerRegistry
+
+        registry = ListenerRegistry()
+        handler = lambda addr, args: None
+        registry.add("/vdj/*", handler)
+        registry.add("/vdj/deck/?/play", handler)
+        registry.add("/", handler)
+
+        matches = registry.match("/vdj/deck/1/play")
+        assert [entry.pattern for entry in matches] == ["/vdj/*", "/vdj/deck/?/play", "/"]
+        assert registry.match("/vdj/deck/1/play") is matches  # memoized
+
+        registry.remove("/vdj/*", handler)
+        assert [entry.pattern for entry in registry.match("/vdj/deck/1/play")] == ["/vdj/deck/?/play", "/"]
+
+
+class TestRecorder:
+    """Test OSC traffic recording and replay."""
+
+    def test_record_then_replay_round_trip(self, tmp_path, udp_sink):
+        """Hub traffic is logged with timestamps and replayed byte-identically."""
+        from osc import codec
+        from osc.hub import OSCHub
+        from osc.recorder import OSCLogReader, OSCRecorder, OSCReplayer
+
+        port = free_udp_port()
+        hub = OSCHub(receive_port=port, forward_targets=[])
+        assert hub.start()
+        log_path = str(tmp_path / "show.osclog")
+        recorder = OSCRecorder(log_path, hub)
+        assert recorder.start()
+        try:
+            sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            for index in range(5):
+                sender.sendto(codec.encode_message("/layer/1/opacity", [index * 0.25]), ("127.0.0.1", port))
+            sender.sendto(codec.encode_message("/layer/1/name", ["Song"]), ("127.0.0.1", port))
+            sender.close()
+            deadline = time.time() + 1.0
+            while recorder.messages < 6 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            recorder.stop()
+            hub.stop()
+
+        with OSCLogReader(log_path) as reader:
+            messages = list(reader.messages())
+        assert [address for _, address, _ in messages] == ["/layer/1/opacity"] * 5 + ["/layer/1/name"]
+        assert messages[-1][2] == ["Song"]
+        timestamps = [timestamp for timestamp, _, _ in messages]
+        assert timestamps == sorted(timestamps)
+
+        stats = OSCReplayer(log_path, *udp_sink.getsockname(), speed=0).run()
+        assert stats.sent == 6
+        replayed = [codec.decode_message(udp_sink.recvfrom(65536)[0]) for _ in range(6)]
+        assert replayed[0] == ("/layer/1/opacity", [0.0])
+        assert replayed[-1] == ("/layer/1/name", ["Song"])
+
+    def test_rejects_foreign_files(self, tmp_path):
+        """Files without the log header raise OSCLogError."""
+        from osc.recorder import OSCLogError, OSCLogReader
+
+        path = tmp_path / "bogus.osclog"
+        path.write_bytes(b"not an osc log at all, definitely not")
+        with pytest.raises(OSCLogError):
+            OSCLogReader(str(path))
+
+
+class TestBench:
+    """Test the synthetic hub benchmark."""
+
+    def test_scenario_reports_machine_readable_metrics(self):
+        """A short run yields JSON-serializable throughput/drop/latency metrics."""
+        import json
+        from osc.bench import BenchScenario, run_scenario
+
+        result = run_scenario(BenchScenario("smoke", ("audio", "vdj"), subscribers=2, monitor=True), duration=0.25)
+        json.dumps(result)
+        assert result["sent"] > 0
+        assert result["processed"] + result["conflated"] + result["dropped"] >= result["sent"] * 0.9
+        assert result["handler_calls"] > 0
+        assert {"p50", "p99"} <= set(result["queue_latency_ms"])
+
+    def test_compare_flags_regressions(self):
+        """Throughput and p99 regressions beyond tolerance are reported."""
+        from osc.bench import compare
+
+        def suite(throughput, p99):
+            return {"results": [{
+                "scenario": {"name": "audio-1"},
+                "throughput_msg_s": throughput,
+                "drop_rate": 0.0,
+                "queue_latency_ms": {"p99": p99},
+                "dispatch_latency_ms": {"p99": 0.1},
+            }]}
+
+        assert compare(suite(2400, 1.0), suite(2300, 1.1)) == []
+        regressions = compare(suite(2400, 1.0), suite(1000, 5.0))
+        assert len(regressions) == 2
+
+
+class TestRouting:
+    """Test per-target forward routing."""
+
+    def test_include_exclude_and_decimation(self):
+        """Filters pick targets per address; max_rate drops messages inside the interval."""
+        from osc.routing import RouteConfig, RoutingTable
+
+        table = RoutingTable([
+            RouteConfig("127.0.0.1", 10000, exclude=("/vdj/*",)),
+            RouteConfig("127.0.0.1", 11111, include=("/audio/*",), max_rate=(("/audio/fft*", 30.0),)),
+        ])
+        assert table.select("/audio/level", 0.0) is None
+        assert table.select("/vdj/deck/1/get_title", 0.0) == ()
+        assert table.select("/textler/lyrics/line", 0.0) == (0,)
+        assert table.select("/audio/fft/1", 1.0) is None
+        assert table.select("/audio/fft/1", 1.01) == (0,)
+        assert table.select("/audio/fft/1", 1.04) is None
+
+        magic = table.get_stats()[1]
+        assert magic["decimated"] == 1
+        assert magic["filtered"] == 2
+
+    def test_hub_forwards_per_route_and_hot_reloads(self, tmp_path, udp_sink):
+        """Routed messages reach only matching targets; file changes apply live."""
+        import json
+        import os
+        from osc import codec
+        from osc.hub import OSCHub
+
+        other = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        other.bind(("127.0.0.1", 0))
+        other.settimeout(0.3)
+        routes_path = tmp_path / "routes.json"
+
+        def write_routes(include):
+            routes_path.write_text(json.dumps({"targets": [
+                {"name": "sink", "host": "127.0.0.1", "port": udp_sink.getsockname()[1]},
+                {"name": "other", "host": "127.0.0.1", "port": other.getsockname()[1], "include": include},
+            ]}))
+
+        write_routes(["/audio/*"])
+        port = free_udp_port()
+        hub = OSCHub(receive_port=port, forward_targets=[])
+        assert hub.set_routing_file(str(routes_path), interval=0.05)
+        assert hub.set_raw_forwarding(True)
+        assert hub.start()
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sender.sendto(codec.encode_message("/vdj/deck/1/play", [1]), ("127.0.0.1", port))
+            assert codec.parse_address(udp_sink.recvfrom(65536)[0]) == "/vdj/deck/1/play"
+            with pytest.raises(socket.timeout):
+                other.recvfrom(65536)
+
+            write_routes(["/vdj/*"])
+            os.utime(routes_path, (time.time() + 5, time.time() + 5))
+            deadline = time.time() + 2.0
+            while hub.routes[1].include != ("/vdj/*",) and time.time() < deadline:
+                time.sleep(0.02)
+            sender.sendto(codec.encode_message("/vdj/deck/1/play", [1]), ("127.0.0.1", port))
+            assert codec.parse_address(other.recvfrom(65536)[0]) == "/vdj/deck/1/play"
+        finally:
+            sender.close()
+            other.close()
+            hub.stop()
+
+
+class TestIsolatedSubscribers:
+    """Test per-subscriber queues and slow-handler budgets."""
+
+    def test_policies_bound_the_queue(self):
+        """drop_oldest keeps the newest messages; conflate keeps one per address."""
+        import threading
+        from osc.subscribers import POLICY_CONFLATE, POLICY_DROP_OLDEST, IsolatedSubscriber
+
+        gate = threading.Event()
+        seen = []
+
+        def handler(path, args):
+            gate.wait(1.0)
+            seen.append((path, args[0]))
+
+        subscriber = IsolatedSubscriber(handler, "/", policy=POLICY_DROP_OLDEST, maxsize=2)
+        try:
+            subscriber("/first", [0])
+            time.sleep(0.05)  # handler thread now holds /first
+            for index in range(1, 5):
+                subscriber("/x", [index])
+            assert subscriber.stats.dropped == 2
+            gate.set()
+            deadline = time.time() + 1.0
+            while len(seen) < 3 and time.time() < deadline:
+                time.sleep(0.01)
+            assert seen == [("/first", 0), ("/x", 3), ("/x", 4)]
+        finally:
+            subscriber.stop()
+
+        gate.clear()
+        seen.clear()
+        subscriber = IsolatedSubscriber(handler, "/", policy=POLICY_CONFLATE, maxsize=4)
+        try:
+            subscriber("/first", [0])
+            time.sleep(0.05)
+            for index in range(1, 5):
+                subscriber("/audio/level", [index])
+            subscriber("/audio/bpm", [120])
+            gate.set()
+            deadline = time.time() + 1.0
+            while len(seen) < 3 and time.time() < deadline:
+                time.sleep(0.01)
+            assert seen == [("/first", 0), ("/audio/level", 4), ("/audio/bpm", 120)]
+            assert subscriber.stats.conflated == 3
+        finally:
+            subscriber.stop()
+
+    def test_slow_isolated_handler_does_not_stall_hub(self):
+        """An isolated slow handler is flagged while inline handlers keep up."""
+        from osc import codec
+        from osc.hub import OSCHub
+
+        port = free_udp_port()
+        hub = OSCHub(receive_port=port, forward_targets=[])
+        hub.set_handler_budget(0.005)
+        fast = []
+        hub.subscribe("/", lambda addr, args: fast.append(args[0]))
+        hub.subscribe("/", lambda addr, args: time.sleep(0.02), isolated=True, maxsize=4)
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            for index in range(20):
+                sender.sendto(codec.encode_message("/layer/1/opacity", [index]), ("127.0.0.1", port))
+            deadline = time.time() + 1.0
+            while len(fast) < 20 and time.time() < deadline:
+                time.sleep(0.01)
+            assert fast == list(range(20))
+            time.sleep(0.1)
+            slow = hub.get_slow_handlers()
+            assert len(slow) == 1
+            assert "[drop_oldest]" in next(iter(slow))
+            (sub_stats,) = hub.get_subscriber_stats().values()
+            assert sub_stats["dropped"] > 0
+        finally:
+            sender.close()
+            hub.stop()
+
+    def test_hub_stop_joins_isolated_threads_and_start_resumes_them(self):
+        """Isolated subscriber threads follow the hub's lifecycle."""
+        from osc import codec
+        from osc.hub import OSCHub
+
+        port = free_udp_port()
+        hub = OSCHub(receive_port=port, forward_targets=[])
+        seen = []
+
+        def handler(addr, args):
+            seen.append(args[0])
+
+        hub.subscribe("/x", handler, isolated=True)
+        (subscriber,) = [sub for _, sub in hub._isolated_subscribers()]
+        assert subscriber.running
+        hub.stop()
+        assert not subscriber.running
+
+        assert hub.start()
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            assert subscriber.running
+            sender.sendto(codec.encode_message("/x", [7]), ("127.0.0.1", port))
+            deadline = time.time() + 1.0
+            while not seen and time.time() < deadline:
+                time.sleep(0.01)
+            assert seen == [7]
+            (label,) = hub.get_subscriber_stats()
+            assert label.startswith("/x → ") and label.endswith(".handler[drop_oldest]")
+        finally:
+            sender.close()
+            hub.stop()
+
+
+class TestSendScheduler:
+    """Test paced, prioritized outbound sending."""
+
+    @staticmethod
+    def _collect(sock, expected):
+        from osc import codec
+
+        received = []
+        while len(received) < expected:
+            data, _ = sock.recvfrom(65536)
+            received.extend(codec.decode_message(data, start, end)
+                            for _, start, end in codec.iter_messages(data))
+        return received
+
+    def test_priorities_bundles_and_reset_purge(self, udp_sink):
+        """High-priority messages jump bulk lines; a reset drops stale queued lines."""
+        from osc.scheduler import SendScheduler
+
+        host, port = udp_sink.getsockname()
+        # Slow refill: after the first burst the writer sleeps 50 ms per token,
+        # so everything below is queued before it takes another message
+        scheduler = SendScheduler("test", host, port, rate=20, burst=8, max_bundle=8)
+        try:
+            for index in range(20):
+                scheduler.send("/textler/lyrics/line", [index, float(index), f"old {index}"])
+            scheduler.send("/textler/lyrics/reset", [])
+            for index in range(10):
+                scheduler.send("/textler/lyrics/line", [index, float(index), f"new {index}"])
+            scheduler.send("/textler/line/active", [0])
+            scheduler.send("/textler/line/active", [1])
+            assert scheduler.flush(2.0)
+
+            received = []
+            while not received or received[-1] != ("/textler/lyrics/line", [9, 9.0, "new 9"]):
+                received.extend(self._collect(udp_sink, 1))
+            reset_at = received.index(("/textler/lyrics/reset", []))
+            first_new = next(i for i, (_, args) in enumerate(received) if args and args[-1] == "new 0")
+            assert reset_at < first_new
+            assert received.index(("/textler/line/active", [1])) < first_new
+            assert ("/textler/line/active", [0]) not in received
+            assert not any(args and str(args[-1]).startswith("old") for _, args in received[reset_at:])
+
+            stats = scheduler.get_stats()
+            assert stats["coalesced"] >= 1
+            assert stats["bundles"] > 0
+            assert stats["queued"] == 0
+        finally:
+            scheduler.close()
+
+    def test_token_bucket_paces_bursts(self, udp_sink):
+        """A burst larger than the bucket takes about burst/rate seconds to drain."""
+        from osc.scheduler import SendScheduler
+
+        host, port = udp_sink.getsockname()
+        scheduler = SendScheduler("test", host, port, rate=500, burst=10, max_bundle=5)
+        try:
+            started = time.monotonic()
+            for index in range(60):
+                scheduler.send("/textler/lyrics/line", [index, 0.0, "x"])
+            assert scheduler.flush(2.0)
+            elapsed = time.monotonic() - started
+            assert elapsed >= 0.08  # 50 messages beyond the burst at 500/s
+            assert len(self._collect(udp_sink, 60)) == 60
+        finally:
+            scheduler.close()
+
+    def test_reset_is_not_overtaken_by_later_high_priority(self, udp_sink):
+        """A reset queued before an active line reaches the receiver first."""
+        from osc.scheduler import SendScheduler
+
+        host, port = udp_sink.getsockname()
+        scheduler = SendScheduler("test", host, port, rate=20, burst=1, max_bundle=1)
+        try:
+            scheduler.send("/textler/metadata/title", ["filler"])  # takes the only token
+            scheduler.send("/textler/lyrics/reset", [])
+            scheduler.send("/textler/line/active", [0])
+            assert scheduler.flush(2.0)
+            addresses = [address for address, _ in self._collect(udp_sink, 3)]
+            assert addresses.index("/textler/lyrics/reset") < addresses.index("/textler/line/active")
+        finally:
+            scheduler.close()
+
+    def test_channel_stop_closes_scheduler_and_start_recreates_it(self, udp_sink):
+        """Stopping a scheduled channel ends its writer thread; start() brings scheduling back."""
+        from osc.hub import Channel, ChannelConfig
+
+        host, port = udp_sink.getsockname()
+        channel = Channel(ChannelConfig("test", host, port, None, scheduled=True))
+        assert channel.start()
+        assert channel.send("/textler/track", "a")
+        self._collect(udp_sink, 1)
+        scheduler = channel.scheduler
+        thread = scheduler._thread
+        channel.stop()
+        thread.join(1.0)
+        assert not thread.is_alive()
+        assert channel.scheduler is None
+
+        assert channel.start()
+        assert channel.scheduler is not None and channel.scheduler is not scheduler
+        assert channel.send("/textler/track", "b")
+        assert self._collect(udp_sink, 1) == [("/textler/track", ["b"])]
+        channel.stop()
+
+
+class TestRetainedState:
+    """Test retained outgoing state and resync."""
+
+    def test_reset_clears_prefix_and_order_follows_updates(self):
+        """A reset drops the previous song's lines; updates keep live send order."""
+        from osc.retained import RetainedState
+
+        state = RetainedState()
+        state.record("/textler/track", [1, "spotify", "A", "Old", "", 100.0, 1])
+        state.record("/textler/lyrics/reset", [])
+        state.record("/textler/lyrics/line", [0, 0.0, "old line"])
+        state.record("/textler/track", [1, "spotify", "B", "New", "", 200.0, 1])
+        state.record("/textler/lyrics/reset", [])
+        state.record("/textler/lyrics/line", [0, 0.0, "first"])
+        state.record("/textler/lyrics/line", [1, 2.0, "second"])
+        state.record("/textler/line/active", [0])
+        state.record("/textler/lyrics/line", [0, 0.0, "first (fixed)"])
+        state.record("/textler/line/active", [1])
+        assert not state.record("/audio/level", [0.5])
+
+        assert state.snapshot() == [
+            ("/textler/track", (1, "spotify", "B", "New", "", 200.0, 1)),
+            ("/textler/lyrics/reset", ()),
+            ("/textler/lyrics/line", (0, 0.0, "first (fixed)")),
+            ("/textler/lyrics/line", (1, 2.0, "second")),
+            ("/textler/line/active", (1,)),
+        ]
+
+    def test_channel_resync_replays_state_as_bundles(self, udp_sink):
+        """Channel.resync() sends the retained state in a few bundles."""
+        from osc import codec
+        from osc.hub import Channel, ChannelConfig
+
+        host, port = udp_sink.getsockname()
+        channel = Channel(ChannelConfig("test", host, port, None, retained=True))
+        assert channel.start()
+        channel.send("/shader/load", "plasma", 0.5, 0.1)
+        for index in range(40):
+            channel.send("/textler/lyrics/line", index, float(index), f"line {index}")
+        channel.send("/image/folder", "/tmp/images")
+        for _ in range(42):
+            udp_sink.recvfrom(65536)
+
+        assert channel.resync() == 42
+        replayed = []
+        datagrams = 0
+        while len(replayed) < 42:
+            data, _ = udp_sink.recvfrom(65536)
+            datagrams += 1
+            assert len(data) <= 1400
+            replayed.extend(codec.decode_message(data, start, end) for _, start, end in codec.iter_messages(data))
+        assert datagrams == 2
+        assert replayed[0][0] == "/shader/load"
+        assert replayed[-1] == ("/image/folder", ["/tmp/images"])
+
+    def test_resync_bundles_stay_under_one_datagram(self, udp_sink):
+        """Kilobyte bulk chunks are replayed one per bundle instead of overflowing oscP5's buffer."""
+        from osc import codec
+        from osc.hub import Channel, ChannelConfig
+
+        host, port = udp_sink.getsockname()
+        channel = Channel(ChannelConfig("test", host, port, None, retained=True))
+        assert channel.start()
+        for chunk in range(3):
+            channel.send("/textler/lyrics/bulk", chunk, 3, "song", chunk * 10, -1, "x" * 900)
+        for _ in range(3):
+            udp_sink.recvfrom(65536)
+
+        assert channel.resync() == 3
+        for _ in range(3):
+            data, _ = udp_sink.recvfrom(65536)
+            assert len(data) <= 1400
+            assert len(list(codec.iter_messages(data))) == 1
+
+    def test_resync_request_does_not_count_as_subscriber(self, udp_sink):
+        """An incoming /textler/resync replays state, yet an idle hub has no listeners."""
+        import pyliblo3 as liblo
+        from osc import codec
+        from osc.hub import OSCHub
+
+        port = free_udp_port()
+        hub = OSCHub(receive_port=port, forward_targets=[])
+        assert hub._listeners.count == 0
+        assert hub.start()
+        try:
+            host, sink_port = udp_sink.getsockname()
+            hub.textler._target = liblo.Address(host, sink_port)  # point VJUniverse at the sink
+            hub.textler.set_scheduling(False)
+            hub.textler.send("/shader/load", "plasma", 1)
+            udp_sink.recvfrom(65536)
+
+            sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sender.sendto(codec.encode_message("/textler/resync", []), ("127.0.0.1", port))
+            sender.close()
+            data, _ = udp_sink.recvfrom(65536)
+            assert [codec.decode_message(data, start, end) for _, start, end in codec.iter_messages(data)] == [
+                ("/shader/load", ["plasma", 1])
+            ]
+        finally:
+            hub.stop()
+
+    def test_bundled_resync_request_in_raw_mode(self, udp_sink):
+        """In raw mode a /textler/resync inside a bundle still replays retained state."""
+        import pyliblo3 as liblo
+        from osc import codec
+        from osc.hub import OSCHub
+
+        port = free_udp_port()
+        hub = OSCHub(receive_port=port, forward_targets=[])
+        assert hub.set_raw_forwarding(True)
+        assert hub.start()
+        try:
+            host, sink_port = udp_sink.getsockname()
+            hub.textler._target = liblo.Address(host, sink_port)
+            hub.textler.set_scheduling(False)
+            hub.textler.send("/shader/load", "plasma", 1)
+            udp_sink.recvfrom(65536)
+
+            sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            bundle = codec.encode_bundle([
+                codec.encode_message("/audio/level", [0.5]),
+                codec.encode_message("/textler/resync", []),
+            ])
+            sender.sendto(bundle, ("127.0.0.1", port))
+            sender.close()
+            data, _ = udp_sink.recvfrom(65536)
+            assert [codec.decode_message(data, start, end) for _, start, end in codec.iter_messages(data)] == [
+                ("/shader/load", ["plasma", 1])
+            ]
+        finally:
+            hub.stop()
+
+
+class TestRelay:
+    """Test multi-host relay between localhost nodes."""
+
+    def test_one_channel_drives_every_node(self, udp_sink):
+        """Textler sends on one node reach the renderer targets of all peers."""
+        from osc import codec
+        from osc.hub import Channel, ChannelConfig
+        from osc.relay import RelayNode, RelayPeer
+
+        host, port = udp_sink.getsockname()
+        second_sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        second_sink.bind(("127.0.0.1", 0))
+        second_sink.settimeout(1.0)
+        port_b, port_c = free_udp_port(), free_udp_port()
+        channel = Channel(ChannelConfig("textler", "127.0.0.1", free_udp_port(), None))
+        assert channel.start()
+        node_b = RelayNode("b", listen_port=port_b, local_targets=[(host, port)])
+        node_c = RelayNode("c", listen_port=port_c, local_targets=[second_sink.getsockname()])
+        node_a = RelayNode(
+            "a",
+            peers=[RelayPeer("127.0.0.1", port_b), RelayPeer("127.0.0.1", port_c)],
+            listen_port=free_udp_port(),
+            local_targets=[],
+            channels=[channel],
+        )
+        try:
+            assert node_b.start() and node_c.start() and node_a.start()
+            channel.send("/textler/lyrics/line", 0, 1.5, "hello")
+            channel.send("/textler/line/active", 0)
+            channel.send("/audio/level", 0.5)  # not in the relayed address space
+
+            for sink in (udp_sink, second_sink):
+                data, _ = sink.recvfrom(65536)
+                messages = [codec.decode_message(data, start, end) for _, start, end in codec.iter_messages(data)]
+                assert messages == [
+                    ("/textler/lyrics/line", [0, 1.5, "hello"]),
+                    ("/textler/line/active", [0]),
+                ]
+            assert node_b.get_stats()["inbound"]["a"]["messages"] == 2
+            assert node_a.get_stats()["outbound"][f"127.0.0.1:{port_c}"]["datagrams"] == 1
+        finally:
+            node_a.stop()
+            node_b.stop()
+            node_c.stop()
+            second_sink.close()
+
+    def test_float_compression_and_link_sequence_stats(self, udp_sink):
+        """f16 arrays round-trip; sequence gaps and late datagrams are counted."""
+        from osc import codec
+        from osc.relay import RELAY_HEADER_ADDRESS, RelayNode, compress_message
+
+        fft = [index / 16.0 for index in range(16)]
+        packed = compress_message("/audio/fft", fft)
+        assert packed is not None and len(packed) < len(codec.encode_message("/audio/fft", fft))
+        assert compress_message("/audio/level", [0.5]) is None
+
+        listen_port = free_udp_port()
+        node = RelayNode("b", listen_port=listen_port, local_targets=[udp_sink.getsockname()])
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            assert node.start()
+            # A datagram without a link header is dropped without stopping the receiver
+            sender.sendto(codec.encode_message("/audio/level", [0.5]), ("127.0.0.1", listen_port))
+            for seq in (0, 1, 4, 2):
+                header = codec.encode_message(RELAY_HEADER_ADDRESS, ["a", seq])
+                sender.sendto(codec.encode_bundle([header, packed]), ("127.0.0.1", listen_port))
+                data, _ = udp_sink.recvfrom(65536)
+                assert codec.decode_message(data) == ("/audio/fft", fft)
+
+            assert node.get_stats()["inbound"]["a"] == {
+                "datagrams": 4, "messages": 4, "lost": 1, "reordered": 1, "restarts": 0,
+            }
+        finally:
+            sender.close()
+            node.stop()
+
+    def test_peer_restart_starts_a_new_sequence_epoch(self, udp_sink):
+        """A peer whose sequence starts over is a restart, not a stream of reordered datagrams."""
+        from osc import codec
+        from osc.relay import RELAY_HEADER_ADDRESS, RELAY_REORDER_WINDOW, RelayNode
+
+        listen_port = free_udp_port()
+        node = RelayNode("b", listen_port=listen_port, local_targets=[udp_sink.getsockname()])
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        message = codec.encode_message("/textler/line/active", [1])
+        try:
+            assert node.start()
+            for seq in (500, 501, 0, 1, 2):
+                header = codec.encode_message(RELAY_HEADER_ADDRESS, ["a", seq])
+                sender.sendto(codec.encode_bundle([header, message]), ("127.0.0.1", listen_port))
+                udp_sink.recvfrom(65536)
+            assert 501 > RELAY_REORDER_WINDOW
+            assert node.get_stats()["inbound"]["a"] == {
+                "datagrams": 5, "messages": 5, "lost": 0, "reordered": 0, "restarts": 1,
+            }
+        finally:
+            sender.close()
+            node.stop()
+
+    def test_expanded_delivery_is_split_under_one_datagram(self, udp_sink):
+        """A full peer datagram of f16 frames is re-split so no local packet exceeds the MTU budget."""
+        from osc import codec
+        from osc.relay import RELAY_HEADER_ADDRESS, RELAY_MAX_BYTES, RelayNode, compress_message
+
+        fft = [index / 64.0 for index in range(64)]
+        packed = compress_message("/audio/fft", fft)
+        header = codec.encode_message(RELAY_HEADER_ADDRESS, ["a", 0])
+        frames = (RELAY_MAX_BYTES - 16 - 4 - len(header)) // (4 + len(packed))
+        datagram = codec.encode_bundle([header] + [packed] * frames)
+        assert len(datagram) <= RELAY_MAX_BYTES
+
+        listen_port = free_udp_port()
+        node = RelayNode("b", listen_port=listen_port, local_targets=[udp_sink.getsockname()])
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            assert node.start()
+            sender.sendto(datagram, ("127.0.0.1", listen_port))
+            received = 0
+            while received < frames:
+                data, _ = udp_sink.recvfrom(65536)
+                assert len(data) <= RELAY_MAX_BYTES
+                received += len(list(codec.iter_messages(data)))
+            assert received == frames
+        finally:
+            sender.close()
+            node.stop()
+
+
+class TestSharedMemory:
+    """Test shared-memory fan-out to local readers."""
+
+    def test_reader_receives_hub_traffic_with_subscribe_api(self):
+        """Messages received by the hub reach a reader; only subscribed addresses decode."""
+        import os
+
+        from osc import codec
+        from osc.hub import OSCHub
+        from osc.shm import OSCShmReader
+
+        name = f"vj_osc_test_{os.getpid()}"
+        port = free_udp_port()
+        hub = OSCHub(receive_port=port, forward_targets=[])
+        assert hub.start()
+        reader = OSCShmReader(name)
+        received = []
+        try:
+            assert hub.set_shared_memory(True, name=name)
+            reader.subscribe("/audio/*", lambda addr, args: received.append((addr, args)))
+            assert reader.start()
+            sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sender.sendto(codec.encode_message("/vdj/deck/1/play", [1]), ("127.0.0.1", port))
+            sender.sendto(codec.encode_message("/audio/beat/onbeat", [1]), ("127.0.0.1", port))
+            sender.close()
+
+            deadline = time.time() + 1.0
+            while not received and time.time() < deadline:
+                time.sleep(0.01)
+            assert received == [("/audio/beat/onbeat", [1])]
+            stats = reader.get_stats()
+            assert stats["received"] == 2 and stats["dispatched"] == 1
+        finally:
+            reader.stop()
+            hub.stop()
+        assert not hub.shared_memory
+
+    def test_lapped_reader_counts_dropped_messages(self):
+        """A reader that falls more than a ring behind skips ahead and counts drops."""
+        import os
+
+        from osc.shm import OSCShmPublisher, OSCShmReader
+
+        publisher = OSCShmPublisher(f"vj_osc_test_lap_{os.getpid()}", slots=8)
+        reader = OSCShmReader(publisher.name)
+        received = []
+        reader.subscribe("/", lambda addr, args: received.append(args[0]))
+        try:
+            assert reader.attach()
+            for index in range(20):
+                publisher.publish_message("/layer/1/opacity", [index])
+            assert reader.poll() == 8
+            assert received == list(range(12, 20))
+            assert reader.get_stats()["dropped"] == 12
+        finally:
+            reader.stop()
+            publisher.close()
+
+    def test_publisher_idles_until_a_reader_polls(self):
+        """Without a recently polling reader nothing is encoded or written."""
+        import os
+
+        from osc import shm
+        from osc.shm import OSCShmPublisher, OSCShmReader
+
+        publisher = OSCShmPublisher(f"vj_osc_test_idle_{os.getpid()}", slots=8)
+        reader = OSCShmReader(publisher.name)
+        received = []
+        reader.subscribe("/", lambda addr, args: received.append(args[0]))
+        try:
+            publisher.publish_message("/layer/1/opacity", [0])
+            assert publisher.get_stats()["published"] == 0 and publisher.get_stats()["idle"] == 1
+            assert reader.attach()
+            publisher.publish_message("/layer/1/opacity", [1])
+            assert reader.poll() == 1 and received == [1]
+
+            shm._SEEN.pack_into(publisher._buf, shm._SEEN_OFFSET, time.monotonic() - shm.SHM_READER_TIMEOUT)
+            publisher.publish_message("/layer/1/opacity", [2])
+            assert publisher.get_stats()["published"] == 1
+        finally:
+            reader.stop()
+            publisher.close()
+
+    def test_open_inbound_without_hub_or_segment_keeps_outbound(self):
+        """With the port taken and nothing published, there is no inbound stream but sends work."""
+        import os
+        import types
+
+        from osc.shm import open_inbound
+
+        started = []
+        channels = [types.SimpleNamespace(start=lambda name=name: started.append(name)) for name in ("vdj", "syn", "txt")]
+        hub = types.SimpleNamespace(
+            start=lambda: False, receive_port=9999, vdj=channels[0], synesthesia=channels[1], textler=channels[2],
+        )
+        assert open_inbound(hub, name=f"vj_osc_test_none_{os.getpid()}") is None
+        assert started == ["vdj", "syn", "txt"]
+
+
+class TestArraySubscriptions:
+    """Test typed NumPy delivery of float payloads."""
+
+    def test_raw_mode_delivers_read_only_views(self):
+        """All-float payloads arrive as read-only arrays; mixed payloads are skipped."""
+        import numpy as np
+
+        from osc import codec
+        from osc.hub import OSCHub
+
+        port = free_udp_port()
+        hub = OSCHub(receive_port=port, forward_targets=[])
+        assert hub.set_raw_forwarding(True)
+        received = []
+        try:
+            subscription = hub.subscribe_array("/audio/*", lambda addr, array: received.append((addr, array)))
+            sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sender.sendto(codec.encode_message("/audio/level", ["bass", 0.5]), ("127.0.0.1", port))
+            sender.sendto(codec.encode_bundle([
+                codec.encode_message("/audio/fft", [0.25, 0.5, 0.75]),
+                codec.encode_message("/vdj/deck/1/play", [1]),
+            ]), ("127.0.0.1", port))
+            sender.close()
+
+            deadline = time.time() + 1.0
+            while not received and time.time() < deadline:
+                time.sleep(0.01)
+            assert len(received) == 1
+            path, array = received[0]
+            assert path == "/audio/fft"
+            assert np.allclose(array, [0.25, 0.5, 0.75])
+            assert not array.flags.writeable
+            assert subscription.frames_received == 1
+        finally:
+            hub.stop()
+
+    def test_history_ring_keeps_last_frames_in_order(self):
+        """The per-address ring holds the newest N frames, oldest first."""
+        import numpy as np
+
+        from osc.arrays import ArraySubscription, array_from_args
+
+        subscription = ArraySubscription(history=4)
+        for index in range(6):
+            subscription("/audio/fft", array_from_args([float(index), float(index) * 2.0]))
+        ring = subscription.ring("/audio/fft")
+        assert len(ring) == 4 and ring.count == 6
+        assert np.array_equal(subscription.frames("/audio/fft")[:, 0], [2.0, 3.0, 4.0, 5.0])
+        assert np.array_equal(subscription.frames("/audio/fft", 2), [[4.0, 8.0], [5.0, 10.0]])
+        assert np.array_equal(ring.last(), [5.0, 10.0])
+        assert array_from_args([1.0, 2]) is None
+
+
+class TestMonitor:
+    """Test slot-based OSC monitor aggregation."""
+
+    def test_slots_are_reused_and_sampling_scales_counts(self):
+        """Full monitors evict the oldest claimed address; 1-in-N sampling keeps counts honest."""
+        from osc.hub import OSCHub
+        from osc.monitor import OSCMonitor
+
+        hub = OSCHub(receive_port=free_udp_port(), forward_targets=[])
+        monitor = OSCMonitor(max_addresses=2, hub=hub, auto_sample_rate=None)
+        try:
+            assert monitor.start()
+            monitor.record_outgoing("txt", "/textler/track", (1, "A"))
+            monitor.record_outgoing("txt", "/textler/line/active", (0,))
+            monitor.record_outgoing("txt", "/textler/line/active", (1,))
+            monitor.record_outgoing("txt", "/shader/load", ("plasma",))
+
+            messages = {msg.address: msg for msg in monitor.get_aggregated()}
+            assert set(messages) == {"/textler/line/active", "/shader/load"}
+            assert messages["/textler/line/active"].last_args == [1]
+            assert messages["/textler/line/active"].count == 2
+
+            monitor.set_sampling(4, auto_sample_rate=None)
+            for index in range(8):
+                monitor.record_outgoing("txt", "/shader/load", (f"s{index}",))
+            messages = {msg.address: msg for msg in monitor.snapshot()}
+            assert messages["/shader/load"].count == 9
+            assert messages["/shader/load"].last_args == ["s7"]
+
+            stats = monitor.get_stats()
+            assert stats["total"] == 12
+            assert stats["channels"] == {"→txt": 12}
+            assert stats["rate"] == pytest.approx(12 / 2.0)
+            assert monitor.get_grouped_prefixes()["→txt"][0] == ("/shader", 9, 1)
+        finally:
+            monitor.stop()
+            hub.stop()
+
+    def test_prefix_tree_keeps_children_ranked_and_filters_current(self):
+        """Grouped prefixes follow live counts; cached filters pick up new addresses."""
+        from osc.hub import OSCHub
+        from osc.monitor import OSCMonitor
+
+        hub = OSCHub(receive_port=free_udp_port(), forward_targets=[])
+        monitor = OSCMonitor(hub=hub, auto_sample_rate=None)
+        try:
+            assert monitor.start()
+            for address, times in (("/audio/level", 1), ("/audio/fft", 3), ("/vdj/deck/1/play", 2)):
+                for _ in range(times):
+                    monitor.record_outgoing("txt", address, (1,))
+            assert monitor.get_grouped_prefixes(child_limit=1)["→txt"] == [
+                ("/audio", 4, 1), ("/audio/fft", 3, 2),
+                ("/vdj", 2, 1), ("/vdj/deck", 2, 2), ("/vdj/deck/1", 2, 3),
+            ]
+            for _ in range(3):
+                monitor.record_outgoing("txt", "/audio/level", (1,))
+            assert monitor.get_grouped_prefixes(limit=1, child_limit=2)["→txt"] == [
+                ("/audio", 7, 1), ("/audio/level", 4, 2), ("/audio/fft", 3, 2),
+            ]
+
+            assert monitor.get_grouped_prefixes("deck")["→txt"] == [
+                ("/vdj", 2, 1), ("/vdj/deck", 2, 2), ("/vdj/deck/1", 2, 3),
+            ]
+            monitor.record_outgoing("txt", "/textler/deck", (1,))
+            assert [row[0] for row in monitor.get_grouped_prefixes("deck")["→txt"]] == [
+                "/vdj", "/vdj/deck", "/vdj/deck/1", "/textler", "/textler/deck",
+            ]
+        finally:
+            monitor.stop()
+            hub.stop()
+
+    def test_rate_series_keeps_busiest_addresses_per_second(self, monkeypatch):
+        """Per-second rings fill on bucket rolls, zero silent seconds and swap out quiet rows."""
+        np = pytest.importorskip("numpy")
+        import types
+        import osc.monitor as monitor_module
+        from osc.hub import OSCHub
+        from osc.monitor import OSCMonitor
+
+        clock = [100.0]
+        monkeypatch.setattr(monitor_module, "time", types.SimpleNamespace(time=lambda: clock[0]))
+        hub = OSCHub(receive_port=free_udp_port(), forward_targets=[])
+        monitor = OSCMonitor(hub=hub, auto_sample_rate=None, series_addresses=2, series_seconds=10, track_values=True)
+        try:
+            assert monitor.start()
+
+            def send(now, address, *values):
+                clock[0] = now
+                for value in values:
+                    monitor.record_outgoing("txt", address, (value,))
+
+            send(100.0, "/a", 1.0, 3.0, 2.0)
+            send(100.1, "/b", 5.0)
+            send(101.0, "/a", 4.0)
+            send(104.0, "/c", 0, 0, 0)  # 102-103 silent; /c outgrows /b's window total
+            send(104.5, "/a", 1.0)
+
+            clock[0] = 105.2
+            series = {entry["address"]: entry for entry in monitor.get_rate_series(seconds=6)}
+            assert set(series) == {"/a", "/c"}
+            assert series["/a"]["counts"].tolist() == [3, 1, 0, 0, 0, 0]
+            assert series["/c"]["counts"].tolist() == [0, 0, 0, 0, 3, 0]
+            assert series["/a"]["peak"] == 3 and series["/c"]["total"] == 3
+            assert series["/a"]["min"][0] == 1.0 and series["/a"]["max"][0] == 3.0
+            assert np.isnan(series["/a"]["min"][2])
+
+            clock[0] = 120.0
+            assert all(not entry["total"] for entry in monitor.get_rate_series())
+        finally:
+            monitor.stop()
+            hub.stop()
+
+
+class TestLyricsBulk:
+    """Test chunked bulk lyric transfer."""
+
+    def test_chunks_are_bounded_and_reassemble(self):
+        """Every chunk fits the byte budget and carries what a receiver needs on its own."""
+        from adapters import LYRICS_BULK_ADDRESS, LYRICS_BULK_HEADER_ARGS, pack_lyric_chunks
+        from osc import codec
+
+        entries = [
+            (index * 2.5, f"line {index} " + "la" * (index % 7), index % 3 == 0, "LA" if index % 2 else "")
+            for index in range(120)
+        ]
+        chunks = pack_lyric_chunks("queen_bohemian", entries, max_bytes=600)
+        assert 5 < len(chunks) < 30
+
+        lines, refrains = {}, {}
+        for number, args in enumerate(chunks):
+            assert codec.message_size(LYRICS_BULK_ADDRESS, args) <= 600
+            chunk, count, song_id, first_index, first_refrain = args[:LYRICS_BULK_HEADER_ARGS]
+            assert (chunk, count, song_id) == (number, len(chunks), "queen_bohemian")
+            body = args[LYRICS_BULK_HEADER_ARGS:]
+            for offset in range(0, len(body), 4):
+                time_sec, text, refrain, keywords = body[offset:offset + 4]
+                lines[first_index + offset // 4] = (time_sec, text, refrain == 1, keywords)
+                if refrain:
+                    refrains[first_refrain] = text
+                    first_refrain += 1
+        assert [lines[index] for index in range(len(entries))] == entries
+        assert [refrains[index] for index in range(len(refrains))] == [
+            text for _, text, is_refrain, _ in entries if is_refrain
+        ]
+        assert pack_lyric_chunks("x", []) == []
+
+    def test_scheduler_bundles_stay_under_byte_budget(self, udp_sink):
+        """Large bulk chunks are not glued into oversized bundles."""
+        from osc.scheduler import SendScheduler
+
+        host, port = udp_sink.getsockname()
+        scheduler = SendScheduler("test", host, port, max_bundle=16, max_bundle_bytes=1400)
+        try:
+            for index in range(6):
+                scheduler.send("/textler/lyrics/bulk", [index, 6, "song", 0, 0, "x" * 900])
+            assert scheduler.flush(2.0)
+            sizes = [len(udp_sink.recv(65536)) for _ in range(6)]
+            assert max(sizes) <= 1400
+            assert scheduler.get_stats()["sent"] == 6
+        finally:
+            scheduler.close()
+
+
+class TestCompiledLyrics:
+    """Test per-track compiled lyric messages."""
+
+    def test_active_lookups_match_linear_scan(self):
+        """line_at agrees with get_active_line_index; refrain lines map to their first occurrence."""
+        from adapters import compile_lyrics
+        from domain import LyricLine, get_active_line_index
+
+        lines = [
+            LyricLine(1.0, "Oh oh", True, "OH"),
+            LyricLine(2.5, "verse"),
+            LyricLine(4.0, "Oh oh", True, "OH"),
+            LyricLine(6.0, "Ça va", True, ""),
+        ]
+        lyrics = compile_lyrics("song", lines, ascii_only=True)
+        for position in (0.0, 1.0, 2.4, 2.5, 5.9, 6.0, 99.0):
+            assert lyrics.line_at(position) == get_active_line_index(lines, position)
+
+        assert lyrics.entries[3][1] == "?a va"
+        assert lyrics.refrain_index == (0, -1, 0, 2)
+        assert lyrics.active_messages[2] == (
+            ("/textler/line/active", (2,)),
+            ("/textler/refrain/active", (0, "Oh oh")),
+            ("/textler/keywords/active", (2, "OH")),
+        )
+        assert lyrics.active_messages[1] == (("/textler/line/active", (1,)),)
+        assert lyrics.bulk_chunks[0][:5] == (0, 1, "song", 0, 0)
+
+
+class TestSenderDedup:
+    """Test duplicate suppression in OSCSender."""
+
+    def test_identical_resends_are_suppressed_within_window(self, monkeypatch):
+        """Same payload to the same address is skipped; changes, force, resets and lines go out."""
+        import types
+        import adapters
+
+        sent = []
+        fake_hub = types.SimpleNamespace(
+            start=lambda: True,
+            textler=types.SimpleNamespace(send=lambda address, *args: sent.append((address, args))),
+        )
+        monkeypatch.setattr(adapters, "osc", fake_hub)
+        sender = adapters.OSCSender(dedup_window=60.0)
+
+        for _ in range(3):
+            sender.send_master_status(textler_active=True, processing_apps=1)
+        sender.send_master_status(textler_active=False, processing_apps=1)
+        sender.send_master_status(textler_active=False, processing_apps=1, force=True)
+        assert [args for _, args in sent] == [(1, 0, 0, 1), (0, 0, 0, 1), (0, 0, 0, 1)]
+
+        sent.clear()
+        sender.send_textler("keywords", "summary", {"count": 2, "text": "a,b"})
+        sender.send_textler("keywords", "summary", {"count": 2, "text": "a,b"})
+        sender.send_textler("keywords", "reset")
+        sender.send_textler("keywords", "reset")
+        sender.send_textler("keywords", "summary", {"count": 2, "text": "a,b"})
+        sender.send_textler("lyrics", "line", {"index": 0, "time": 0.0, "text": "x"})
+        sender.send_textler("lyrics", "line", {"index": 0, "time": 0.0, "text": "x"})
+        assert [address for address, _ in sent] == [
+            "/textler/keywords/summary",
+            "/textler/keywords/reset",
+            "/textler/keywords/reset",
+            "/textler/keywords/summary",
+            "/textler/lyrics/line",
+            "/textler/lyrics/line",
+        ]
+
+        stats = sender.get_dedup_stats()
+        assert stats["suppressed"] == 3
+        assert stats["suppressed_by_address"] == {"/vj/master/status": 2, "/textler/keywords/summary": 1}
+        assert stats["sent"] == 9
+
+    def test_payloads_compare_by_value_and_type_and_commands_always_send(self, monkeypatch):
+        """Hash-colliding or type-changing payloads go out; shader/image commands are never suppressed."""
+        import types
+        import adapters
+
+        sent = []
+        fake_hub = types.SimpleNamespace(
+            start=lambda: True,
+            textler=types.SimpleNamespace(send=lambda address, *args: sent.append((address, args))),
+        )
+        monkeypatch.setattr(adapters, "osc", fake_hub)
+        sender = adapters.OSCSender(dedup_window=60.0)
+
+        assert hash(-1) == hash(-2)
+        for value in (-1, -2, 1, True, 1.0, 1.0):
+            sender.send("/textler/position", value)
+        assert [args for _, args in sent] == [(-1,), (-2,), (1,), (True,), (1.0,)]
+
+        sent.clear()
+        for _ in range(2):
+            sender.send_shader("neon", energy=0.5, valence=0.5)
+            sender.send_image_folder("/tmp/images", fit_mode="cover")
+        assert [address for address, _ in sent] == ["/shader/load", "/image/fit", "/image/folder"] * 2
+        assert sender.get_dedup_stats()["suppressed"] == 1
+
+
+class TestLyricScheduling:
+    """Test the timer heap and next-line boundary used by the textler loop."""
+
+    def test_timer_heap_reschedules_and_cancels(self):
+        """Re-setting a name replaces its deadline; cancelled timers never fire."""
+        from infrastructure import TimerHeap
+
+        timers = TimerHeap()
+        assert timers.next_deadline() is None
+        timers.set("poll", 10.0)
+        timers.set("line", 2.0)
+        timers.set("line", 5.0)
+        assert timers.next_deadline() == 5.0
+        assert timers.pop_due(4.9) == []
+        assert timers.pop_due(5.0) == ["line"]
+        timers.set("line", 7.0)
+        timers.cancel("line")
+        assert timers.next_deadline() == 10.0
+        assert timers.pop_due(20.0) == ["poll"]
+        assert timers.next_deadline() is None
+
+    def test_check_lyrics_returns_next_boundary(self, monkeypatch):
+        """Active line is sent once; the returned wake time lands on the next line."""
+        import types
+        import textler_engine
+        from adapters import compile_lyrics
+        from domain import LyricLine
+        from domain_types import PlaybackSnapshot, PlaybackState, Track
+
+        track = Track("Artist", "Song")
+        sent = []
+        engine = object.__new__(textler_engine.TextlerEngine)
+        engine._last_track_key = track.key
+        engine._last_active_index = -1
+        engine._settings = types.SimpleNamespace(timing_offset_ms=500, lyrics_lead_ms=0)
+        engine._osc = types.SimpleNamespace(send_active_line=lambda lyrics, index, at: sent.append(index))
+        engine._compiled_lyrics = compile_lyrics("song", [
+            LyricLine(1.0, "one"), LyricLine(3.0, "two"), LyricLine(4.0, "three"),
+        ])
+        monkeypatch.setattr(textler_engine.time, "time", lambda: 100.0)
+
+        state = PlaybackState(track=track, position=1.5, is_playing=True, last_update=99.0)
+        snapshot = PlaybackSnapshot(state=state)
+        # position 1.5 + 1.0 s elapsed + 0.5 s offset = 3.0 -> line 1, next at 4.0
+        assert engine._check_lyrics(snapshot) == pytest.approx(101.0)
+        assert engine._check_lyrics(snapshot) == pytest.approx(101.0)
+        assert sent == [1]
+
+        last = PlaybackSnapshot(state=state.update(position=10.0, last_update=100.0))
+        assert engine._check_lyrics(last) is None
+        paused = PlaybackSnapshot(state=state.update(is_playing=False))
+        assert engine._check_lyrics(paused) is None
+        assert sent == [1, 2]
+
+    def test_loaded_lyrics_send_active_line_without_waiting_for_poll(self):
+        """Lyrics compiled on the pipeline thread wake the loop; the active line does not wait for a poll."""
+        import threading
+        import types
+        import textler_engine
+        from adapters import compile_lyrics
+        from domain import LyricLine
+        from domain_types import PlaybackSnapshot, PlaybackState, Track
+        from infrastructure import TimerHeap
+
+        track = Track("Artist", "Song")
+        state = PlaybackState(track=track, position=2.0, is_playing=True, last_update=time.time(), rate=1.0)
+        snapshot = PlaybackSnapshot(state=state)
+        sent = threading.Event()
+        engine = object.__new__(textler_engine.TextlerEngine)
+        engine.POLL_INTERVAL_LOCKED = 60.0
+        engine._running = True
+        engine._timers = TimerHeap()
+        engine._wake = threading.Event()
+        engine._poll_now = False
+        engine._last_track_key = track.key
+        engine._last_active_index = -1
+        engine._compiled_lyrics = None
+        engine._settings = types.SimpleNamespace(timing_offset_ms=0, lyrics_lead_ms=0)
+        engine._playback = types.SimpleNamespace(clock=types.SimpleNamespace(locked=True))
+        engine._refresh_snapshot = lambda: snapshot
+        engine.get_snapshot = lambda: snapshot
+        engine._osc = types.SimpleNamespace(
+            send_textler=lambda *args, **kwargs: None,
+            send_compiled_lyrics=lambda lyrics: None,
+            send_active_line=lambda lyrics, index, at: sent.set(),
+        )
+        loop = threading.Thread(target=engine._run_loop, args=(1.0,), daemon=True)
+        loop.start()
+        try:
+            time.sleep(0.05)  # first poll done, now waiting on the poll timer
+            assert not sent.is_set()
+            engine._load_lyrics(compile_lyrics(track.key, [LyricLine(1.0, "one"), LyricLine(30.0, "two")]))
+            assert sent.wait(0.5)
+        finally:
+            engine._running = False
+            engine._wake.set()
+            loop.join(timeout=1.0)
+
+
+class TestPlaybackClock:
+    """Test the drift-corrected playback clock."""
+
+    def test_fits_rate_and_detects_seek_and_pause(self):
+        """Jittery polls converge on the real rate; jumps and frozen positions are events."""
+        from orchestrators import PlaybackClock
+
+        clock = PlaybackClock()
+        jitter = [0.04, -0.03, 0.05, -0.05, 0.02, -0.04, 0.03, 0.0]
+        events = []
+        for i, error in enumerate(jitter):
+            t = 1000.0 + 2.0 * i
+            events.append(clock.observe(10.0 + 1.04 * (t - 1000.0) + error, t, t + 0.05))
+        assert events[0] == "start" and set(events[1:]) == {""}
+        assert clock.locked
+        assert clock.rate == pytest.approx(1.04, abs=0.01)
+        assert clock.position_at(1020.0) == pytest.approx(10.0 + 1.04 * 20.0, abs=0.05)
+        assert clock.describe()["sample_age_ms"] == pytest.approx(50.0, abs=1.0)
+
+        # Same measurement reported again is ignored
+        assert clock.observe(999.0, 1014.0) == ""
+
+        assert clock.observe(120.0, 1016.0) == "seek"
+        assert not clock.locked and clock.rate == pytest.approx(1.04, abs=0.01)
+        assert clock.observe(120.5, 1016.5) == ""
+        assert clock.observe(120.5, 1017.5) == "pause"
+        assert clock.position_at(1030.0) == 120.5
+        assert clock.observe(120.5, 1018.0) == ""
+        assert clock.observe(121.0, 1019.0) == "resume"
+        assert clock.observe(122.0, 1020.0, playing=False) == "pause"
+
+    def test_pause_with_repeated_timestamp_stops_extrapolation(self):
+        """A not-playing report counts even when its sample time is not new."""
+        from orchestrators import PlaybackClock
+
+        clock = PlaybackClock()
+        for t in (0.0, 1.0, 2.0):
+            clock.observe(10.0 + t, 100.0 + t)
+        assert clock.observe(12.0, 102.0, playing=False) == "pause"
+        assert not clock.is_playing
+        assert clock.position_at(110.0) == 12.0
+
+    def test_coordinator_state_carries_clock_model(self):
+        """Poll state holds the fitted anchor and rate; pushed sample times are used."""
+        from orchestrators import PlaybackCoordinator
+
+        class FakeMonitor:
+            monitor_key = "fake"
+            position_time = 0.0
+
+            def get_playback(self):
+                return {
+                    "artist": "A", "title": "T", "duration_ms": 200000,
+                    "progress_ms": int((self.position_time - 500.0) * 1000), "is_playing": True,
+                    "position_time": self.position_time,
+                }
+
+        monitor = FakeMonitor()
+        coordinator = PlaybackCoordinator(monitor)
+        for t in (510.0, 512.0, 514.0):
+            monitor.position_time = t
+            state = coordinator.poll().state
+        assert coordinator.clock.locked
+        assert state.last_update == 514.0
+        assert state.rate == pytest.approx(1.0)
+        assert state.position_at(520.0) == pytest.approx(20.0)
+
+    def test_untimestamped_samples_use_lookup_midpoint_and_no_age(self, monkeypatch):
+        """Polled samples are dated mid-lookup and leave the pushed-sample age alone."""
+        import types
+        import orchestrators
+        from orchestrators import PlaybackCoordinator
+
+        now = [0.0]
+        monkeypatch.setattr(orchestrators, "time", types.SimpleNamespace(time=lambda: now[0]))
+
+        class FakeMonitor:
+            monitor_key = "fake"
+            position_time = 0.0
+
+            def get_playback(self):
+                played = (self.position_time or now[0]) - 500.0
+                return {
+                    "artist": "A", "title": "T", "duration_ms": 200000,
+                    "progress_ms": int(played * 1000), "is_playing": True,
+                    "position_time": self.position_time,
+                }
+
+        monitor = FakeMonitor()
+        coordinator = PlaybackCoordinator(monitor)
+        for t in (510.0, 512.0, 514.0):
+            now[0] = t + 0.2
+            monitor.position_time = t
+            coordinator.poll()
+        assert coordinator.clock.sample_age == pytest.approx(0.2)
+
+        now[0] = 516.0
+        monitor.position_time = 0.0
+        state = coordinator.poll().state
+        assert state.last_update == pytest.approx(516.0)
+        assert coordinator.clock.sample_age == pytest.approx(0.2)
+
+        coordinator.set_monitor(monitor)
+        assert coordinator.clock.sample_age is None
+
+
+class TestLookaheadDispatch:
+    """Test timetagged lookahead sends of lyric lines."""
+
+    def test_channel_send_bundle_carries_timetag(self, udp_sink):
+        """send_bundle stamps the bundle with the requested time and records retained state."""
+        from osc import codec
+        from osc.hub import Channel, ChannelConfig
+
+        host, port = udp_sink.getsockname()
+        channel = Channel(ChannelConfig("test", host, port, None, scheduled=True, retained=True))
+        assert channel.start()
+        at = time.time() + 0.4
+        messages = (("/textler/line/active", (3,)), ("/textler/keywords/active", (3, "OH")))
+        assert channel.send_bundle(messages, at)
+
+        data, _ = udp_sink.recvfrom(65536)
+        assert codec.timetag_to_unix(codec.bundle_timetag(data)) == pytest.approx(at, abs=1e-6)
+        decoded = [codec.decode_message(data, start, end) for _, start, end in codec.iter_messages(data)]
+        assert decoded == [("/textler/line/active", [3]), ("/textler/keywords/active", [3, "OH"])]
+        assert ("/textler/line/active", (3,)) in channel.retained.snapshot()
+        channel.stop()
+
+    def test_send_bundle_arrives_after_queued_sends(self, udp_sink):
+        """A reset and bulk lines still queued in the scheduler go out before the bundle."""
+        from osc import codec
+        from osc.hub import Channel, ChannelConfig
+
+        host, port = udp_sink.getsockname()
+        channel = Channel(ChannelConfig("test", host, port, None))
+        channel.set_scheduling(True, rate=50.0, burst=1, max_bundle=1)
+        assert channel.start()
+        channel.send("/textler/lyrics/reset")
+        for index in range(3):
+            channel.send("/textler/lyrics/bulk", index)
+        queued_at = time.monotonic()
+        assert channel.send_bundle((("/textler/line/active", (0,)),), time.time() + 0.1)
+        assert time.monotonic() - queued_at < 0.02  # queued, not waited for
+        channel.stop()
+
+        addresses = []
+        for _ in range(5):
+            data, _ = udp_sink.recvfrom(65536)
+            addresses += [address for address, _, _ in codec.iter_messages(data)]
+        assert addresses == ["/textler/lyrics/reset"] + ["/textler/lyrics/bulk"] * 3 + ["/textler/line/active"]
+
+    def test_timetagged_active_line_is_counted_as_sent(self, monkeypatch):
+        """Bundled active-line sends are counted and shown in the monitor like single sends."""
+        import types
+        import adapters
+        from domain import LyricLine
+        from osc import osc_monitor
+
+        recorded = []
+        monkeypatch.setattr(osc_monitor, "record_outgoing", lambda channel, address, args: recorded.append(address))
+
+        bundles = []
+        fake_hub = types.SimpleNamespace(
+            start=lambda: True,
+            textler=types.SimpleNamespace(
+                send=lambda address, *args: None,
+                send_bundle=lambda messages, at: bundles.append(messages) or True,
+            ),
+        )
+        monkeypatch.setattr(adapters, "osc", fake_hub)
+        sender = adapters.OSCSender()
+        lyrics = adapters.compile_lyrics("song", [LyricLine(1.0, "one")])
+
+        sender.send_active_line(lyrics, 0, at=time.time())
+        sender.send_active_line(lyrics, 0)
+        assert sender.get_dedup_stats()["sent"] == 2 * len(bundles[0])
+        assert recorded == [address for address, _ in bundles[0]] * 2
+
+    def test_lines_dispatch_lead_time_early_with_start_time(self, monkeypatch):
+        """With a lead, the next line goes out early, stamped with its clock-predicted start."""
+        import types
+        import textler_engine
+        from adapters import compile_lyrics
+        from domain import LyricLine
+        from domain_types import PlaybackSnapshot, PlaybackState, Track
+
+        track = Track("Artist", "Song")
+        sent = []
+        engine = object.__new__(textler_engine.TextlerEngine)
+        engine._last_track_key = track.key
+        engine._last_active_index = -1
+        engine._settings = types.SimpleNamespace(timing_offset_ms=0, lyrics_lead_ms=250)
+        engine._osc = types.SimpleNamespace(send_active_line=lambda lyrics, index, at: sent.append((index, at)))
+        engine._compiled_lyrics = compile_lyrics("song", [LyricLine(1.0, "one"), LyricLine(3.0, "two")])
+        clock = {"now": 100.0}
+        monkeypatch.setattr(textler_engine.time, "time", lambda: clock["now"])
+
+        # Track at 2.0 s, playing 2 % fast: line 1 starts in 1.0 / 1.02 s
+        state = PlaybackState(track=track, position=2.0, is_playing=True, last_update=100.0, rate=1.02)
+        snapshot = PlaybackSnapshot(state=state)
+        wake = engine._check_lyrics(snapshot)
+        assert sent == [(0, None)]  # already active: sent immediately
+        assert wake == pytest.approx(100.0 + (3.0 - 2.0 - 0.25 * 1.02) / 1.02)
+
+        clock["now"] = wake
+        assert engine._check_lyrics(snapshot) is None
+        assert sent[1][0] == 1
+        assert sent[1][1] == pytest.approx(100.0 + 1.0 / 1.02)
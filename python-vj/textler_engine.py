@@ -30,7 +30,7 @@ from domain import (
     PlaybackSnapshot,
     PlaybackState,
 )
-from infrastructure import Config, Settings, PipelineTracker, ServiceHealth, PipelineStep, BackoffState
+from infrastructure import Config, Settings, PipelineTracker, ServiceHealth, PipelineStep, BackoffState, TimerHeap
 
 # Re-export for compatibility with vj_console.py and test_python_vj.py
 __all__ = [
@@ -48,8 +48,10 @@ __all__ = [
 
 # External adapters
 from adapters import (
+    CompiledLyrics,
     LyricsFetcher,
     OSCSender,
+    compile_lyrics,
     create_monitor,
     PLAYBACK_SOURCES,
 )
@@ -171,7 +173,7 @@ class TextlerEngine:
         self._pipeline.set_observer(self._handle_pipeline_update)
         
         # External adapters
-        self._osc = OSCSender()  # Uses centralized osc hub
+        self._osc = OSCSender(lyrics_bulk=self._settings.lyrics_bulk)  # Uses centralized osc hub
         self._lyrics_fetcher = LyricsFetcher()
         
         # Playback coordinator (no monitor active by default - user must start explicitly)
@@ -204,6 +206,7 @@ class TextlerEngine:
         
         # Current state
         self._current_lines = []
+        self._compiled_lyrics: Optional[CompiledLyrics] = None  # swapped whole, read by the main loop
         self._last_active_index = -1
         self._running = False
         self._last_track_key = ""
@@ -217,6 +220,11 @@ class TextlerEngine:
         self._last_llm_analysis = None
         self._pipeline_thread: Optional[Thread] = None
         self._pipeline_cancel: Optional[Event] = None
+        
+        # Main loop wakes on timers (next poll, next line boundary) or this event
+        self._timers = TimerHeap()
+        self._wake = Event()
+        self._poll_now = False
     
     @property
     def current_shader(self) -> str:
@@ -232,6 +240,7 @@ class TextlerEngine:
         """Adjust timing offset and return new value."""
         self._settings.adjust_timing(delta_ms)
         logger.info(f"Timing offset: {self._settings.timing_offset_ms}ms")
+        self._wake.set()  # reschedule the next line boundary
         return self._settings.timing_offset_ms
     
     @property
@@ -314,6 +323,8 @@ class TextlerEngine:
             self._playback.set_monitor(monitor)
             self._settings.playback_source = source_key
             logger.info(f"Switched playback source to: {source_key}")
+            self._poll_now = True
+            self._wake.set()
         else:
             logger.warning(f"Unknown playback source: {source_key}")
     
@@ -330,6 +341,7 @@ class TextlerEngine:
     def stop(self):
         """Stop engine and workers."""
         self._running = False
+        self._wake.set()
         logger.info("Textler engine stopped")
     
     def run(self, poll_interval: float = 2.0):
@@ -344,28 +356,51 @@ class TextlerEngine:
     
     # Adaptive polling intervals
     POLL_INTERVAL_FAST = 1.0   # When playback detected (1s)
+    POLL_INTERVAL_LOCKED = 2.5 # When the playback clock has a fitted rate
     POLL_INTERVAL_SLOW = 10.0  # When no playback (10s)
     
+    # Wake just after a line boundary so the new line is already active
+    LINE_WAKE_MARGIN = 0.001
+    
+    _TIMER_POLL = "poll"
+    _TIMER_LINE = "line"
+    
     def _run_loop(self, poll_interval: float):
-        """Main loop with adaptive polling: fast when playing, slow when idle."""
-        last_poll = 0
-        lyrics_check_interval = 0.1  # Check lyrics every 100ms for precision
+        """
+        Event-driven main loop with adaptive polling: fast when playing, slow when idle.
+        
+        Sleeps until the next timer (source poll or next lyric line boundary)
+        or until woken (timing offset change, source switch, stop). Every
+        wake-up re-derives the line timer from the latest snapshot, so seeks
+        and pauses seen by a poll reschedule it.
+        """
+        timers = self._timers
+        timers.set(self._TIMER_POLL, 0.0)  # poll right away
         current_poll_interval = self.POLL_INTERVAL_SLOW  # Start slow until source connected
         
         while self._running:
             try:
+                # Clear before reading the flags/settings it signals, so a wake()
+                # that lands while this iteration runs is kept for the next wait
+                self._wake.clear()
                 current_time = time.time()
+                if self._poll_now:
+                    self._poll_now = False
+                    timers.set(self._TIMER_POLL, current_time)
+                due = timers.pop_due(current_time)
                 
                 # Adaptive polling: only poll source at current interval
-                if current_time - last_poll >= current_poll_interval:
+                if self._TIMER_POLL in due:
                     snapshot = self._refresh_snapshot()
-                    last_poll = current_time
                     
                     # Adjust polling speed based on playback state
                     has_playback = snapshot.state.has_track and snapshot.state.is_playing
                     source_connected = not snapshot.error
                     
-                    if has_playback:
+                    if has_playback and self._playback.clock.locked:
+                        # Clock extrapolates accurately; polls only catch seeks/pauses
+                        current_poll_interval = self.POLL_INTERVAL_LOCKED
+                    elif has_playback:
                         if current_poll_interval != self.POLL_INTERVAL_FAST:
                             current_poll_interval = self.POLL_INTERVAL_FAST
                             logger.info(f"Playback detected - polling every {self.POLL_INTERVAL_FAST}s")
@@ -377,38 +412,64 @@ class TextlerEngine:
                         if current_poll_interval != self.POLL_INTERVAL_SLOW:
                             current_poll_interval = self.POLL_INTERVAL_SLOW
                             logger.info(f"No playback - polling every {self.POLL_INTERVAL_SLOW}s")
+                    timers.set(self._TIMER_POLL, current_time + current_poll_interval)
                 else:
                     snapshot = self.get_snapshot()
                 
-                # Fast: Check lyrics every 100ms (only if playing)
+                # Send the active line and arm a timer for the next boundary (only if playing)
+                next_boundary = None
                 if snapshot.state.is_playing:
-                    self._check_lyrics(snapshot)
+                    next_boundary = self._check_lyrics(snapshot)
+                if next_boundary is None:
+                    timers.cancel(self._TIMER_LINE)
+                else:
+                    timers.set(self._TIMER_LINE, next_boundary + self.LINE_WAKE_MARGIN)
                 
-                time.sleep(lyrics_check_interval)
+                deadline = timers.next_deadline()
+                timeout = None if deadline is None else max(0.0, deadline - time.time())
+                self._wake.wait(timeout)
             except KeyboardInterrupt:
                 break
             except Exception as e:
                 logger.error(f"Loop error: {e}")
                 time.sleep(1)
     
-    def _check_lyrics(self, snapshot: PlaybackSnapshot):
-        """Fast check for lyric changes (100ms precision)."""
+    def _check_lyrics(self, snapshot: PlaybackSnapshot) -> Optional[float]:
+        """
+        Send the active line if it changed.
+        
+        With a lyrics lead time, lines are dispatched that much before they
+        start, in a bundle timetagged with the start time predicted by the
+        playback clock.
+        
+        Returns the wall-clock time of the next dispatch, or None when
+        there is nothing to wait for (no lyrics, paused, last line).
+        """
         state = snapshot.state
         self._handle_track_change(state.track)
         
-        if state.track and self._current_lines and state.is_playing:
-            offset_sec = self._settings.timing_offset_ms / 1000.0
-            position = self._effective_position(state)
-            active_index = get_active_line_index(self._current_lines, position + offset_sec)
-            if active_index != self._last_active_index and active_index >= 0:
-                self._last_active_index = active_index
-                self._send_active_line(active_index)
-
-    def _effective_position(self, state: PlaybackState) -> float:
-        """Estimate live position from latest state."""
-        if not state.is_playing:
-            return state.position
-        return state.position + max(0.0, time.time() - state.last_update)
+        lyrics = self._compiled_lyrics
+        if not (state.track and lyrics and state.is_playing):
+            return None
+        offset_sec = self._settings.timing_offset_ms / 1000.0
+        lead_sec = self._settings.lyrics_lead_ms / 1000.0
+        now = time.time()
+        position = self._effective_position(state, now) + offset_sec
+        dispatch_position = position + lead_sec * state.rate
+        active_index = lyrics.line_at(dispatch_position)
+        if active_index != self._last_active_index and active_index >= 0:
+            self._last_active_index = active_index
+            starts_in = (lyrics.times[active_index] - position) / state.rate
+            at = now + starts_in if lead_sec and starts_in > 0 else None
+            self._osc.send_active_line(lyrics, active_index, at)
+        next_index = active_index + 1
+        if next_index >= len(lyrics):
+            return None
+        return now + max(0.0, lyrics.times[next_index] - dispatch_position) / state.rate
+
+    def _effective_position(self, state: PlaybackState, now: Optional[float] = None) -> float:
+        """Estimate live position from latest state (playback clock model)."""
+        return state.position_at(time.time() if now is None else now)
 
     def _handle_track_change(self, track):
         track_key = track.key if track else ""
@@ -504,6 +565,7 @@ class TextlerEngine:
         self._cancel_pipeline_worker()
         self._pipeline.reset(track.key)
         self._current_lines = []
+        self._compiled_lyrics = None
         self._current_metadata = {}
         self._current_categories = None
         self._last_llm_analysis = None
@@ -531,13 +593,16 @@ class TextlerEngine:
         self._osc.send_textler("keywords", "reset", {"song_id": track.key})
 
         self._start_pipeline_worker(track)
+        self._wake.set()  # drop the old track's line timer
     
     def _on_no_track(self):
         """Handle no track playing."""
         self._cancel_pipeline_worker()
         self._pipeline.reset()
         self._current_lines = []
+        self._compiled_lyrics = None
         self._osc.send_textler("track", "none", {})
+        self._wake.set()
 
     # ------------------------------------------------------------------
     # Pipeline coordination
@@ -678,7 +743,7 @@ class TextlerEngine:
                 analysis_lines = analyze_lyrics(timed_lines)
                 refrain_count = sum(1 for line in analysis_lines if line.is_refrain)
                 self._current_lines = analysis_lines
-                self._send_all_lyrics(track.key, analysis_lines)
+                self._load_lyrics(compile_lyrics(track.key, analysis_lines))
                 self._pipeline.complete("detect_refrain", f"{refrain_count} refrain lines (timed)")
             else:
                 fallback = self._build_plain_lyric_lines(plain_lyrics)
@@ -834,63 +899,21 @@ class TextlerEngine:
         for addr, value in messages:
             osc.textler.send(addr, value)
     
-    def _send_all_lyrics(self, song_id: str, lines):
+    def _load_lyrics(self, lyrics: CompiledLyrics):
+        """Make lyrics current, send them, and wake the loop to send the active line."""
+        self._compiled_lyrics = lyrics
+        self._send_all_lyrics(lyrics)
+        self._wake.set()
+    
+    def _send_all_lyrics(self, lyrics: CompiledLyrics):
         """Send all lyrics channels via OSC."""
         # Reset all channels
-        self._osc.send_textler("lyrics", "reset", {"song_id": song_id})
-        self._osc.send_textler("refrain", "reset", {"song_id": song_id})
-        self._osc.send_textler("keywords", "reset", {"song_id": song_id})
-        
-        # Send full lyrics
-        for i, line in enumerate(lines):
-            self._osc.send_textler("lyrics", "line", {
-                "index": i,
-                "time": line.time_sec,
-                "text": line.text
-            })
-        
-        # Send refrain channel
-        refrain_lines = get_refrain_lines(lines)
-        for i, line in enumerate(refrain_lines):
-            self._osc.send_textler("refrain", "line", {
-                "index": i,
-                "time": line.time_sec,
-                "text": line.text
-            })
+        self._osc.send_textler("lyrics", "reset", {"song_id": lyrics.song_id})
+        self._osc.send_textler("refrain", "reset", {"song_id": lyrics.song_id})
+        self._osc.send_textler("keywords", "reset", {"song_id": lyrics.song_id})
         
-        # Send keywords channel
-        for i, line in enumerate(lines):
-            if line.keywords:
-                self._osc.send_textler("keywords", "line", {
-                    "index": i,
-                    "time": line.time_sec,
-                    "keywords": line.keywords
-                })
-    
-    def _send_active_line(self, index: int):
-        """Send active line update to all channels."""
-        if 0 <= index < len(self._current_lines):
-            line = self._current_lines[index]
-            
-            # Full lyrics channel
-            self._osc.send_textler("lyrics", "active", {"index": index})
-            
-            # Refrain channel (if this line is refrain)
-            if line.is_refrain:
-                refrain_lines = get_refrain_lines(self._current_lines)
-                refrain_index = next((i for i, rline in enumerate(refrain_lines) if rline.text == line.text), -1)
-                if refrain_index >= 0:
-                    self._osc.send_textler("refrain", "active", {
-                        "index": refrain_index,
-                        "text": line.text
-                    })
-            
-            # Keywords channel
-            if line.keywords:
-                self._osc.send_textler("keywords", "active", {
-                    "index": index,
-                    "keywords": line.keywords
-                })
+        # Lyrics, refrain and keywords channels (bulk chunks or per line)
+        self._osc.send_compiled_lyrics(lyrics)
     
     def _send_metadata(self, track, metadata: dict):
         """Send song metadata via OSC."""
@@ -9,12 +9,25 @@ from textual.widgets import Button, Input, Static
 from ui.messages import OSCClearRequested, VJUniverseTestRequested, VDJTestRequested
 from .base import ReactivePanel
 
+SPARK_BLOCKS = " ▁▂▃▄▅▆▇█"
+
+
+def sparkline(values) -> str:
+    """One block character per value scaled to the peak; zero stays blank."""
+    peak = max(values, default=0)
+    if peak <= 0:
+        return " " * len(values)
+    top = len(SPARK_BLOCKS) - 1
+    return "".join(SPARK_BLOCKS[-(-int(value) * top // peak)] for value in values)
+
 
 class OSCPanel(ReactivePanel):
     """OSC messages debug view - grouped by channel and address."""
     stats = reactive({})
     grouped_prefixes = reactive({})
     grouped_messages = reactive({})
+    # Entries hold NumPy arrays, which cannot be compared for equality.
+    rate_series = reactive([], always_update=True)
     filter_text = reactive("")
     full_view = reactive(False)
     osc_running = reactive(False)
@@ -32,6 +45,9 @@ class OSCPanel(ReactivePanel):
     def watch_grouped_messages(self, _: dict) -> None:
         self._safe_render()
 
+    def watch_rate_series(self, _: list) -> None:
+        self._safe_render()
+
     def watch_filter_text(self, _: str) -> None:
         self._safe_render()
 
@@ -60,6 +76,9 @@ class OSCPanel(ReactivePanel):
                 lines.append("[dim](monitor idle)[/dim]")
             else:
                 lines.extend(self._render_stats())
+                if self.rate_series:
+                    lines.append(self.render_section("Rates (msg/s, last 60 s)", "─"))
+                    lines.extend(self._render_rate_series())
                 lines.append(self.render_section("Grouped Paths (nesting)", "─"))
                 lines.extend(self._render_grouped_prefixes())
                 lines.append(self.render_section("Grouped Messages", "─"))
@@ -75,9 +94,12 @@ class OSCPanel(ReactivePanel):
         channels = stats.get("channels", {})
         hub = stats.get("hub", {})
 
+        sample_every = stats.get("sample_every", 1)
+        sampling = f"  [yellow]Sampling 1/{sample_every}[/yellow]" if sample_every > 1 else ""
+
         lines = [
             self.render_section("OSC Stats", "─"),
-            f"Total: {total}  Rate: {rate:.1f}/s  Unique: {unique}",
+            f"Total: {total}  Rate: {rate:.1f}/s  Unique: {unique}{sampling}",
         ]
 
         if channels:
@@ -96,15 +118,63 @@ class OSCPanel(ReactivePanel):
             avg_ms = hub.get("queue_latency_avg_ms", 0.0)
             max_ms = hub.get("queue_latency_max_ms", 0.0)
             samples = hub.get("queue_latency_samples", 0)
+            conflated = hub.get("conflated", 0)
             lines.append(
-                f"Hub queue: {queue_depth}/{queue_capacity} (peak {queue_peak})  Dropped: {dropped}"
+                f"Hub queue: {queue_depth}/{queue_capacity} (peak {queue_peak})  "
+                f"Dropped: {dropped}  Conflated: {conflated}"
             )
             lines.append(
                 f"Hub delay: avg {avg_ms:.2f} ms  max {max_ms:.2f} ms  samples {samples}"
             )
+            for label, key in (("Queue", "queue_latency"), ("E2E", "dispatch_latency")):
+                hist = hub.get(key)
+                if hist and hist.get("samples"):
+                    lines.append(
+                        f"{label} p50/p90/p99/p999: {hist['p50']:.2f} / {hist['p90']:.2f} / "
+                        f"{hist['p99']:.2f} / {hist['p999']:.2f} ms"
+                    )
+            handlers = hub.get("handlers", {})
+            if handlers:
+                slowest = list(handlers.items())[:3]
+                lines.append("Handlers (total/max ms): " + " | ".join(
+                    f"{label} {h['total_ms']:.0f}/{h['max_ms']:.1f}" for label, h in slowest
+                ))
+            slow = hub.get("slow_handlers", {})
+            if slow:
+                lines.append("[yellow]Over budget (calls/max ms): " + " | ".join(
+                    f"{label} {h['over_budget']}/{h['max_ms']:.1f}" for label, h in list(slow.items())[:3]
+                ) + "[/yellow]")
+            subscribers = hub.get("subscribers", {})
+            if subscribers:
+                lines.append("Isolated (depth/dropped): " + " | ".join(
+                    f"{label} {sub['depth']}/{sub['dropped']}" for label, sub in subscribers.items()
+                ))
+            lanes = hub.get("lanes", {})
+            if lanes:
+                lane_parts = [
+                    f"{name} {lane.get('latency_avg_ms', 0.0):.2f}/{lane.get('latency_max_ms', 0.0):.2f} ms"
+                    for name, lane in lanes.items()
+                ]
+                lines.append(f"Lanes avg/max: {' | '.join(lane_parts)}")
+            if "forward_flushes" in hub:
+                lines.append(
+                    f"Forward batches: {hub.get('forward_flushes', 0)}  "
+                    f"avg {hub.get('forward_batch_avg', 0.0):.1f} msgs (max {hub.get('forward_batch_max', 0)})  "
+                    f"flush avg {hub.get('forward_flush_latency_avg_ms', 0.0):.2f} ms"
+                )
 
         return lines
 
+    def _render_rate_series(self) -> list:
+        lines = []
+        for entry in self.rate_series:
+            label = f"{entry['channel']} {entry['address']}"
+            if len(label) > 36:
+                label = label[:33] + "..."
+            line = f"{label:36s} [cyan]{sparkline(entry['counts'])}[/cyan] [dim]peak {entry['peak']}[/dim]"
+            lines.append(line)
+        return lines
+
     def _render_grouped_prefixes(self) -> list:
         grouped = self.grouped_prefixes or {}
         if not grouped:
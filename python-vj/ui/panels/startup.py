@@ -47,6 +47,9 @@ class StartupControlPanel(Static):
             yield Checkbox("Auto-restart", self.settings.autorestart_magic, id="chk-ar-magic")
             yield Static("", id="stat-magic", classes="stat-label")
 
+        with Horizontal(classes="startup-row"):
+            yield Checkbox("Share OSC with local apps", self.settings.osc_shared_memory, id="chk-osc-shm")
+
         # Start/Stop All buttons
         with Horizontal(classes="startup-buttons"):
             yield Button("▶ Start All", id="btn-start-all", variant="success")
@@ -67,10 +70,14 @@ class StartupControlPanel(Static):
             "chk-ar-vjuniverse": "autorestart_vjuniverse",
             "chk-ar-lmstudio": "autorestart_lmstudio",
             "chk-ar-magic": "autorestart_magic",
+            "chk-osc-shm": "osc_shared_memory",
         }
 
         if checkbox_id in mappings:
             setattr(self.settings, mappings[checkbox_id], value)
+        if checkbox_id == "chk-osc-shm":
+            from osc import osc
+            osc.set_shared_memory(value)  # applies live; the setting covers the next launch
 
     def watch_stats_data(self, stats: dict) -> None:
         """Update resource display when stats change."""
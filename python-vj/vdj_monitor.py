@@ -31,6 +31,7 @@ class VDJDeckState:
     is_playing: bool = False
     is_audible: bool = False  # VDJ: playing AND volume up
     position: float = 0.0  # 0.0-1.0
+    position_time: float = 0.0  # When song_pos last arrived
     bpm: float = 0.0
     beat_intensity: float = 0.0
     volume: float = 1.0
@@ -136,6 +137,7 @@ class VDJMonitor:
                 'album': deck.album,
                 'duration_ms': int(deck.duration_sec * 1000),
                 'progress_ms': int(deck.position * deck.duration_sec * 1000),
+                'position_time': deck.position_time,  # song_pos replies lag the query
                 'is_playing': deck.is_playing,
                 'source': 'vdj',
                 'deck': deck.deck,
@@ -209,6 +211,7 @@ class VDJMonitor:
                     d.is_playing = True  # Position changed = playing
                     d.is_audible = d.volume > 0.1  # Infer audible from volume
                 d.position = new_pos
+                d.position_time = now
             elif verb == "volume":
                 d.volume = float(value) if value else 1.0
             elif verb == "loaded":
@@ -111,6 +111,7 @@ class VJConsoleApp(App):
         # Module Registry - the heart of the new architecture
         config = ModuleRegistryConfig(
             playback_source=self.settings.playback_source or "vdj_osc",
+            osc_shared_memory=self.settings.osc_shared_memory,
         )
         self.registry = ModuleRegistry(config)
 
@@ -342,6 +343,7 @@ class VJConsoleApp(App):
                     osc_monitor.start()
                 self._safe_update("#osc-full", "full_view", True)
                 self._safe_update("#osc-full", "stats", osc_monitor.get_stats())
+                self._safe_update("#osc-full", "rate_series", osc_monitor.get_rate_series(limit=8, seconds=60))
                 self._safe_update("#osc-full", "grouped_prefixes", osc_monitor.get_grouped_prefixes(limit=20, child_limit=20))
                 self._safe_update("#osc-full", "grouped_messages", osc_monitor.get_grouped_messages(limit_per_channel=20))
             elif osc_monitor.is_started: